@@ -0,0 +1,81 @@
+"""Compare the combined rule engine with the previous per-pattern loop.
+
+Run from the repository root:
+
+    python benchmarks/content_rules.py [--lines 20000] [--repeat 5]
+"""
+import argparse
+import random
+import re
+import string
+import timeit
+
+from truffleHogRegexes.regexChecks import regexes as trufflehog_regexes
+
+from pii_secret_check_hooks.config import PII_REGEX
+from pii_secret_check_hooks.check_file.rules import RuleSet
+
+
+CUSTOM_REGEX_LIST = [
+    r"dog name=(\s*)dog(\s*)name(\s*)",
+    r"national insurance=[a-z]{2}\d{6}[a-d]",
+]
+
+
+def legacy_scan(line):
+    """The per-pattern loop used before the rule engine"""
+    for trufflehog_regex in trufflehog_regexes.values():
+        if re.search(trufflehog_regex, line):
+            return True
+    for pii_regex in PII_REGEX.values():
+        if re.search(pii_regex, line.lower()):
+            return True
+    for custom_regex in CUSTOM_REGEX_LIST:
+        if re.search(custom_regex.split("=")[1], line.lower()):
+            return True
+    return False
+
+
+def engine_scan(rule_set, line):
+    if rule_set.trufflehog.search(line):
+        return True
+    return rule_set.lowercase.search(line.lower()) is not None
+
+
+def generate_lines(count):
+    rng = random.Random(42)
+    words = ["def", "return", "self", "value", "config", "items", "for", "in", "if", "None"]
+    lines = []
+    for _ in range(count):
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        line += "_" + "".join(rng.choice(string.ascii_lowercase) for _ in range(8))
+        lines.append(line)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = generate_lines(args.lines)
+    rule_set = RuleSet(CUSTOM_REGEX_LIST)
+
+    assert [legacy_scan(line) for line in lines] == [engine_scan(rule_set, line) for line in lines]
+
+    legacy = min(timeit.repeat(
+        lambda: [legacy_scan(line) for line in lines], number=1, repeat=args.repeat,
+    ))
+    engine = min(timeit.repeat(
+        lambda: [engine_scan(rule_set, line) for line in lines], number=1, repeat=args.repeat,
+    ))
+
+    print(f"lines:            {len(lines)}")
+    print(f"per-pattern loop: {legacy:.3f}s ({len(lines) / legacy:,.0f} lines/s)")
+    print(f"rule engine:      {engine:.3f}s ({len(lines) / engine:,.0f} lines/s)")
+    print(f"speed up:         {legacy / engine:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Compare the entropy detector with truffleHog's per word loop.
+
+Run from the repository root:
+
+    python benchmarks/entropy.py [--lines 20000] [--repeat 5]
+"""
+import argparse
+import random
+import string
+import timeit
+
+from truffleHog.truffleHog import (
+    BASE64_CHARS,
+    HEX_CHARS,
+    get_strings_of_set,
+    shannon_entropy,
+)
+
+from pii_secret_check_hooks.check_file.entropy import has_high_entropy_string
+
+
+def legacy_entropy_check(line):
+    """The per word loop used before the entropy detector"""
+    strings_found = []
+    for word in line.split():
+        base64_strings = get_strings_of_set(word, BASE64_CHARS)
+        hex_strings = get_strings_of_set(word, HEX_CHARS)
+        for string_found in base64_strings:
+            if shannon_entropy(string_found, BASE64_CHARS) > 4.5:
+                strings_found.append(string_found)
+        for string_found in hex_strings:
+            if shannon_entropy(string_found, HEX_CHARS) > 3:
+                strings_found.append(string_found)
+    return len(strings_found) > 0
+
+
+def generate_lines(count):
+    """Mostly code, with some lock file hashes and minified lines"""
+    rng = random.Random(42)
+    words = ["def", "return", "self", "value", "config", "items", "for", "in", "if", "None"]
+    lines = []
+    for index in range(count):
+        if index % 50 == 0:
+            line = "integrity sha512-" + "".join(
+                rng.choice(BASE64_CHARS) for _ in range(86)
+            )
+        elif index % 20 == 0:
+            line = ";".join(
+                "".join(rng.choice(string.ascii_letters) for _ in range(30))
+                for _ in range(20)
+            )
+        else:
+            line = " ".join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        lines.append(line)
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    lines = generate_lines(args.lines)
+    assert [legacy_entropy_check(line) for line in lines] == [
+        has_high_entropy_string(line) for line in lines
+    ]
+
+    legacy = min(timeit.repeat(
+        lambda: [legacy_entropy_check(line) for line in lines], number=1, repeat=args.repeat,
+    ))
+    detector = min(timeit.repeat(
+        lambda: [has_high_entropy_string(line) for line in lines], number=1, repeat=args.repeat,
+    ))
+
+    print(f"lines:            {len(lines)}")
+    print(f"per word loop:    {legacy:.3f}s ({len(lines) / legacy:,.0f} lines/s)")
+    print(f"entropy detector: {detector:.3f}s ({len(lines) / detector:,.0f} lines/s)")
+    print(f"speed up:         {legacy / detector:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
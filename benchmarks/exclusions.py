@@ -0,0 +1,69 @@
+"""Compare the exclusion matcher with the previous relative_to loop.
+
+Run from the repository root:
+
+    python benchmarks/exclusions.py [--files 5000] [--excludes 300]
+"""
+import argparse
+import random
+import timeit
+from pathlib import PurePath
+
+from pii_secret_check_hooks.check_file.exclusions import ExclusionMatcher
+
+
+def legacy_excluded(filename, excluded_file_list):
+    """The relative_to loop used before the exclusion matcher"""
+    file_path = PurePath(filename)
+    for excluded_path_or_file in excluded_file_list:
+        try:
+            file_path.relative_to(excluded_path_or_file)
+            return True
+        except ValueError:
+            pass
+    return False
+
+
+def generate_paths(rng, count, prefix):
+    return [
+        "/".join(f"{prefix}{rng.randrange(20)}" for _ in range(rng.randint(1, 4)))
+        + f"/file_{rng.randrange(1000)}.py"
+        for _ in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--excludes", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    filenames = generate_paths(rng, args.files, "dir_")
+    excluded_file_list = [
+        path.rsplit("/", rng.randint(1, 2))[0]
+        for path in generate_paths(rng, args.excludes, "dir_")
+    ]
+
+    def run_matcher():
+        matcher = ExclusionMatcher(excluded_file_list)
+        return [matcher.is_excluded(f) for f in filenames]
+
+    assert [legacy_excluded(f, excluded_file_list) for f in filenames] == run_matcher()
+
+    legacy = min(timeit.repeat(
+        lambda: [legacy_excluded(f, excluded_file_list) for f in filenames],
+        number=1, repeat=args.repeat,
+    ))
+    matched = min(timeit.repeat(run_matcher, number=1, repeat=args.repeat))
+
+    print(f"files:            {len(filenames)}")
+    print(f"excludes:         {len(excluded_file_list)}")
+    print(f"relative_to loop: {legacy:.3f}s")
+    print(f"matcher:          {matched:.3f}s (including building it)")
+    print(f"speed up:         {legacy / matched:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare the indexed filename matcher with a loop over FILENAME_REGEX.
+
+Run from the repository root:
+
+    python benchmarks/filename_rules.py [--paths 100000]
+"""
+import argparse
+import random
+import re
+import timeit
+
+from pii_secret_check_hooks.check_file.file_name import FilenameMatcher
+from pii_secret_check_hooks.config import FILENAME_REGEX
+
+
+def legacy_match(filename):
+    """The per-regex loop used before the indexed matcher"""
+    for regex in FILENAME_REGEX:
+        if re.search(regex, filename):
+            return regex
+
+
+def generate_paths(count):
+    """Mostly source files, with some that the filename rules flag"""
+    rng = random.Random(42)
+    extensions = [".py", ".js", ".ts", ".html", ".md", ".json", ".yml", ".go"]
+    flagged = [".csv", ".txt", ".pem", ".xlsx", "_rsa", ".env", ".bashrc"]
+    paths = []
+    for _ in range(count):
+        directory = "/".join(f"dir_{rng.randrange(30)}" for _ in range(rng.randint(0, 4)))
+        name = f"file_{rng.randrange(10000)}"
+        name += rng.choice(flagged) if rng.random() < 0.05 else rng.choice(extensions)
+        paths.append(f"{directory}/{name}" if directory else name)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--paths", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    paths = generate_paths(args.paths)
+    matcher = FilenameMatcher(FILENAME_REGEX)
+    assert [legacy_match(path) for path in paths] == [matcher.search(path) for path in paths]
+
+    legacy = min(timeit.repeat(
+        lambda: [legacy_match(path) for path in paths], number=1, repeat=args.repeat,
+    ))
+    indexed = min(timeit.repeat(
+        lambda: [matcher.search(path) for path in paths], number=1, repeat=args.repeat,
+    ))
+
+    print(f"paths:           {len(paths)}")
+    print(f"regex loop:      {legacy:.3f}s ({len(paths) / legacy:,.0f} paths/s)")
+    print(f"indexed matcher: {indexed:.3f}s ({len(paths) / indexed:,.0f} paths/s)")
+    print(f"speed up:        {legacy / indexed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Time pii-secret-history over a generated repository, cold and resumed.
+
+A repository with the given number of commits is written with git
+fast-import. Each commit changes one line of one of --files files, as a
+long lived project's history mostly does. Run from the repository root:
+
+    python benchmarks/history.py [--commits 10000] [--files 200] [--jobs 4]
+"""
+import argparse
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def fast_import_stream(commits, files, lines_per_file=100):
+    rng = random.Random(0)
+
+    def random_line():
+        return " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+            for _ in range(rng.randint(3, 12))
+        )
+
+    contents = [[random_line() for _ in range(lines_per_file)] for _ in range(files)]
+    for commit in range(commits):
+        file_num = rng.randrange(files)
+        contents[file_num][rng.randrange(lines_per_file)] = random_line()
+        data = ("\n".join(contents[file_num]) + "\n").encode("utf-8")
+        message = f"commit {commit}".encode("utf-8")
+        yield b"commit refs/heads/main\n"
+        yield b"committer bench <bench@example.com> %d +0000\n" % (1600000000 + commit)
+        yield b"data %d\n%s\n" % (len(message), message)
+        yield b"M 100644 inline src/module_%d.txt\n" % file_num
+        yield b"data %d\n%s\n" % (len(data), data)
+
+
+def run_history(repo, env, jobs):
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable, "-P", "-m", "pii_secret_check_hooks.pii_secret_history",
+            "--checks", "file_content", f"--jobs={jobs}",
+        ],
+        cwd=repo,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--commits", type=int, default=10000)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=4)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(Path(__file__).resolve().parent.parent), env.get("PYTHONPATH")])
+    )
+
+    with tempfile.TemporaryDirectory() as repo:
+        subprocess.run(["git", "init", "-q"], cwd=repo, check=True)
+        fast_import = subprocess.Popen(
+            ["git", "fast-import", "--quiet"], cwd=repo, stdin=subprocess.PIPE,
+        )
+        for chunk in fast_import_stream(args.commits, args.files):
+            fast_import.stdin.write(chunk)
+        fast_import.stdin.close()
+        fast_import.wait()
+
+        blobs = subprocess.run(
+            ["git", "rev-list", "--objects", "--filter=object:type=blob", "--all"],
+            cwd=repo, capture_output=True, check=True,
+        ).stdout.count(b" ")
+        print(f"{args.commits} commits, {blobs} unique blobs")
+        print(f"cold run     {run_history(repo, env, args.jobs):.2f}s")
+        print(f"resumed run  {run_history(repo, env, args.jobs):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare the mmap scan of a large file with the line by line text scan.
+
+Writes a SQL dump style file of mostly clean rows, with a few secrets and
+PII, and checks it both ways with a cold line cache. Run from the
+repository root:
+
+    python benchmarks/large_file.py [--size-mb 100]
+"""
+import argparse
+import mmap
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from pii_secret_check_hooks.check_file.file_content import CheckFileContent
+from pii_secret_check_hooks.util import capture_output
+
+
+def write_dump(filename, size):
+    rng = random.Random(42)
+    statuses = ["pending", "shipped", "cancelled", "returned"]
+    with open(filename, "w") as dump:
+        written = 0
+        row = 0
+        while written < size:
+            row += 1
+            if row % 50000 == 0:
+                line = f"-- api key 'AKIA{rng.randrange(10 ** 16):016d}'\n"
+            elif row % 40000 == 0:
+                line = f"INSERT INTO contacts VALUES ({row}, 'person{row}@example.com');\n"
+            else:
+                line = (
+                    f"INSERT INTO orders VALUES ({row}, {rng.randrange(10 ** 6)}, "
+                    f"'{rng.choice(statuses)}', '2021-03-{rng.randint(10, 28)} 10:00:00');\n"
+                )
+            dump.write(line)
+            written += len(line)
+
+
+def timed_scan(filename, mapped):
+    check = CheckFileContent(jobs=1, file_time_budget=0, file_byte_budget=0)
+    check.rules
+    check.budget.start()
+    start = time.perf_counter()
+    with capture_output() as messages:
+        if mapped:
+            with open(filename, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    found_issue = check._issue_found_in_mapped_content(buffer)
+        else:
+            with open(filename, "r") as f:
+                found_issue = check._issue_found_in_file_content(f, filename)
+    return time.perf_counter() - start, found_issue, messages
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        cwd = os.getcwd()
+        os.chdir(root)
+        try:
+            filename = str(Path(root) / "dump.sql")
+            write_dump(filename, args.size_mb * 1024 * 1024)
+
+            text_time, text_issue, text_messages = timed_scan(filename, mapped=False)
+            mapped_time, mapped_issue, mapped_messages = timed_scan(filename, mapped=True)
+        finally:
+            os.chdir(cwd)
+
+    assert (text_issue, text_messages) == (mapped_issue, mapped_messages)
+
+    print(f"file size:  {args.size_mb}MB")
+    print(f"findings:   {len(text_messages)}")
+    print(f"text scan:  {text_time:.2f}s")
+    print(f"mmap scan:  {mapped_time:.2f}s")
+    print(f"speed up:   {text_time / mapped_time:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
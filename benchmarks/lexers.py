@@ -0,0 +1,60 @@
+"""Measure how much the NER lexers cut the text passed to the model.
+
+For each file suffix with a lexer, compares the characters and non-blank
+lines of the files under the given paths with the characters and number of
+comment and string spans the lexer keeps. Binary and generated files are
+left out, as the NER hook skips them. Run from the repository
+root against a few real repositories:
+
+    python benchmarks/lexers.py path [path ...]
+"""
+import argparse
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from pii_secret_check_hooks.check_file.lexers import get_lexer
+from pii_secret_check_hooks.check_file.sniff import TEXT, sniff_file
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="+")
+    args = parser.parse_args()
+
+    # Suffix to [files, characters, lines, span characters, spans, seconds]
+    totals = defaultdict(lambda: [0, 0, 0, 0, 0, 0.0])
+    for path in args.paths:
+        path = Path(path)
+        for filename in [path] if path.is_file() else sorted(path.rglob("*")):
+            lexer = get_lexer(filename)
+            if (
+                lexer is None
+                or not filename.is_file()
+                or ".git" in filename.parts
+                or sniff_file(filename) != TEXT
+            ):
+                continue
+
+            text = filename.read_text(errors="replace")
+            start = time.perf_counter()
+            spans = list(lexer(text))
+            elapsed = time.perf_counter() - start
+
+            total = totals[filename.suffix.lower()]
+            total[0] += 1
+            total[1] += len(text)
+            total[2] += sum(1 for line in text.split("\n") if line.strip())
+            total[3] += sum(len(span.text) for span in spans)
+            total[4] += len(spans)
+            total[5] += elapsed
+
+    print(f"{'suffix':<8}{'files':>7}{'chars':>12}{'kept':>12}{'cut':>7}"
+          f"{'lines':>9}{'spans':>9}{'MB/s':>7}")
+    for suffix, (files, chars, lines, kept, spans, seconds) in sorted(totals.items()):
+        print(f"{suffix:<8}{files:>7}{chars:>12}{kept:>12}{chars / max(kept, 1):>6.1f}x"
+              f"{lines:>9}{spans:>9}{chars / max(seconds, 1e-9) / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Compare pii-secret-log load and save times as the repository grows.
+
+Each run looks up and updates a handful of entries, as a typical commit does,
+in a log holding an entry for every file in the repository, 100 files to a
+directory. The old log was a single JSON file, read and rewritten in full,
+losing the entries of any run in parallel with it. FileLog only reads and
+writes the shards of the directories it changes, under a lock, applying only
+the changed entries on top of each shard as it is on disk. Run from the
+repository root:
+
+    python benchmarks/log_store.py [--changed 20]
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from pii_secret_check_hooks.check_file.log_store import FileLog
+
+
+def create_entries(count):
+    return {
+        f"package_{i // 100}/module_{i}.py": {
+            "hash": f"{i:040x}",
+            "size": 1000 + i,
+            "inode": i,
+            "mtime_ns": 1_600_000_000_000_000_000 + i,
+        }
+        for i in range(count)
+    }
+
+
+def json_run(path, paths):
+    start = time.perf_counter()
+    with open(path) as log_file:
+        log_data = json.load(log_file)
+    for changed in paths:
+        log_data["files"][changed]["size"] += 1
+    with open(path, "w") as log_file:
+        json.dump(log_data, log_file, indent=2)
+    return time.perf_counter() - start
+
+
+def file_log_run(path, paths):
+    start = time.perf_counter()
+    file_log = FileLog(path)
+    for changed in paths:
+        entry = dict(file_log[changed])
+        entry["size"] += 1
+        file_log[changed] = entry
+    file_log.flush()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--changed", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'files':>8} {'json':>10} {'file log':>10}")
+    for count in (1_000, 10_000, 50_000, 100_000):
+        entries = create_entries(count)
+        changed = list(entries)[::max(1, count // args.changed)][:args.changed]
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = Path(directory) / "json-log"
+            json_path.write_text(json.dumps({"files": entries}, indent=2))
+
+            log_path = Path(directory) / "pii-secret-log"
+            file_log = FileLog(log_path)
+            file_log.update(entries)
+            file_log.flush()
+
+            json_time = min(json_run(json_path, changed) for _ in range(3))
+            file_log_time = min(file_log_run(log_path, changed) for _ in range(3))
+
+        print(f"{count:>8} {json_time:>9.4f}s {file_log_time:>9.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Compare the NER backends' latency and recall.
+
+Each backend checks every text file under the given paths. Recall is the
+share of the entities the spaCy model reports that a backend also reports,
+on the same line and either containing or contained in it.
+Run from the repository root:
+
+    python benchmarks/ner_backends.py [paths ...] [--gazetteer pii-ner-gazetteer.txt]
+
+Paths default to the test fixtures. Use the real en_core_web_sm model.
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.ner_backends import (
+    NER_BACKENDS,
+    SPACY_BACKEND,
+    get_backend,
+)
+from pii_secret_check_hooks.check_file.sniff import TEXT, sniff_file
+from pii_secret_check_hooks.util import capture_output, get_ner_gazetteer
+
+
+DEFAULT_PATHS = ["tests"]
+REPORT_REGEX = re.compile(r"^Line (\d+)\. please check '(.*)' - ")
+
+
+def text_files(paths):
+    for path in paths:
+        path = Path(path).resolve()
+        candidates = [path] if path.is_file() else sorted(path.rglob("*"))
+        for candidate in candidates:
+            if (
+                candidate.is_file()
+                and "__pycache__" not in candidate.parts
+                and sniff_file(candidate) == TEXT
+            ):
+                yield candidate
+
+
+def scan(files, backend, gazetteer):
+    """Entities reported for files and the seconds taken"""
+    checker = CheckForNER(
+        allow_changed_lines=True,
+        ner_backend=backend,
+        ner_gazetteer=gazetteer,
+        file_time_budget=0,
+        file_byte_budget=0,
+    )
+    entities = set()
+    start = time.perf_counter()
+    for filename in files:
+        with open(filename, errors="replace") as file_object, capture_output() as messages:
+            checker._issue_found_in_file_content(file_object, str(filename))
+        for message, _ in messages:
+            match = REPORT_REGEX.match(message)
+            if match:
+                entities.add((filename, int(match.group(1)), match.group(2)))
+
+    return entities, time.perf_counter() - start
+
+
+def missed(reference, entities):
+    by_line = {}
+    for filename, line_num, text in entities:
+        by_line.setdefault((filename, line_num), []).append(text)
+
+    return sorted(
+        (filename, line_num, text) for filename, line_num, text in reference
+        if not any(
+            text in found or found in text
+            for found in by_line.get((filename, line_num), [])
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+    parser.add_argument("--gazetteer", default="pii-ner-gazetteer.txt")
+    args = parser.parse_args()
+
+    files = list(text_files(args.paths))
+    gazetteer = get_ner_gazetteer(args.gazetteer)
+
+    results = {}
+    # Run from an empty directory so that no line cache is read or written
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        for name in sorted(NER_BACKENDS, key=lambda name: name != SPACY_BACKEND):
+            start = time.perf_counter()
+            get_backend(name, gazetteer).nlp
+            load_seconds = time.perf_counter() - start
+            entities, seconds = scan(files, name, gazetteer)
+            results[name] = (entities, load_seconds, seconds)
+
+    reference = results[SPACY_BACKEND][0]
+    print(f"{len(files)} files, {len(reference)} entities from the {SPACY_BACKEND} backend")
+    for name, (entities, load_seconds, seconds) in results.items():
+        not_found = missed(reference, entities)
+        recall = 1 - len(not_found) / len(reference) if reference else 1.0
+        print(f"{name:<8} load {load_seconds:.2f}s  check {seconds:.3f}s  "
+              f"{len(entities)} entities  recall {recall:.3f}")
+        for filename, line_num, text in not_found:
+            print(f"  missed {filename}:{line_num} '{text}'")
+
+
+if __name__ == "__main__":
+    main()
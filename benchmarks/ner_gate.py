@@ -0,0 +1,99 @@
+"""Measure the NER line gate's recall and throughput.
+
+Every text file under the given paths is checked with the gate on and off.
+Recall is the share of the entities reported without the gate that are
+still reported with it. Use the real en_core_web_sm model, and point it at
+a few real repositories:
+
+    python benchmarks/ner_gate.py [paths ...] [--min_word_chars 3]
+
+Paths default to the test fixtures and this repository's sources.
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.ner_backends import get_backend
+from pii_secret_check_hooks.check_file.sniff import TEXT, sniff_file
+from pii_secret_check_hooks.config import NER_GATE_MIN_WORD_CHARS
+from pii_secret_check_hooks.util import capture_output
+
+
+DEFAULT_PATHS = ["tests/assets", "tests", "pii_secret_check_hooks", "README.md"]
+REPORT_REGEX = re.compile(r"^Line (\d+)\. please check '(.*)' - ")
+
+
+def text_files(paths):
+    for path in paths:
+        path = Path(path).resolve()
+        candidates = [path] if path.is_file() else sorted(path.rglob("*"))
+        for candidate in candidates:
+            if (
+                candidate.is_file()
+                and ".git" not in candidate.parts
+                and sniff_file(candidate) == TEXT
+            ):
+                yield candidate
+
+
+def scan(files, ner_gate, min_word_chars):
+    """Entities reported for files, lines skipped by the gate and seconds taken"""
+    checker = CheckForNER(
+        allow_changed_lines=True,
+        ner_gate=ner_gate,
+        ner_gate_min_word_chars=min_word_chars,
+        file_time_budget=0,
+        file_byte_budget=0,
+    )
+    entities = set()
+    start = time.perf_counter()
+    for filename in files:
+        with open(filename, errors="replace") as file_object, capture_output() as messages:
+            checker._issue_found_in_file_content(file_object, str(filename))
+        for message, _ in messages:
+            match = REPORT_REGEX.match(message)
+            if match:
+                entities.add((filename, int(match.group(1)), match.group(2)))
+
+    elapsed = time.perf_counter() - start
+    skipped_lines = checker.line_gate.skipped_lines if checker.line_gate else 0
+    return entities, skipped_lines, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS)
+    parser.add_argument("--min_word_chars", type=int, default=NER_GATE_MIN_WORD_CHARS)
+    args = parser.parse_args()
+
+    files = list(text_files(args.paths))
+    line_count = 0
+    for filename in files:
+        with open(filename, errors="replace") as file_object:
+            line_count += sum(1 for _ in file_object)
+
+    # Load the model up front, then run from an empty directory so that no
+    # line cache is read or written
+    get_backend().nlp
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        ungated, _, ungated_seconds = scan(files, False, args.min_word_chars)
+        gated, skipped_lines, gated_seconds = scan(files, True, args.min_word_chars)
+
+    recall = len(gated & ungated) / len(ungated) if ungated else 1.0
+    print(f"{len(files)} files, {line_count} lines")
+    print(f"gate off: {len(ungated)} entities in {ungated_seconds:.2f}s "
+          f"({line_count / ungated_seconds:.0f} lines/s)")
+    print(f"gate on:  {len(gated)} entities in {gated_seconds:.2f}s "
+          f"({line_count / gated_seconds:.0f} lines/s), {skipped_lines} lines skipped")
+    print(f"recall {recall:.3f}, speed up {ungated_seconds / gated_seconds:.2f}x")
+    for filename, line_num, text in sorted(ungated - gated):
+        print(f"  missed {filename}:{line_num} '{text}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Time NER hook start up for a no-op commit and a single file commit.
+
+Each case runs the hook in a fresh interpreter, as pre-commit does. Run from
+the repository root:
+
+    python benchmarks/ner_startup.py [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+HOOK = [sys.executable, "-m", "pii_secret_check_hooks.pii_secret_file_content_ner", "--jobs=1"]
+FULL_LOAD = [sys.executable, "-c", "import en_core_web_sm; en_core_web_sm.load()"]
+
+
+def run(command, cwd, env):
+    start = time.perf_counter()
+    subprocess.run(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+
+def time_case(name, command, cwd, env, repeat, before=None):
+    timings = []
+    for _ in range(repeat):
+        if before:
+            before()
+        timings.append(run(command, cwd, env))
+    print(f"{name:<40} median {statistics.median(timings):.3f}s  min {min(timings):.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(Path(__file__).resolve().parent.parent), env.get("PYTHONPATH")])
+    )
+
+    with tempfile.TemporaryDirectory() as repo:
+        source = Path(repo) / "notes.txt"
+        source.write_text("Meeting notes from the planning session\n" * 50)
+
+        def touch_file():
+            # Change the content so the hash log does not skip the file
+            source.write_text(source.read_text() + "More notes\n")
+
+        time_case("full model load (reference)", FULL_LOAD, repo, env, args.repeat)
+        time_case("no-op commit (no files)", HOOK, repo, env, args.repeat)
+
+        # Warm the hash log, then every run sees the file as unchanged
+        run(HOOK + [str(source)], repo, env)
+        time_case("no-op commit (unchanged file)", HOOK + [str(source)], repo, env, args.repeat)
+        time_case("single changed file", HOOK + [str(source)], repo, env, args.repeat, before=touch_file)
+
+
+if __name__ == "__main__":
+    main()
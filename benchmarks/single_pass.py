@@ -0,0 +1,80 @@
+"""Compare the three separate hooks with the single pass pii-secret-scan hook.
+
+Each hook runs in a fresh interpreter, as pre-commit runs it, over a
+generated set of changed files. Run from the repository root:
+
+    python benchmarks/single_pass.py [--files 200] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+SEPARATE_HOOKS = [
+    "pii_secret_check_hooks.pii_secret_filename",
+    "pii_secret_check_hooks.pii_secret_file_content",
+    "pii_secret_check_hooks.pii_secret_file_content_ner",
+]
+SINGLE_PASS_HOOK = "pii_secret_check_hooks.pii_secret_scan"
+
+
+def write_files(repo, count):
+    rng = random.Random(0)
+    filenames = []
+    for i in range(count):
+        lines = [
+            " ".join(
+                "".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9)))
+                for _ in range(rng.randint(3, 12))
+            )
+            for _ in range(200)
+        ]
+        path = Path(repo) / f"module_{i}.txt"
+        path.write_text("\n".join(lines) + "\n")
+        filenames.append(path.name)
+    return filenames
+
+
+def run_hooks(hooks, filenames, cwd, env):
+    # Each run starts from scratch, as for files changed since the last commit
+    shutil.rmtree(Path(cwd) / ".pii-secret-hook", ignore_errors=True)
+    start = time.perf_counter()
+    for hook in hooks:
+        command = [sys.executable, "-m", hook] + filenames
+        if hook != "pii_secret_check_hooks.pii_secret_filename":
+            command += ["--jobs=1", "--no_daemon"]
+        subprocess.run(command, cwd=cwd, env=env, stdout=subprocess.DEVNULL, check=False)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(Path(__file__).resolve().parent.parent), env.get("PYTHONPATH")])
+    )
+
+    with tempfile.TemporaryDirectory() as repo:
+        filenames = write_files(repo, args.files)
+        for name, hooks in [
+            ("three separate hooks", SEPARATE_HOOKS),
+            ("single pass hook", [SINGLE_PASS_HOOK]),
+        ]:
+            timings = [run_hooks(hooks, filenames, repo, env) for _ in range(args.repeat)]
+            print(f"{name:<24} median {statistics.median(timings):.3f}s  min {min(timings):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Time an --all-files style run over a large, unchanged tree with a warm cache.
+
+Compares the size/mtime/inode fast path with re-hashing every file, which is
+what happened before metadata was stored in the pii-secret-log. Run from the
+repository root:
+
+    python benchmarks/warm_cache.py [--files 5000] [--size 20000]
+"""
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pii_secret_check_hooks.check_file.file_content import CheckFileContent
+from pii_secret_check_hooks.util import capture_output
+
+
+def create_tree(root, file_count, file_size):
+    filenames = []
+    line = "def function_name(argument): return argument  # plain code\n"
+    content = line * (file_size // len(line))
+    for i in range(file_count):
+        directory = Path(root) / f"package_{i // 100}"
+        directory.mkdir(exist_ok=True)
+        filename = directory / f"module_{i}.py"
+        filename.write_text(content)
+        filenames.append(str(filename.relative_to(root)))
+
+    # Make the mtimes old enough to be trusted by the cache
+    old = time.time() - 60
+    for filename in filenames:
+        os.utime(Path(root) / filename, (old, old))
+    return filenames
+
+
+def timed_run(filenames, strip_metadata=False):
+    check = CheckFileContent(jobs=1)
+    if strip_metadata:
+        for file_entry in check.log_data["files"].values():
+            file_entry.pop("mtime_ns", None)
+            file_entry.pop("inode", None)
+
+    start = time.perf_counter()
+    with capture_output():
+        check.process_files(filenames)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", type=int, default=5000)
+    parser.add_argument("--size", type=int, default=20000)
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as root:
+        os.chdir(root)
+        try:
+            filenames = create_tree(root, args.files, args.size)
+            cold = timed_run(filenames)
+            rehash = timed_run(filenames, strip_metadata=True)
+            fast_path = timed_run(filenames)
+        finally:
+            os.chdir(cwd)
+
+    total_mb = args.files * args.size / 1_000_000
+    print(f"files:              {args.files} ({total_mb:.0f} MB)")
+    print(f"cold cache:         {cold:.3f}s")
+    print(f"warm, re-hash:      {rehash:.3f}s")
+    print(f"warm, fast path:    {fast_path:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,111 @@
 import os
-from pathlib import PurePath
-import hashlib
-import json
-from json import load as load_json
+import subprocess
+import time
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 from pii_secret_check_hooks.config import (
     LINE_MARKER,
+    LINE_WINDOW_OVERLAP,
+    MAX_LINE_LENGTH,
     IGNORE_EXTENSIONS,
+    FILE_BYTE_BUDGET,
+    FILE_TIME_BUDGET_SECONDS,
 )
 
+from pii_secret_check_hooks.git_utils import get_staged_line_numbers
+from pii_secret_check_hooks.profile import count, get_profile, stage
 from pii_secret_check_hooks.util import (
+    capture_output,
+    flush_output,
     print_error,
     print_info,
+    print_warning,
+    replay_output,
+    report_finding,
+)
+from pii_secret_check_hooks.check_file.baseline import finding_fingerprint
+from pii_secret_check_hooks.check_file.exclusions import ExclusionMatcher
+from pii_secret_check_hooks.check_file.line_cache import (
+    LineVerdictCache,
+    get_line_cache_path,
+)
+from pii_secret_check_hooks.check_file.log_store import FileLog
+from pii_secret_check_hooks.check_file.parallel import (
+    check_files_in_pool,
+    get_job_count,
+)
+from pii_secret_check_hooks.check_file.file_source import FileSource
+from pii_secret_check_hooks.check_file.sniff import GENERATED, TEXT
+from pii_secret_check_hooks.check_file.scan_limits import (
+    ScanBudget,
+    line_windows,
 )
 
 
 class CheckFileBase(ABC):
     current_file = None
-    BUFF_SIZE = 65536
+    current_file_hash = None
+    current_file_stat = None
+    current_file_lines = None
+    current_source = None
+    # Where the text being checked starts in the current line, for columns
+    current_line_indent = 0
+    current_window_offset = 0
+    RACY_MTIME_NS = 2_000_000_000
 
     def __init__(
         self,
         check_name,
         allow_changed_lines=False,
         excluded_file_list=None,
+        jobs=None,
+        staged_only=False,
+        file_time_budget=FILE_TIME_BUDGET_SECONDS,
+        file_byte_budget=FILE_BYTE_BUDGET,
+        baseline=None,
     ):
+        self.check_name = check_name
         self.excluded_file_list = [] if excluded_file_list is None else excluded_file_list
         self.allow_changed_lines = allow_changed_lines
+        self.jobs = jobs
+        self.staged_only = staged_only
+        # Filename to staged line numbers, when only staged lines are checked
+        self.staged_lines = None
+        self.budget = ScanBudget(file_time_budget, file_byte_budget)
+        # Findings in the baseline are counted rather than reported
+        self.baseline = baseline
+        self.accepted_findings = 0
+        self.current_file_reported = 0
         self.log_path = f".pii-secret-hook/{check_name}/pii-secret-log"
-        self.log_data = self._get_empty_log()
+        self.log_data = {
+            "files": FileLog(self.log_path),
+        }
+        self.line_cache = LineVerdictCache(
+            get_line_cache_path(check_name),
+            self._line_cache_fingerprint,
+        )
         self.debug = True
 
-        if self.log_path:
-            Path(f".pii-secret-hook/{check_name}").mkdir(parents=True, exist_ok=True)
-
-            try:
-                with open(self.log_path, 'r') as json_file:
-                    try:
-                        self.log_data = load_json(json_file)
-                    except json.decoder.JSONDecodeError:
-                        self.log_data = self._get_empty_log()
-            except FileNotFoundError:
-                self.log_data = self._get_empty_log()
+        Path(f".pii-secret-hook/{check_name}").mkdir(parents=True, exist_ok=True)
 
         super().__init__()
 
-    def _get_empty_log(self):
-        return {
-            "files": {},
-            "excluded_lines": {},
-        }
-
-    def _create_file_hash(self, file_obj) -> str:
-        file_obj.seek(0)
-        content = file_obj.read()
+    def _line_cache_fingerprint(self):
+        """Fingerprint of everything a line's verdict depends on.
 
-        sha1 = hashlib.sha1()
-        sha1.update(content.encode("utf-8"))
+        Checks that return None don't cache line verdicts.
+        """
+        return None
 
-        # Reset for other callers
-        file_obj.seek(0)
+    def _source(self, filename) -> FileSource:
+        """The current file's source, which other checks may share"""
+        if self.current_source is None or self.current_source.filename != filename:
+            self.current_source = FileSource(filename)
+        return self.current_source
 
-        return sha1.hexdigest()
+    def _create_file_hash(self, filename) -> str:
+        return self._source(filename).hash
 
     def _file_extension_excluded(self, filename) -> bool:
         _, file_extension = os.path.splitext(filename)
@@ -72,48 +114,131 @@ class CheckFileBase(ABC):
 
         return False
 
+    @property
+    def excluded_file_list(self):
+        return self._excluded_file_list
+
+    @excluded_file_list.setter
+    def excluded_file_list(self, excluded_file_list):
+        self._excluded_file_list = excluded_file_list
+        # Built again from the new list when next needed
+        self._exclusions = None
+
     def _file_excluded(self, filename) -> bool:
-        file_path = PurePath(filename)
-        for excluded_path_or_file in self.excluded_file_list:
-            # Same as is_relative_to(..), but compatible with Python>=3.7.
-            try:
-                file_path.relative_to(excluded_path_or_file)
-                return True
-            except ValueError:
-                pass
+        if self._exclusions is None:
+            self._exclusions = ExclusionMatcher(self._excluded_file_list)
+        return self._exclusions.is_excluded(filename)
+
+    def _file_changed(self, filename) -> bool:
+        # Blobs from history aren't in the work tree, so never in the log
+        if self._source(filename).blob_id is not None:
+            return True
+
+        self.current_file_stat = self._source(filename).stat
+        file_entry = self.log_data["files"].get(self.current_file)
+        if file_entry is None:
+            return True
 
+        # A different size means different content, no need to hash it
+        # until the file has been checked.
+        if "size" in file_entry and file_entry["size"] != self.current_file_stat.st_size:
+            return True
+
+        # Same size, modification time and inode as when the file was last
+        # checked, treat it as unchanged without reading it.
+        if (
+            file_entry.get("mtime_ns") == self.current_file_stat.st_mtime_ns
+            and file_entry.get("inode") == self.current_file_stat.st_ino
+            and "size" in file_entry
+        ):
+            return False
+
+        self.current_file_hash = self._create_file_hash(filename)
+        if file_entry["hash"] != self.current_file_hash:
+            return True
+
+        # Same content with new metadata (e.g. touched by a checkout), so
+        # record it to take the fast path next time.
+        self._update_file_log(filename)
         return False
 
-    def _file_changed(self, file_obj) -> bool:
-        file_hash = self._create_file_hash(file_obj)
-        if self.current_file in self.log_data["files"]:
-            existing_file_hash = self.log_data["files"][self.current_file]["hash"]
-            if existing_file_hash == file_hash:
-                return False
+    def _update_file_log(self, filename) -> None:
+        # Reuse the hash from _file_changed if the file was hashed there
+        file_hash = self.current_file_hash or self._create_file_hash(filename)
+        file_stat = self.current_file_stat or self._source(filename).stat
 
-        return True
+        # Set file entry in file log
+        file_entry = dict(self.log_data["files"].get(self.current_file, {}))
+        file_entry["hash"] = file_hash
+        file_entry["size"] = file_stat.st_size
+        file_entry["inode"] = file_stat.st_ino
 
-    def _issue_found_in_file(self, filename) -> bool:
+        # A file modified very recently could change again within the
+        # timestamp granularity of the file system without its mtime
+        # changing, so only trust mtimes that are old enough.
+        if time.time_ns() - file_stat.st_mtime_ns > self.RACY_MTIME_NS:
+            file_entry["mtime_ns"] = file_stat.st_mtime_ns
+        else:
+            file_entry.pop("mtime_ns", None)
+
+        self.log_data["files"][self.current_file] = file_entry
+
+    def _issue_found_in_file(self, filename, source=None) -> bool:
         try:
             found_issue = False
-            if filename not in self.excluded_file_list:
+            if not self._file_excluded(filename):
+                self.current_source = source or FileSource(filename)
                 self.current_file = filename
-                with open(filename, "r+") as f:
-                    if self._file_changed(f):
-                        if self._issue_found_in_file_content(f, filename):
-                            print_info(f"{filename}")
-                            return True
+                self.current_file_hash = None
+                self.current_file_stat = None
+                self.current_file_lines = self._get_lines_to_check(filename)
+                self.current_file_reported = 0
+                accepted_findings = self.accepted_findings
+                if self._file_changed(filename):
+                    count(f"{self.check_name} files checked")
+                    self.budget.start()
+                    # Sniffed before decoding, so binary files never reach
+                    # the text checks.
+                    file_kind = self.current_source.kind
+                    if file_kind == TEXT:
+                        found_issue = self._issue_found_in_text_file(filename)
+                    else:
+                        with self.current_source.open_binary() as f:
+                            found_issue = self._issue_found_in_undecoded_content(
+                                f, filename, file_kind,
+                            )
+
+                    profile = get_profile()
+                    if profile is not None:
+                        profile.file_checked(self.check_name, filename, self.budget.elapsed())
+                        profile.count(f"{self.check_name} characters read", self.budget.checked)
+                    if self.budget.exceeded:
+                        print_warning(
+                            f"{filename} was only partly checked, {self.budget.exceeded}"
+                        )
+                    if found_issue and self.current_file_reported == 0:
+                        # Every finding was accepted in the baseline. The
+                        # file isn't logged, so they are found again if
+                        # the baseline changes.
+                        if self.accepted_findings > accepted_findings:
+                            return False
+                    if found_issue:
+                        if self.current_source.blob_id is not None:
+                            print_info(f"{filename} (blob {self.current_source.blob_id})")
                         else:
-                            # If no issue was found, create and save file hash
-                            file_hash = self._create_file_hash(f)
-
-                            # Set file entry in file log
-                            if self.current_file not in self.log_data["files"]:
-                                self.log_data["files"][self.current_file] = {
-                                    "hash": ""
-                                }
-
-                            self.log_data["files"][self.current_file]["hash"] = file_hash
+                            print_info(f"{filename}")
+                        return True
+
+                    # If no issue was found, save the file hash. Only
+                    # files that were checked in full can be skipped later,
+                    # and generated files only get some of the checks.
+                    if (
+                        self.current_file_lines is None
+                        and file_kind != GENERATED
+                        and not self.budget.exceeded
+                        and self.current_source.blob_id is None
+                    ):
+                        self._update_file_log(filename)
 
             return found_issue
         except Exception as ex:
@@ -121,11 +246,103 @@ class CheckFileBase(ABC):
                 f"An exception occurred processing this file, ex: {ex}"
             )
             return True
+        finally:
+            # Don't hold on to the file's content once it is checked
+            self.current_source = None
+            flush_output()
+
+    def _get_lines_to_check(self, filename):
+        """Line numbers to check in the file, None means every line"""
+        if self.staged_lines is None:
+            return None
+
+        # A file missing from the diff is checked in full, rather than
+        # risk skipping every line of it
+        return self.staged_lines.get(os.path.normpath(filename))
+
+    def _line_skipped(self, line_num) -> bool:
+        return (
+            self.current_file_lines is not None
+            and line_num not in self.current_file_lines
+        )
+
+    def _load_staged_lines(self, filenames) -> None:
+        try:
+            self.staged_lines = get_staged_line_numbers(filenames)
+        except (OSError, subprocess.CalledProcessError) as ex:
+            print_error(
+                f"Could not read staged changes, checking whole files ({ex})"
+            )
+            self.staged_lines = None
 
     def _write_log(self):
-        with open(self.log_path, "w") as fh:
-            # Using indent for nicer diffs when contents change.
-            json.dump(self.log_data, fh, indent=2)
+        # Only entries set during this run are written
+        with stage(f"{self.check_name} file log write"):
+            self.log_data["files"].flush()
+
+    def _check_file(self, filename, source=None) -> bool:
+        if self._file_extension_excluded(filename):
+            return False
+        if self._file_excluded(filename):
+            return False
+
+        return self._issue_found_in_file(filename, source)
+
+    def _check_file_isolated(self, filename, source=None) -> dict:
+        """Check a file in a worker process, buffering its output"""
+        with capture_output() as messages:
+            found_issue = self._check_file(filename, source)
+        profile = get_profile()
+
+        return {
+            "found_issue": found_issue,
+            "messages": messages,
+            "filename": filename,
+            "log_entry": self.log_data["files"].get(filename),
+            "clean_line_keys": self.line_cache.take_added_keys(),
+            "accepted_findings": self._take_accepted_findings(),
+            # Worker processes send back what they timed for this file
+            "profile": profile.take() if profile is not None else None,
+        }
+
+    def _take_accepted_findings(self) -> int:
+        accepted_findings = self.accepted_findings
+        self.accepted_findings = 0
+        return accepted_findings
+
+    def _merge_file_result(self, result) -> None:
+        """Merge a worker's file result into this (parent) check"""
+        replay_output(result["messages"])
+        flush_output()
+        if result["log_entry"] is not None:
+            self.log_data["files"][result["filename"]] = result["log_entry"]
+        self.line_cache.add_keys(result["clean_line_keys"])
+        self.accepted_findings += result["accepted_findings"]
+        if result["profile"] is not None and get_profile() is not None:
+            get_profile().merge(result["profile"])
+
+    def _report_finding(self, finding, line_text) -> bool:
+        """Report a finding in line_text, unless it is in the baseline.
+
+        Returns False if it was in the baseline.
+        """
+        finding = finding._replace(
+            fingerprint=finding_fingerprint(finding, line_text),
+            blob=self.current_source.blob_id if self.current_source else None,
+        )
+        if self.baseline is not None and finding.fingerprint in self.baseline:
+            self.accepted_findings += 1
+            return False
+
+        self.current_file_reported += 1
+        report_finding(finding)
+        return True
+
+    def _print_accepted_findings(self) -> None:
+        if self.accepted_findings:
+            print_info(
+                f"{self.accepted_findings} {self.check_name} findings in the baseline were not reported"
+            )
 
     def process_files(self, filenames) -> bool:
         filenames = list(filenames)
@@ -133,13 +350,24 @@ class CheckFileBase(ABC):
 
         found_issues = False
 
-        for filename in filenames:
-            if not self._file_extension_excluded(filename):
-                if not self._file_excluded(filename):
-                    if self._issue_found_in_file(filename):
-                        found_issues = True
+        if self.staged_only:
+            self._load_staged_lines(filenames)
+
+        jobs = get_job_count(self.jobs, len(filenames))
+        if jobs > 1:
+            for result in check_files_in_pool(self, filenames, jobs):
+                self._merge_file_result(result)
+                if result["found_issue"]:
+                    found_issues = True
+        else:
+            for filename in filenames:
+                if self._check_file(filename):
+                    found_issues = True
 
         self._write_log()
+        with stage(f"{self.check_name} line cache write"):
+            self.line_cache.write()
+        self._print_accepted_findings()
         self.after_run()
 
         return found_issues
@@ -149,15 +377,72 @@ class CheckFileBase(ABC):
         found_issue = False
         for i, line in enumerate(file_object):
             self.current_line_num = i + 1
-            if LINE_MARKER in line and self.allow_changed_lines:
+            if not self.budget.consume(len(line)):
+                break
+            elif self._line_skipped(self.current_line_num):
+                continue
+            elif LINE_MARKER in line and self.allow_changed_lines:
                 continue
-            elif self.line_has_issue(line.strip()):
+
+            self.current_line_indent = len(line) - len(line.lstrip())
+            if self._text_has_issue(line.strip()):
                 # We don't want to return here as otherwise
                 # we won't get all issues output
                 found_issue = True
 
         return found_issue
 
+    def _issue_found_in_text_file(self, filename) -> bool:
+        with self._source(filename).open_text() as f:
+            return self._issue_found_in_file_content(f, filename)
+
+    def _issue_found_in_undecoded_content(self, file_object, filename, file_kind) -> bool:
+        """Check a binary or generated file, opened in binary mode.
+
+        These files are skipped unless a check overrides this.
+        """
+        return False
+
+    def _text_has_issue(self, text) -> bool:
+        # Stop at the first window with an issue, so a line is reported once
+        step = MAX_LINE_LENGTH - LINE_WINDOW_OVERLAP
+        for window_num, window in enumerate(line_windows(text)):
+            self.current_window_offset = window_num * step
+            if self._line_has_issue_cached(window):
+                return True
+            if not self.budget.has_time():
+                break
+
+        return False
+
+    def _line_has_issue_cached(self, line) -> bool:
+        if get_profile() is not None:
+            return self._line_has_issue_profiled(line)
+
+        if self.line_cache.is_clean(line):
+            return False
+
+        if self.line_has_issue(line):
+            return True
+
+        self.line_cache.add_clean(line)
+        return False
+
+    def _line_has_issue_profiled(self, line) -> bool:
+        # Kept apart so checking a line costs nothing extra when not profiling
+        profile = get_profile()
+        if self.line_cache.is_clean(line):
+            profile.count(f"{self.check_name} line cache hits")
+            return False
+
+        profile.count(f"{self.check_name} line cache misses")
+        with profile.stage(f"{self.check_name} line checks"):
+            if self.line_has_issue(line):
+                return True
+
+        self.line_cache.add_clean(line)
+        return False
+
     @abstractmethod
     def line_has_issue(self, line):
         raise NotImplementedError()
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import sys
+from array import array
+
+from pii_secret_check_hooks.file_utils import atomic_write
+from pii_secret_check_hooks.report import Reporter
+
+
+# Bump if fingerprints are computed differently, so old baselines are
+# rejected rather than silently matching nothing.
+BASELINE_MAGIC = b"PIIBASE1"
+
+
+def finding_fingerprint(finding, line_text) -> str:
+    """Fingerprint of a finding that doesn't depend on its line number.
+
+    It covers the check, file, rule, entity text and the text of the line
+    the finding is in, so a finding is still matched after lines are added
+    above it but not once the line itself changes.
+    """
+    blake2b = hashlib.blake2b(digest_size=8)
+    if isinstance(line_text, str):
+        line_text = line_text.encode("utf-8", "surrogatepass")
+    filename = finding.file and os.path.normpath(finding.file)
+    for part in (finding.check, filename, finding.rule, finding.text):
+        blake2b.update(str(part).encode("utf-8", "surrogatepass"))
+        blake2b.update(b"\0")
+    blake2b.update(line_text.strip())
+    return blake2b.hexdigest()
+
+
+class Baseline:
+    """Fingerprints of accepted findings, which are no longer reported.
+
+    On disk it is BASELINE_MAGIC followed by the sorted 64 bit fingerprints,
+    8 bytes a finding. In memory they are a set of ints, so checking a
+    finding against the baseline costs the same however many it holds.
+    """
+    def __init__(self, fingerprints=()):
+        self._fingerprints = set(int(fingerprint, 16) for fingerprint in fingerprints)
+
+    @classmethod
+    def load(cls, path):
+        """The baseline at path, empty if there is none"""
+        baseline = cls()
+        try:
+            with open(path, "rb") as baseline_file:
+                data = baseline_file.read()
+        except FileNotFoundError:
+            return baseline
+
+        fingerprints = array("Q")
+        if (
+            not data.startswith(BASELINE_MAGIC)
+            or (len(data) - len(BASELINE_MAGIC)) % fingerprints.itemsize
+        ):
+            raise ValueError(f"{path} is not a baseline, or was made by another version")
+
+        fingerprints.frombytes(data[len(BASELINE_MAGIC):])
+        if sys.byteorder != "little":
+            fingerprints.byteswap()
+        baseline._fingerprints = set(fingerprints)
+        return baseline
+
+    def write(self, path) -> None:
+        fingerprints = array("Q", sorted(self._fingerprints))
+        if sys.byteorder != "little":
+            fingerprints.byteswap()
+
+        with atomic_write(path, "wb") as baseline_file:
+            baseline_file.write(BASELINE_MAGIC)
+            baseline_file.write(fingerprints.tobytes())
+
+    def add(self, fingerprint) -> None:
+        self._fingerprints.add(int(fingerprint, 16))
+
+    def __contains__(self, fingerprint) -> bool:
+        return int(fingerprint, 16) in self._fingerprints
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+
+class BaselineRecorder(Reporter):
+    """Adds every finding to a baseline instead of writing it out.
+
+    Messages go to the reporter given, such as the usual TextReporter.
+    """
+    def __init__(self, baseline, reporter):
+        super().__init__()
+        self.baseline = baseline
+        self.reporter = reporter
+
+    def write_findings(self, findings) -> None:
+        for finding in findings:
+            self.baseline.add(finding.fingerprint)
+
+    def write_message(self, message, style) -> None:
+        self.reporter.message(message, style)
+
+    def close(self) -> None:
+        super().close()
+        self.reporter.close()
@@ -0,0 +1,61 @@
+import math
+import re
+from collections import Counter
+
+from truffleHog.truffleHog import BASE64_CHARS, HEX_CHARS
+
+
+# truffleHog's get_strings_of_set keeps runs longer than 20 characters
+STRING_THRESHOLD = 20
+BASE64_ENTROPY_THRESHOLD = 4.5
+HEX_ENTROPY_THRESHOLD = 3
+
+
+class EntropyCharset:
+    def __init__(self, chars, threshold):
+        self.chars = chars
+        self.threshold = threshold
+        # None of the characters are whitespace, so the runs found in a line
+        # are the same as those truffleHog finds word by word.
+        self.run_regex = re.compile(
+            f"[{re.escape(chars)}]{{{STRING_THRESHOLD + 1},}}",
+        )
+        self._order = {char: index for index, char in enumerate(chars)}
+
+    def entropy(self, data) -> float:
+        """Shannon entropy, as truffleHog's shannon_entropy computes it.
+
+        Characters are counted in a single pass and summed in the same order
+        as truffleHog, so the results are identical.
+        """
+        counts = Counter(data)
+        length = len(data)
+        entropy = 0
+        for char in sorted(counts, key=self._order.__getitem__):
+            p_x = float(counts[char]) / length
+            entropy += - p_x * math.log(p_x, 2)
+        return entropy
+
+    def has_high_entropy_run(self, text) -> bool:
+        for run in self.run_regex.findall(text):
+            # Entropy can't exceed log2 of the number of distinct characters
+            if len(set(run)) < 2 ** self.threshold:
+                continue
+            if self.entropy(run) > self.threshold:
+                return True
+
+        return False
+
+
+BASE64 = EntropyCharset(BASE64_CHARS, BASE64_ENTROPY_THRESHOLD)
+HEX = EntropyCharset(HEX_CHARS, HEX_ENTROPY_THRESHOLD)
+
+
+def has_high_entropy_string(line) -> bool:
+    """True if the line contains a high entropy base64 or hex string"""
+    # Hex characters are a subset of base64 ones, so a line without a long
+    # base64 run can't have a long hex run either.
+    if not BASE64.run_regex.search(line):
+        return False
+
+    return BASE64.has_high_entropy_run(line) or HEX.has_high_entropy_run(line)
@@ -0,0 +1,95 @@
+import re
+from pathlib import PurePath
+
+
+GLOB_CHARS = "*?["
+# Trie key marking an excluded path, never a path part itself
+EXCLUDED = ""
+
+
+def _glob_to_regex(pattern) -> str:
+    """Translate a gitignore style glob to a regex matching a path from the start.
+
+    Globs without a "/" match a name at any depth, "**" matches any number
+    of directories and a trailing "/" only matches directories. A glob that
+    matches a directory matches everything under it.
+    """
+    directory_only = pattern.endswith("/")
+    path = PurePath(pattern).as_posix()
+
+    regex = []
+    i = 0
+    while i < len(path):
+        if path.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+        elif path.startswith("/**", i) and i + 3 == len(path):
+            regex.append("/.*")
+            i += 3
+        elif path[i] == "*":
+            regex.append("[^/]*")
+            i += 1
+        elif path[i] == "?":
+            regex.append("[^/]")
+            i += 1
+        elif path[i] == "[" and path.find("]", i + 2) != -1:
+            end = path.find("]", i + 2)
+            chars = path[i + 1:end]
+            if chars.startswith("!"):
+                chars = "^" + chars[1:]
+            regex.append("[" + chars.replace("\\", "\\\\") + "]")
+            i = end + 1
+        else:
+            regex.append(re.escape(path[i]))
+            i += 1
+
+    prefix = "" if "/" in path else "(?:.*/)?"
+    suffix = "/" if directory_only else "(?:/|$)"
+    return prefix + "".join(regex) + suffix
+
+
+class ExclusionMatcher:
+    """Decides whether a path is excluded, built once from the exclude list.
+
+    Plain entries exclude the file or directory they name, like
+    PurePath.relative_to. They are kept in a trie of path parts, so a lookup
+    walks the path once whatever the number of entries. Entries with glob
+    characters are matched gitignore style by a single combined regex, and
+    are also kept in the trie, so a path such as "file[1].txt" still
+    excludes the file of that name.
+    """
+    def __init__(self, excluded_file_list):
+        self._trie = {}
+        globs = []
+        for entry in excluded_file_list:
+            if any(char in entry for char in GLOB_CHARS):
+                globs.append(entry)
+
+            node = self._trie
+            for part in PurePath(entry).parts:
+                node = node.setdefault(part, {})
+            node[EXCLUDED] = True
+
+        self._glob_regex = None
+        if globs:
+            self._glob_regex = re.compile(
+                "|".join(f"(?:{_glob_to_regex(glob)})" for glob in globs),
+            )
+
+    def is_excluded(self, filename) -> bool:
+        path = PurePath(filename)
+        node = self._trie
+        for part in path.parts:
+            if EXCLUDED in node:
+                return True
+            node = node.get(part)
+            if node is None:
+                break
+        else:
+            if EXCLUDED in node:
+                return True
+
+        if self._glob_regex is not None:
+            return self._glob_regex.match(path.as_posix()) is not None
+
+        return False
@@ -1,23 +1,38 @@
-import re
+import itertools
+import mmap
 
 from rich.console import Console
 
-from truffleHogRegexes.regexChecks import regexes as trufflehog_regexes
-from truffleHog.truffleHog import (
-    get_strings_of_set,
-    BASE64_CHARS,
-    HEX_CHARS,
-    shannon_entropy,
-)
 
-from pii_secret_check_hooks.config import PII_REGEX
+from pii_secret_check_hooks.config import (
+    LINE_MARKER,
+    LINE_WINDOW_OVERLAP,
+    MAX_LINE_LENGTH,
+    MMAP_SCAN_SIZE,
+    FILE_BYTE_BUDGET,
+    FILE_TIME_BUDGET_SECONDS,
+)
 from pii_secret_check_hooks.check_file.base_content_check import (
     CheckFileBase,
 )
-from pii_secret_check_hooks.util import (
-    print_error,
-    print_warning,
+from pii_secret_check_hooks.check_file.entropy import (
+    BASE64,
+    HEX,
+    has_high_entropy_string,
+)
+from pii_secret_check_hooks.check_file.line_cache import create_fingerprint
+from pii_secret_check_hooks.check_file.mapped_scan import (
+    Prefilter,
+    candidate_lines,
+    entropy_spans,
+    has_lone_carriage_return,
+    non_ascii_spans,
 )
+from pii_secret_check_hooks.check_file.scan_limits import line_windows
+from pii_secret_check_hooks.check_file.sniff import BINARY
+from pii_secret_check_hooks.check_file.rules import get_rule_set
+from pii_secret_check_hooks.profile import get_profile
+from pii_secret_check_hooks.report import Finding
 
 
 console = Console()
@@ -33,91 +48,180 @@ class CheckFileContent(CheckFileBase):
         allow_changed_lines=False,
         excluded_file_list=None,
         custom_regex_list=None,
+        jobs=None,
+        staged_only=False,
+        file_time_budget=FILE_TIME_BUDGET_SECONDS,
+        file_byte_budget=FILE_BYTE_BUDGET,
+        baseline=None,
     ):
         self.excluded_file_list = [] if excluded_file_list is None else excluded_file_list
         self.custom_regex_list = [] if custom_regex_list is None else custom_regex_list
+        self._rules = None
+        self._prefilter = None
         super(CheckFileContent, self).__init__(
             check_name="file_content",
             allow_changed_lines=allow_changed_lines,
             excluded_file_list=self.excluded_file_list,
+            jobs=jobs,
+            staged_only=staged_only,
+            file_time_budget=file_time_budget,
+            file_byte_budget=file_byte_budget,
+            baseline=baseline,
+        )
+
+    @property
+    def rules(self):
+        # Compiled once, on the first line that needs checking
+        if self._rules is None:
+            self._rules = get_rule_set(self.custom_regex_list)
+        return self._rules
+
+    def _line_cache_fingerprint(self):
+        rules = self.rules.trufflehog.rules + self.rules.lowercase.rules
+        return create_fingerprint(
+            [f"{rule.name}={rule.pattern}" for rule in rules]
+            + [BASE64.chars, BASE64.threshold, HEX.chars, HEX.threshold],
         )
 
     def _entropy_check(self, line):
-        strings_found = []
-        for word in line.split():
-            base64_strings = get_strings_of_set(word, BASE64_CHARS)
-            hex_strings = get_strings_of_set(word, HEX_CHARS)
-            for string in base64_strings:
-                b64_entropy = shannon_entropy(string, BASE64_CHARS)
-                if b64_entropy > 4.5:
-                    strings_found.append(string)
-            for string in hex_strings:
-                hex_entropy = shannon_entropy(string, HEX_CHARS)
-                if hex_entropy > 3:
-                    strings_found.append(string)
-
-        return len(strings_found) > 0
+        return has_high_entropy_string(line)
 
     def _trufflehog_check(self, line):
-        for trufflehog_key, trufflehog_regex in trufflehog_regexes.items():
-            if re.search(trufflehog_regex, line):
-                return trufflehog_key
-
-        return None
+        rule = self.rules.trufflehog.search(line)
+        return rule.name if rule else None
 
     def _pii_regex(self, line):
-        for pii_key, pii_regex in PII_REGEX.items():
-            try:
-                if re.search(pii_regex, line.lower()):
-                    return pii_key
-            except re.error as ex:
-                print_error(
-                    f"PII regex error for {pii_key} regex: '{ex}",
-                )
-                return None
+        rule = self.rules.pii.search(line.lower())
+        return rule.name if rule else None
 
     def _custom_regex_checks(self, line):
-        for custom_regex in self.custom_regex_list:
-            regex_name = custom_regex
-            if "=" in custom_regex:
-                parts = custom_regex.split("=")
-                regex_name = parts[0]
-                custom_regex = parts[1]
-            try:
-                if re.search(custom_regex, line.lower()):
-                    return f"'{regex_name}'"
-            except re.error as ex:
-                print_error(
-                    f"Custom regex error for {custom_regex} regex: '{ex}'",
-                )
-                return None
-
-    def line_has_issue(self, line) -> bool:
-        trufflehog_check = self._trufflehog_check(line)
-        if trufflehog_check:
-            print_warning(
-                f"Line {self.current_line_num}. {trufflehog_check} check failed",
+        rule = self.rules.custom.search(line.lower())
+        return rule.name if rule else None
+
+    def _issue_found_in_text_file(self, filename) -> bool:
+        if (
+            # Not set for blobs from history, which are already in memory
+            self.current_file_stat is not None
+            and self.current_file_stat.st_size >= MMAP_SCAN_SIZE
+            and self.rules.trufflehog.line_independent
+            and self.rules.lowercase.line_independent
+        ):
+            with open(filename, "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                    if not has_lone_carriage_return(buffer):
+                        return self._issue_found_in_mapped_content(buffer)
+
+        return super()._issue_found_in_text_file(filename)
+
+    def _issue_found_in_mapped_content(self, buffer) -> bool:
+        """Check a large file without decoding all of it.
+
+        Bytes versions of the rules and of the first step of the entropy
+        check find every line that could have an issue. Only those lines are
+        decoded and checked with line_has_issue, so the verdicts are the same
+        as for a line by line scan.
+        """
+        endpos = self.budget.remaining(len(buffer))
+        if self._prefilter is None:
+            self._prefilter = Prefilter(
+                [self.rules.trufflehog_bytes, self.rules.lowercase_bytes],
             )
-            return True
+        spans = itertools.chain(
+            self._prefilter.spans(buffer, endpos),
+            entropy_spans(buffer, endpos),
+            non_ascii_spans(buffer, endpos),
+        )
 
-        if self._entropy_check(line):
-            print_warning(
-                f"Line {self.current_line_num}. entropy check failed",
+        found_issue = False
+        for line_num, start, end in candidate_lines(buffer, spans):
+            if not self.budget.has_time():
+                break
+            self.current_line_num = line_num
+            if self._line_skipped(line_num):
+                continue
+
+            line = buffer[start:end].decode("utf-8")
+            if LINE_MARKER in line and self.allow_changed_lines:
+                continue
+            self.current_line_indent = len(line) - len(line.lstrip())
+            if self._text_has_issue(line.strip()):
+                found_issue = True
+
+        # Marks the budget as exceeded if the file was cut short
+        self.budget.consume(len(buffer))
+        return found_issue
+
+    def _issue_found_in_undecoded_content(self, file_object, filename, file_kind) -> bool:
+        """Search binary and generated files for secrets, without decoding them.
+
+        Only the trufflehog rules are used, PII and entropy checks are too
+        noisy on this content.
+        """
+        found_issue = False
+        for i, line in enumerate(file_object):
+            self.current_line_num = i + 1
+            if not self.budget.consume(len(line)):
+                break
+            # Binary files have no staged line numbers to go by
+            if file_kind != BINARY and self._line_skipped(self.current_line_num):
+                continue
+            if LINE_MARKER.encode("utf-8") in line and self.allow_changed_lines:
+                continue
+
+            self.current_line_indent = 0
+            step = MAX_LINE_LENGTH - LINE_WINDOW_OVERLAP
+            for window_num, window in enumerate(line_windows(line)):
+                rule = self.rules.trufflehog_bytes.search(window)
+                if rule:
+                    self.current_window_offset = window_num * step
+                    self._report_rule(window, rule.name, rule.regex.search(window))
+                    found_issue = True
+                    break
+
+        return found_issue
+
+    def _report_rule(self, line, rule_name, match=None) -> None:
+        column = None
+        if match is not None:
+            column = (
+                self.current_line_indent + self.current_window_offset + match.start() + 1
             )
+        self._report_finding(Finding(
+            check=self.check_name,
+            file=self.current_file,
+            line=self.current_line_num,
+            column=column,
+            rule=rule_name,
+            message=f"Line {self.current_line_num}. {rule_name} check failed",
+        ), line)
+
+    def _time_rules(self, profile, line) -> None:
+        """Time each rule, and the entropy check, on its own"""
+        for rule in self.rules.trufflehog.rules:
+            profile.time_rule(rule.name, rule.regex.search, line)
+        lower_line = line.lower()
+        for rule in self.rules.lowercase.rules:
+            profile.time_rule(rule.name, rule.regex.search, lower_line)
+        profile.time_rule("entropy", self._entropy_check, line)
+
+    def line_has_issue(self, line) -> bool:
+        profile = get_profile()
+        if profile is not None:
+            self._time_rules(profile, line)
+
+        rule = self.rules.trufflehog.search(line)
+        if rule:
+            self._report_rule(line, rule.name, rule.regex.search(line))
             return True
 
-        pii_check_result = self._pii_regex(line)
-        if pii_check_result:
-            print_warning(
-                f"Line {self.current_line_num}. {pii_check_result} check failed",
-            )
+        if self._entropy_check(line):
+            self._report_rule(line, "entropy")
             return True
 
-        custom_regex_check = self._custom_regex_checks(line)
-        if custom_regex_check:
-            print_warning(
-                f"Line {self.current_line_num}. {custom_regex_check} check failed",
-            )
+        lower_line = line.lower()
+        rule = self.rules.lowercase.search(lower_line)
+        if rule:
+            self._report_rule(line, rule.name, rule.regex.search(lower_line))
             return True
 
         return False
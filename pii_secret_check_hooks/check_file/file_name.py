@@ -1,29 +1,105 @@
 import re
+from functools import lru_cache
+
 from rich.console import Console
 
 from pii_secret_check_hooks.config import FILENAME_REGEX
-from pii_secret_check_hooks.util import print_warning
+from pii_secret_check_hooks.check_file.baseline import finding_fingerprint
+from pii_secret_check_hooks.check_file.exclusions import ExclusionMatcher
+from pii_secret_check_hooks.check_file.rules import Rule, RuleGroup
+from pii_secret_check_hooks.report import Finding
+from pii_secret_check_hooks.util import flush_output, report_finding
 
 
 console = Console()
 
+# A literal file name ending, such as "\.pem$" or "_rsa$"
+LITERAL_SUFFIX_REGEX = re.compile(r"^((?:\\\.|[A-Za-z0-9_-])+)\$$")
+
+
+class FilenameMatcher:
+    """Filename regexes indexed so a file name is checked in constant time.
+
+    Extension rules ("\\.ext$") are looked up in a dict by the file's
+    extension, other literal endings are compared with endswith and the
+    remaining rules are prefiltered by one combined regex. As with a loop
+    over the list, the first matching regex in list order is reported.
+    """
+    def __init__(self, filename_regex):
+        # Extension to (list position, regex)
+        self._extensions = {}
+        # (suffix, list position, regex)
+        self._suffixes = []
+        other_rules = []
+        self._positions = {}
+
+        for position, regex in enumerate(filename_regex):
+            self._positions.setdefault(regex, position)
+            match = LITERAL_SUFFIX_REGEX.match(regex)
+            if match is None:
+                other_rules.append(Rule(regex, re.compile(regex)))
+                continue
+
+            suffix = match.group(1).replace("\\.", ".")
+            extension = suffix[1:]
+            if suffix.startswith(".") and "." not in extension:
+                self._extensions.setdefault(extension, (position, regex))
+            else:
+                self._suffixes.append((suffix, position, regex))
+
+        self._other = RuleGroup(other_rules)
+
+    def search(self, filename):
+        """The first regex that matches filename, None if none do"""
+        matches = []
+
+        _, dot, extension = filename.rpartition(".")
+        if dot and "/" not in extension and extension in self._extensions:
+            matches.append(self._extensions[extension])
+
+        for suffix, position, regex in self._suffixes:
+            if filename.endswith(suffix):
+                matches.append((position, regex))
+                break
+
+        rule = self._other.search(filename)
+        if rule is not None:
+            matches.append((self._positions[rule.name], rule.name))
+
+        if not matches:
+            return None
+        return min(matches)[1]
+
+
+@lru_cache(maxsize=8)
+def _get_filename_matcher(filename_regex):
+    return FilenameMatcher(filename_regex)
+
 
 def _detect_match_against_filename(filename, filename_regex):
-    for regex in filename_regex:
-        if re.search(regex, filename):
-            return regex
+    return _get_filename_matcher(tuple(filename_regex)).search(filename)
 
 
-def check_file_names(filenames, excluded_filenames=None):
-    excluded_filenames = [] if excluded_filenames is None else excluded_filenames
+def check_file_names(filenames, excluded_filenames=None, baseline=None):
+    exclusions = ExclusionMatcher(
+        [] if excluded_filenames is None else excluded_filenames,
+    )
     found_issue = False
     for filename in filenames:
-        if filename not in excluded_filenames:
+        if not exclusions.is_excluded(filename):
             match = _detect_match_against_filename(filename, FILENAME_REGEX)
             if match:
-                found_issue = True
-                print_warning(
-                    f"{filename} may contain sensitive information due to the file type",
+                finding = Finding(
+                    check="filename",
+                    file=filename,
+                    rule=match,
+                    message=f"{filename} may contain sensitive information due to the file type",
                 )
+                finding = finding._replace(fingerprint=finding_fingerprint(finding, ""))
+                if baseline is not None and finding.fingerprint in baseline:
+                    continue
+                found_issue = True
+                report_finding(finding)
 
+    flush_output()
     return found_issue
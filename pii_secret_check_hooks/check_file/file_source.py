@@ -0,0 +1,103 @@
+import hashlib
+import io
+import os
+
+from pii_secret_check_hooks.config import MMAP_SCAN_SIZE, SNIFF_SIZE
+from pii_secret_check_hooks.profile import count, stage
+from pii_secret_check_hooks.check_file.sniff import sniff, sniff_file
+
+
+class FileSource:
+    """A file's metadata, hash, kind and content, each read at most once.
+
+    Several checks can be given the same source, so a file is only read,
+    hashed, sniffed and decoded once however many checks look at it. Files
+    smaller than MMAP_SCAN_SIZE are read into memory on first use, larger
+    ones are streamed (or memory mapped) from disk by whoever needs them.
+    """
+    BUFF_SIZE = 65536
+    # Set for blobs from git history, which aren't in the work tree
+    blob_id = None
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._stat = None
+        self._data = None
+        self._text = None
+        self._hash = None
+        self._kind = None
+
+    @property
+    def stat(self):
+        if self._stat is None:
+            self._stat = os.stat(self.filename)
+        return self._stat
+
+    @property
+    def buffered(self) -> bool:
+        return self.stat.st_size < MMAP_SCAN_SIZE
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            with open(self.filename, "rb") as fh:
+                self._data = fh.read()
+            count("bytes read into memory", len(self._data))
+        return self._data
+
+    @property
+    def hash(self) -> str:
+        if self._hash is None:
+            data = self.data if self.buffered else None
+            with stage("hash"):
+                sha1 = hashlib.sha1()
+                if data is not None:
+                    sha1.update(data)
+                else:
+                    with open(self.filename, "rb") as fh:
+                        for chunk in iter(lambda: fh.read(self.BUFF_SIZE), b""):
+                            sha1.update(chunk)
+                self._hash = sha1.hexdigest()
+        return self._hash
+
+    @property
+    def kind(self) -> str:
+        if self._kind is None:
+            if self.buffered:
+                self._kind = sniff(self.data[:SNIFF_SIZE])
+            else:
+                self._kind = sniff_file(self.filename)
+        return self._kind
+
+    def open_text(self):
+        """The content as a text file, decoded as open() would decode it"""
+        if not self.buffered:
+            return open(self.filename, "r")
+
+        if self._text is None:
+            with io.TextIOWrapper(io.BytesIO(self.data)) as fh:
+                self._text = fh.read()
+        # Newlines were already translated when decoding
+        return io.StringIO(self._text, newline="\n")
+
+    def open_binary(self):
+        if not self.buffered:
+            return open(self.filename, "rb")
+        return io.BytesIO(self.data)
+
+
+class BlobSource(FileSource):
+    """A blob read from git history, held in memory.
+
+    filename is the path the blob was found at. Its hash is the blob id, as
+    git has already hashed it.
+    """
+    def __init__(self, filename, data, blob_id):
+        super().__init__(filename)
+        self._data = data
+        self._hash = blob_id
+        self.blob_id = blob_id
+
+    @property
+    def buffered(self) -> bool:
+        return True
@@ -0,0 +1,185 @@
+import os
+import sys
+from array import array
+
+from pii_secret_check_hooks.config import (
+    HISTORY_BATCH_BYTES,
+    HISTORY_BATCH_SIZE,
+    HISTORY_CHECKPOINT_INTERVAL,
+)
+from pii_secret_check_hooks.git_utils import list_history_blobs, read_blobs
+from pii_secret_check_hooks.check_file.file_source import BlobSource
+from pii_secret_check_hooks.check_file.line_cache import create_fingerprint
+from pii_secret_check_hooks.check_file.parallel import (
+    check_batches_in_pool,
+    get_job_count,
+)
+from pii_secret_check_hooks.check_file.pipeline import ScanPipeline
+from pii_secret_check_hooks.util import print_info, print_warning
+
+
+# Bump if the file layout changes
+CHECKPOINT_MAGIC = b"PIIHIST1"
+
+
+class HistoryCheckpoint:
+    """Blobs already found to be clean, so a history scan can be resumed.
+
+    The file is CHECKPOINT_MAGIC, the 20 byte fingerprint of the checks and
+    then the first 8 bytes of each clean blob id, appended as blobs are
+    checked. If the checks change it is started again. Blobs with findings
+    aren't recorded, so they are reported again on the next run.
+    """
+    def __init__(self, path, fingerprint):
+        self.path = path
+        self._header = CHECKPOINT_MAGIC + bytes.fromhex(fingerprint)
+        self._done = set()
+        self._pending = array("Q")
+        # False until the file has a header for these checks
+        self._started = False
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "rb") as checkpoint_file:
+                data = checkpoint_file.read()
+        except FileNotFoundError:
+            return
+
+        if not data.startswith(self._header):
+            print_warning(f"The checks have changed since {self.path} was written, starting again")
+            return
+
+        # A partly written last entry is dropped
+        end = len(data) - (len(data) - len(self._header)) % 8
+        done = array("Q")
+        done.frombytes(data[len(self._header):end])
+        if sys.byteorder != "little":
+            done.byteswap()
+        self._done = set(done)
+        self._started = True
+
+    @staticmethod
+    def _key(blob_id) -> int:
+        return int(blob_id[:16], 16)
+
+    def __contains__(self, blob_id) -> bool:
+        return self._key(blob_id) in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def add(self, blob_id) -> None:
+        key = self._key(blob_id)
+        self._done.add(key)
+        self._pending.append(key)
+        if len(self._pending) >= HISTORY_CHECKPOINT_INTERVAL:
+            self.write()
+
+    def write(self) -> None:
+        if self._started and not self._pending:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "ab" if self._started else "wb") as checkpoint_file:
+            if not self._started:
+                checkpoint_file.write(self._header)
+            if sys.byteorder != "little":
+                self._pending.byteswap()
+            checkpoint_file.write(self._pending.tobytes())
+
+        self._started = True
+        self._pending = array("Q")
+
+
+def create_checkpoint_fingerprint(checks) -> str:
+    """Fingerprint of everything that decides whether a blob is clean"""
+    parts = []
+    for check in checks:
+        parts += [check.check_name, check._line_cache_fingerprint()]
+        parts += sorted(check.excluded_file_list)
+    return create_fingerprint(parts)
+
+
+class HistoryPipeline(ScanPipeline):
+    """Runs the content checks over every blob in git history.
+
+    Blobs are streamed from git cat-file in batches. Each batch is checked
+    (in a worker pool if there are enough blobs) before the next is read,
+    so only about a batch is held in memory at a time. A blob found at
+    several paths or in many commits is checked once, at the first path
+    git lists it at. Clean blobs go into the checkpoint as they are done.
+    """
+    def __init__(self, checks, checkpoint, jobs=None, max_blob_size=None):
+        super().__init__(checks, jobs=jobs)
+        self.checkpoint = checkpoint
+        self.max_blob_size = max_blob_size
+
+    def __getstate__(self):
+        # Workers don't need the checkpoint, which can be large
+        state = self.__dict__.copy()
+        state["checkpoint"] = None
+        return state
+
+    def _source(self, blob) -> BlobSource:
+        # Blobs are read in the parent process and passed in
+        return blob
+
+    def _check_file_isolated(self, blob) -> dict:
+        result = super()._check_file_isolated(blob)
+        result["blob_id"] = blob.blob_id
+        return result
+
+    def _blob_excluded(self, path) -> bool:
+        """True if no check would look at a file at path"""
+        return all(
+            check._file_extension_excluded(path) or check._file_excluded(path)
+            for check in self.checks
+        )
+
+    def _batches(self, blobs):
+        paths = dict(blobs)
+        batch = []
+        batch_bytes = 0
+        for blob_id, data in read_blobs(paths):
+            batch.append(BlobSource(paths[blob_id], data, blob_id))
+            batch_bytes += len(data)
+            if len(batch) >= HISTORY_BATCH_SIZE or batch_bytes >= HISTORY_BATCH_BYTES:
+                yield batch
+                batch = []
+                batch_bytes = 0
+        if batch:
+            yield batch
+
+    def process_history(self, revisions) -> bool:
+        blobs = [
+            (blob_id, path)
+            for blob_id, path in list_history_blobs(revisions, self.max_blob_size)
+            if blob_id not in self.checkpoint and not self._blob_excluded(path)
+        ]
+        print_info(f"Number of blobs for processing: {len(blobs)}")
+        if len(self.checkpoint):
+            print_info(f"{len(self.checkpoint)} blobs were already checked")
+
+        found_issues = False
+        jobs = get_job_count(self.jobs, len(blobs))
+        try:
+            if jobs > 1:
+                for result in check_batches_in_pool(self, self._batches(blobs), jobs):
+                    if self._merge_file_result(result):
+                        found_issues = True
+                    else:
+                        self.checkpoint.add(result["blob_id"])
+            else:
+                for batch in self._batches(blobs):
+                    for blob in batch:
+                        if self._check_file(blob):
+                            found_issues = True
+                        else:
+                            self.checkpoint.add(blob.blob_id)
+        finally:
+            # Also when interrupted, so the next run carries on from here
+            self.checkpoint.write()
+            self._finish_checks()
+
+        return found_issues
@@ -0,0 +1,202 @@
+import io
+import re
+import tokenize
+from collections import namedtuple
+from pathlib import PurePath
+
+
+# Text from a comment or string, on lines start_line to end_line of a file
+Span = namedtuple("Span", ["start_line", "end_line", "text"])
+
+# File suffix to lexer. A lexer is called with a file's text and the line
+# number it starts on, and yields its Spans in order.
+LEXERS = {}
+
+BLOCK_COMMENT_STAR_REGEX = re.compile(r"^\s*\*+(?!/)", re.MULTILINE)
+
+
+def register_lexer(lexer, suffixes) -> None:
+    for suffix in suffixes:
+        LEXERS[suffix.lower()] = lexer
+
+
+def get_lexer(filename):
+    """The lexer for filename, None if its lines should be checked as they are"""
+    return LEXERS.get(PurePath(filename).suffix.lower())
+
+
+def _normalize(text) -> str:
+    return " ".join(text.split())
+
+
+def line_comment(prefix) -> str:
+    return rf"{re.escape(prefix)}([^\n]*)"
+
+
+def hash_comment() -> str:
+    # A "#" inside a word, such as "$#" or "a#b", does not start a comment
+    return r"(?<!\S)#([^\n]*)"
+
+
+def block_comment(start, end) -> str:
+    return rf"{re.escape(start)}((?s:.*?)){re.escape(end)}"
+
+
+def quoted(quote, multiline=False) -> str:
+    """A string between quote characters, with backslash escapes"""
+    newline = "" if multiline else r"\n"
+    return rf"{re.escape(quote)}((?s:\\.|[^{re.escape(quote)}\\{newline}])*){re.escape(quote)}"
+
+
+def raw_quoted(quote) -> str:
+    """A string between quote characters, without escapes"""
+    return rf"{re.escape(quote)}([^{re.escape(quote)}]*){re.escape(quote)}"
+
+
+def doubled_quoted(quote) -> str:
+    """A string between quote characters, escaped by doubling them (SQL)"""
+    return rf"{re.escape(quote)}((?:{re.escape(quote * 2)}|[^{re.escape(quote)}])*){re.escape(quote)}"
+
+
+class RegexLexer:
+    """Finds comments and strings with one combined regex.
+
+    Each pattern has a single group, holding the text inside the delimiters.
+    The regex is searched from left to right, so a comment marker inside a
+    string (or a quote inside a comment) is not mistaken for one. Code
+    between matches is skipped.
+    """
+    def __init__(self, patterns):
+        self.regex = re.compile("|".join(patterns))
+
+    def __call__(self, text, first_line=1):
+        line = first_line
+        offset = 0
+        for match in self.regex.finditer(text):
+            line += text.count("\n", offset, match.start())
+            offset = match.start()
+            end_line = line + match.group().count("\n")
+            content = _normalize(
+                BLOCK_COMMENT_STAR_REGEX.sub("", match.group(match.lastindex)),
+            )
+            if content:
+                yield Span(line, end_line, content)
+
+
+def python_strings_and_comments(fh):
+    """Yield a (token, text) pair for each string and comment in a Python source file.
+
+    Only Python strings and comments are scanned, other source text is ignored.
+    """
+    interesting_types = (tokenize.COMMENT, tokenize.STRING)
+
+    for tok in tokenize.generate_tokens(fh.readline):
+        if tok.type in interesting_types:
+            # Normalize Python comments and whitespace inside strings.
+            value = tok.string.strip().lstrip('#')
+            yield tok, " ".join(value.split())
+
+
+def python_lexer(text, first_line=1):
+    for token, content in python_strings_and_comments(io.StringIO(text)):
+        (lineno, _), (end_lineno, _) = token.start, token.end
+        if content:
+            yield Span(lineno + first_line - 1, end_lineno + first_line - 1, content)
+
+
+# Leading list markers and key, then the value and any comment
+YAML_LINE_REGEX = re.compile(
+    r"\s*(?:-\s+)*(?:(?:[\w.$/-]+|\"[^\"]*\"|'[^']*')\s*:(?=\s|$))?"
+    r"((?:[^#\n]|(?<=\S)#)*)(?:#(.*))?",
+)
+
+
+def yaml_lexer(text, first_line=1):
+    """Comments and values, one line at a time. Keys are left out."""
+    for line_num, line in enumerate(text.split("\n"), first_line):
+        match = YAML_LINE_REGEX.match(line)
+        for content in match.group(1, 2):
+            content = _normalize(content or "")
+            if content:
+                yield Span(line_num, line_num, content)
+
+
+class HtmlLexer:
+    """Text, comments and script strings in HTML and its templates.
+
+    Tags, template tags and expressions ({% %} and {{ }}) and styles are
+    skipped. Text is yielded a line at a time, so a name in a long paragraph
+    is reported on its own line.
+    """
+    regex = re.compile(
+        r"<!--((?s:.*?))-->"
+        r"|\{#((?s:.*?))#\}"
+        r"|<script\b[^>]*>((?s:.*?))</script\s*>"
+        r"|<style\b(?s:.*?)</style\s*>"
+        r"|\{%(?s:.*?)%\}|\{\{(?s:.*?)\}\}"
+        r"|<[^>]*>"
+        r"|([^<{]+|\{)",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, script_lexer):
+        self.script_lexer = script_lexer
+
+    def __call__(self, text, first_line=1):
+        line = first_line
+        offset = 0
+        for match in self.regex.finditer(text):
+            line += text.count("\n", offset, match.start())
+            offset = match.start()
+            comment = match.group(1) or match.group(2)
+            if comment is not None:
+                content = _normalize(comment)
+                if content:
+                    yield Span(line, line + match.group().count("\n"), content)
+            elif match.group(3) is not None:
+                script_line = line + text.count("\n", match.start(), match.start(3))
+                yield from self.script_lexer(match.group(3), script_line)
+            elif match.group(4) is not None:
+                for line_num, text_line in enumerate(match.group(4).split("\n"), line):
+                    content = _normalize(text_line)
+                    if content:
+                        yield Span(line_num, line_num, content)
+
+
+C_LIKE_LEXER = RegexLexer([
+    line_comment("//"), block_comment("/*", "*/"), quoted('"'), quoted("'"),
+])
+JAVASCRIPT_LEXER = RegexLexer([
+    line_comment("//"), block_comment("/*", "*/"),
+    quoted('"'), quoted("'"), quoted("`", multiline=True),
+])
+GO_LEXER = RegexLexer([
+    line_comment("//"), block_comment("/*", "*/"),
+    quoted('"'), quoted("'"), raw_quoted("`"),
+])
+CSS_LEXER = RegexLexer([
+    block_comment("/*", "*/"), quoted('"'), quoted("'"),
+])
+SCSS_LEXER = RegexLexer([
+    line_comment("//"), block_comment("/*", "*/"), quoted('"'), quoted("'"),
+])
+SQL_LEXER = RegexLexer([
+    line_comment("--"), block_comment("/*", "*/"), doubled_quoted("'"),
+])
+SHELL_LEXER = RegexLexer([
+    hash_comment(), quoted('"', multiline=True), raw_quoted("'"),
+])
+HTML_LEXER = HtmlLexer(JAVASCRIPT_LEXER)
+
+register_lexer(python_lexer, [".py"])
+register_lexer(JAVASCRIPT_LEXER, [".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx"])
+register_lexer(GO_LEXER, [".go"])
+register_lexer(C_LIKE_LEXER, [
+    ".c", ".h", ".cc", ".cpp", ".hpp", ".cs", ".java", ".kt", ".kts", ".scala",
+])
+register_lexer(CSS_LEXER, [".css"])
+register_lexer(SCSS_LEXER, [".scss", ".less"])
+register_lexer(SQL_LEXER, [".sql"])
+register_lexer(SHELL_LEXER, [".sh", ".bash", ".zsh"])
+register_lexer(yaml_lexer, [".yml", ".yaml"])
+register_lexer(HTML_LEXER, [".html", ".htm", ".jinja", ".jinja2", ".j2", ".njk"])
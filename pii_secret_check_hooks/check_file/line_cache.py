@@ -0,0 +1,123 @@
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from pii_secret_check_hooks.config import LINE_CACHE_MAX_ENTRIES
+from pii_secret_check_hooks.file_utils import atomic_write
+from pii_secret_check_hooks.git_utils import get_git_dir
+
+
+# Bump when a change to the checks means cached verdicts can't be trusted
+LINE_CACHE_VERSION = "1"
+
+
+def create_fingerprint(parts) -> str:
+    sha1 = hashlib.sha1()
+    for part in (LINE_CACHE_VERSION, *parts):
+        sha1.update(str(part).encode("utf-8", "surrogatepass"))
+        sha1.update(b"\0")
+    return sha1.hexdigest()
+
+
+def get_line_cache_path(check_name) -> str:
+    """Where a check's line cache is kept.
+
+    The cache changes on every run, so it is kept in the git directory
+    rather than next to the hash log, which is committed.
+    """
+    git_dir = get_git_dir()
+    if git_dir is None:
+        return f".pii-secret-hook/{check_name}/line-cache"
+    return os.path.join(git_dir, "pii-secret-hook", check_name, "line-cache")
+
+
+class LineVerdictCache:
+    """Bounded, content addressed cache of lines already found to be clean.
+
+    Keys are hashes of the line (or token) text. The cache file starts with
+    a fingerprint of the rules or model that produced the verdicts and is
+    discarded if that changes. Only clean verdicts are stored, so lines with
+    issues are always checked (and reported) again. The least recently used
+    entries are evicted beyond max_entries.
+    """
+    def __init__(self, path, get_fingerprint, max_entries=LINE_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._get_fingerprint = get_fingerprint
+        self._fingerprint = None
+        self._keys = None
+        self._added = []
+        self._changed = False
+
+    def _load(self) -> bool:
+        # Read on first use, so runs with nothing to scan never pay for it
+        if self._keys is not None:
+            return self._fingerprint is not None
+
+        self._keys = OrderedDict()
+        self._fingerprint = self._get_fingerprint()
+        if self._fingerprint is None:
+            return False
+
+        try:
+            with open(self.path, "r") as cache_file:
+                if cache_file.readline().strip() == self._fingerprint:
+                    for line in cache_file:
+                        self._keys[line.strip()] = None
+        except (FileNotFoundError, UnicodeDecodeError):
+            pass
+
+        return True
+
+    def _key(self, text) -> str:
+        return hashlib.blake2b(
+            text.encode("utf-8", "surrogatepass"),
+            digest_size=10,
+        ).hexdigest()
+
+    def is_clean(self, text) -> bool:
+        if not self._load():
+            return False
+
+        key = self._key(text)
+        if key in self._keys:
+            self._keys.move_to_end(key)
+            return True
+
+        return False
+
+    def add_clean(self, text) -> None:
+        if self._load():
+            key = self._key(text)
+            self._add_key(key)
+            self._added.append(key)
+
+    def _add_key(self, key) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+        self._changed = True
+        while len(self._keys) > self.max_entries:
+            self._keys.popitem(last=False)
+
+    def take_added_keys(self) -> list:
+        """Keys added since the last call, for merging worker results"""
+        added, self._added = self._added, []
+        return added
+
+    def add_keys(self, keys) -> None:
+        if self._load():
+            for key in keys:
+                self._add_key(key)
+
+    def write(self) -> None:
+        if not self._changed:
+            return
+
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.path) as cache_file:
+            cache_file.write(f"{self._fingerprint}\n")
+            for key in self._keys:
+                cache_file.write(f"{key}\n")
+
+        self._changed = False
@@ -0,0 +1,210 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import MutableMapping
+from pathlib import Path
+from urllib.parse import quote
+
+from pii_secret_check_hooks.file_utils import atomic_write, locked_directory
+
+
+# Shard names longer than this end in a hash of the directory instead
+MAX_SHARD_NAME_LENGTH = 200
+
+
+def shard_directory(path) -> str:
+    """The directory whose shard holds a file's entry, "." for the root"""
+    return os.path.dirname(os.path.normpath(path)) or "."
+
+
+def shard_name(directory) -> str:
+    name = quote(directory, safe="")
+    if len(name) > MAX_SHARD_NAME_LENGTH:
+        digest = hashlib.sha1(directory.encode("utf-8", "surrogateescape")).hexdigest()
+        name = f"{name[:MAX_SHARD_NAME_LENGTH - 41]}-{digest}"
+    return f"{name}.json"
+
+
+class FileLog(MutableMapping):
+    """The per file entries of a pii-secret-log.
+
+    The log is a directory with a JSON shard for each directory of the
+    repository, so a run only reads the shards of the files it looks up and
+    only writes those it changed, however large the repository. Keys are
+    sorted and indented for readable diffs.
+
+    Only entries that were set or deleted are written back: holding a lock
+    on the log's parent directory, each changed shard is read again if
+    another run has replaced it, the changes are applied on top and the
+    result is swapped in with os.replace. Hook runs that pre-commit starts
+    in parallel so keep each other's entries, and nothing is written when
+    nothing changed. A log written as a single JSON file by an older
+    version is read as is, and split into shards on the first write.
+    """
+    def __init__(self, path):
+        self.path = str(path)
+        # directory -> (stat of the shard when it was read, entries)
+        self._shards = {}
+        self._dirty = {}
+        self._single_file = None
+
+    def _shard_path(self, directory) -> str:
+        return os.path.join(self.path, shard_name(directory))
+
+    @staticmethod
+    def _stat(path):
+        try:
+            stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _load(path):
+        """The shard or single file log's data, {} if it can't be read"""
+        try:
+            with open(path, "r", encoding="utf-8") as log_file:
+                log_data = json.load(log_file)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            return {}
+        except ValueError:
+            # Not a log this version can read, so its files are checked again
+            return {}
+
+        if not isinstance(log_data, dict) or not isinstance(log_data.get("files"), dict):
+            return {}
+        return log_data["files"]
+
+    def _read_single_file(self) -> dict:
+        """Entries of a log written as one file, by directory"""
+        if self._single_file is None:
+            self._single_file = {}
+            for path, entry in self._load(self.path).items():
+                self._single_file.setdefault(shard_directory(path), {})[path] = entry
+        return self._single_file
+
+    def _read(self, directory) -> None:
+        if os.path.isfile(self.path):
+            files = self._read_single_file().get(directory, {})
+            self._shards[directory] = (None, dict(files))
+            return
+
+        shard_path = self._shard_path(directory)
+        stat = self._stat(shard_path)
+        self._shards[directory] = (stat, self._load(shard_path) if stat else {})
+
+    def _files(self, directory) -> dict:
+        if directory not in self._shards:
+            self._read(directory)
+        return self._shards[directory][1]
+
+    def _read_all(self) -> None:
+        if os.path.isfile(self.path):
+            for directory in self._read_single_file():
+                self._files(directory)
+            return
+        try:
+            shard_files = os.listdir(self.path)
+        except (FileNotFoundError, NotADirectoryError):
+            return
+
+        for shard_file in shard_files:
+            if not shard_file.endswith(".json"):
+                continue
+            shard_path = os.path.join(self.path, shard_file)
+            stat = self._stat(shard_path)
+            files = self._load(shard_path)
+            if files:
+                directory = shard_directory(next(iter(files)))
+                self._shards.setdefault(directory, (stat, files))
+
+    def __getitem__(self, path):
+        if path in self._dirty:
+            entry = self._dirty[path]
+        else:
+            entry = self._files(shard_directory(path)).get(path)
+        if entry is None:
+            raise KeyError(path)
+        return entry
+
+    def __setitem__(self, path, entry):
+        self._dirty[path] = entry
+
+    def __delitem__(self, path):
+        self[path]
+        self._dirty[path] = None
+
+    def __iter__(self):
+        self._read_all()
+        paths = set(self._dirty)
+        for _, files in self._shards.values():
+            paths.update(files)
+        for path in sorted(paths):
+            if path not in self._dirty or self._dirty[path] is not None:
+                yield path
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    @staticmethod
+    def _write(path, files) -> None:
+        with atomic_write(path) as log_file:
+            json.dump({"files": files}, log_file, indent=2, sort_keys=True)
+            log_file.write("\n")
+
+    def _split_single_file(self) -> None:
+        """Replace a log written as one file with a directory of shards"""
+        self._single_file = None
+        shards = self._read_single_file()
+        temp_dir = tempfile.mkdtemp(
+            dir=Path(self.path).parent, prefix=".pii-secret-log-",
+        )
+        try:
+            for directory, files in shards.items():
+                self._write(os.path.join(temp_dir, shard_name(directory)), files)
+            os.remove(self.path)
+            os.rename(temp_dir, self.path)
+        except BaseException:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+        self._single_file = None
+        self._shards = {}
+
+    def flush(self) -> None:
+        """Write the shards with entries set or deleted since the last flush"""
+        if not self._dirty:
+            return
+
+        changes = {}
+        for path, entry in self._dirty.items():
+            changes.setdefault(shard_directory(path), {})[path] = entry
+
+        # The lock is on the log's parent directory, as shards are replaced
+        with locked_directory(Path(self.path).parent):
+            if os.path.isfile(self.path):
+                self._split_single_file()
+            os.makedirs(self.path, exist_ok=True)
+
+            for directory, shard_changes in changes.items():
+                shard_path = self._shard_path(directory)
+                if (
+                    directory not in self._shards
+                    or self._stat(shard_path) != self._shards[directory][0]
+                ):
+                    self._read(directory)
+                files = self._files(directory)
+                for path, entry in shard_changes.items():
+                    if entry is None:
+                        files.pop(path, None)
+                    else:
+                        files[path] = entry
+
+                if files:
+                    self._write(shard_path, files)
+                elif os.path.exists(shard_path):
+                    os.remove(shard_path)
+                self._shards[directory] = (self._stat(shard_path), files)
+
+        self._dirty = {}
@@ -0,0 +1,151 @@
+import re
+
+try:
+    # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+from pii_secret_check_hooks.check_file.entropy import BASE64
+from pii_secret_check_hooks.check_file.rules import RuleGroup
+
+
+BASE64_RUN_REGEX = re.compile(BASE64.run_regex.pattern.encode("ascii"))
+NON_ASCII_REGEX = re.compile(rb"[\x80-\xff]+")
+# Text mode reads a lone carriage return as a line break too
+LONE_CARRIAGE_RETURN_REGEX = re.compile(rb"\r(?!\n)")
+# A run needs at least this many distinct characters to pass either
+# entropy threshold (2 ** 3 for hex)
+MIN_ENTROPY_RUN_CHARS = 8
+
+
+def required_literal(regex):
+    """The longest literal that every match of a bytes regex contains.
+
+    None if there isn't one, or it can't be worked out.
+    """
+    longest = b""
+
+    def walk(items):
+        nonlocal longest
+        run = bytearray()
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                run.append(av)
+                continue
+
+            longest = max(longest, bytes(run), key=len)
+            run = bytearray()
+            # The contents of plain groups, and of repeats that happen at
+            # least once, are part of every match too. Groups with their
+            # own flags, such as "(?i:...)", are left out.
+            if op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+                walk(av[3])
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+                walk(av[2])
+        longest = max(longest, bytes(run), key=len)
+
+    try:
+        walk(sre_parse.parse(regex.pattern, regex.flags))
+    except Exception:
+        return None
+
+    return longest or None
+
+
+def line_bounds(buffer, offset):
+    line_start = buffer.rfind(b"\n", 0, offset) + 1
+    line_end = buffer.find(b"\n", offset)
+    if line_end == -1:
+        line_end = len(buffer)
+    return line_start, line_end
+
+
+class Prefilter:
+    """Finds the lines of a buffer that could match a rule of some groups.
+
+    Rules with a literal that all their matches contain are only run on the
+    lines where the literal is found, which is much faster than running
+    them over the whole buffer. The rest of each group's rules are run over
+    the buffer as a combined regex.
+    """
+    def __init__(self, groups):
+        # (literal regex, rules that contain the literal)
+        self._literals = {}
+        self._regex_groups = []
+        for group in groups:
+            regex_rules = []
+            for rule in group.rules:
+                literal = required_literal(rule.regex)
+                if literal is None:
+                    regex_rules.append(rule)
+                    continue
+
+                # Global inline flags such as "(?i)" are in regex.flags too
+                flags = rule.regex.flags & re.IGNORECASE
+                if (literal, flags) not in self._literals:
+                    self._literals[literal, flags] = (
+                        re.compile(re.escape(literal), flags), [],
+                    )
+                self._literals[literal, flags][1].append(rule)
+
+            if regex_rules:
+                self._regex_groups.append(RuleGroup(regex_rules, group.flags))
+
+    def spans(self, buffer, endpos):
+        """Spans that include every match in buffer[:endpos], and maybe more"""
+        for literal_regex, rules in self._literals.values():
+            checked_to = -1
+            for match in literal_regex.finditer(buffer, 0, endpos):
+                if match.start() <= checked_to:
+                    continue
+                line_start, line_end = line_bounds(buffer, match.start())
+                checked_to = line_end
+                line_end = min(line_end, endpos)
+                if any(rule.regex.search(buffer, line_start, line_end) for rule in rules):
+                    yield line_start, line_end
+
+        for group in self._regex_groups:
+            yield from group.spans(buffer, endpos)
+
+
+def entropy_spans(buffer, endpos):
+    """Spans of base64 runs that could be high entropy strings"""
+    for match in BASE64_RUN_REGEX.finditer(buffer, 0, endpos):
+        if len(set(match.group())) >= MIN_ENTROPY_RUN_CHARS:
+            yield match.span()
+
+
+def non_ascii_spans(buffer, endpos):
+    """Bytes patterns only know ASCII, lines with anything else are kept"""
+    for match in NON_ASCII_REGEX.finditer(buffer, 0, endpos):
+        yield match.span()
+
+
+def has_lone_carriage_return(buffer) -> bool:
+    return LONE_CARRIAGE_RETURN_REGEX.search(buffer) is not None
+
+
+def candidate_lines(buffer, spans):
+    """(line number, start, end) of each line a span touches, in file order.
+
+    Line numbers come from counting newlines between one candidate line and
+    the next, so lines without candidates are never split out or decoded.
+    """
+    bounds = {}
+    for start, end in spans:
+        offset = start
+        while True:
+            line_start, line_end = line_bounds(buffer, offset)
+            bounds[line_start] = line_end
+            # Matches can run over several lines
+            if line_end + 1 >= end:
+                break
+            offset = line_end + 1
+
+    line_num = 1
+    previous_start = 0
+    for line_start in sorted(bounds):
+        line_num += buffer[previous_start:line_start].count(b"\n")
+        previous_start = line_start
+        yield line_num, line_start, bounds[line_start]
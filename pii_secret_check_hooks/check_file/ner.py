@@ -1,27 +1,28 @@
-import pathlib
-import tokenize
-
-import spacy
-import en_core_web_sm
-
 from pii_secret_check_hooks.config import (
     LINE_MARKER,
     NER_IGNORE,
     NER_EXCLUDE,
+    NER_BATCH_SIZE,
+    NER_GATE_MIN_WORD_CHARS,
+    FILE_BYTE_BUDGET,
+    FILE_TIME_BUDGET_SECONDS,
 )
 
-from pii_secret_check_hooks.util import (
-    print_info,
-    print_warning,
-)
+from pii_secret_check_hooks.report import Finding
+from pii_secret_check_hooks.util import print_info
 
 from pii_secret_check_hooks.check_file.base_content_check import (
     CheckFileBase,
 )
-
-
-nlp = en_core_web_sm.load()
-PYTHON_CODE_SUFFIX = ".py"
+from pii_secret_check_hooks.check_file.scan_limits import line_windows
+from pii_secret_check_hooks.check_file.line_cache import create_fingerprint
+from pii_secret_check_hooks.check_file.ner_literals import BenignEntityIndex
+from pii_secret_check_hooks.check_file.ner_gate import NerLineGate
+from pii_secret_check_hooks.check_file.lexers import LEXERS, get_lexer
+from pii_secret_check_hooks.check_file.ner_backends import (
+    SPACY_BACKEND,
+    get_backend,
+)
 
 
 class CheckForNER(CheckFileBase):
@@ -35,74 +36,202 @@ class CheckForNER(CheckFileBase):
         excluded_file_list=None,
         excluded_ner_entity_list=None,
         ner_output_file=None,
+        jobs=None,
+        ner_batch_size=NER_BATCH_SIZE,
+        staged_only=False,
+        file_time_budget=FILE_TIME_BUDGET_SECONDS,
+        file_byte_budget=FILE_BYTE_BUDGET,
+        ner_gate=False,
+        ner_gate_min_word_chars=NER_GATE_MIN_WORD_CHARS,
+        ner_backend=SPACY_BACKEND,
+        ner_gazetteer=None,
+        baseline=None,
     ):
         self.excluded_file_list = [] if excluded_file_list is None else excluded_file_list
-        self.excluded_ners = set(excluded_ner_entity_list or [])
+        self.benign_entities = BenignEntityIndex(excluded_ner_entity_list)
+        self.excluded_ners = self.benign_entities.excluded_ners
         self.ner_output_file = ner_output_file
         self.entity_list = []
+        self.ner_batch_size = ner_batch_size
+        self.backend = get_backend(ner_backend, ner_gazetteer)
+        self.line_gate = None
+        if ner_gate:
+            self.line_gate = NerLineGate(ner_gate_min_word_chars)
 
         super(CheckForNER, self).__init__(
             check_name="ner",
             allow_changed_lines=allow_changed_lines,
             excluded_file_list=self.excluded_file_list,
+            jobs=jobs,
+            staged_only=staged_only,
+            file_time_budget=file_time_budget,
+            file_byte_budget=file_byte_budget,
+            baseline=baseline,
         )
 
     def entity_is_suspicious(self, entity):
         """True if this NER looks suspicious."""
         return not (
             (entity.label_ in NER_IGNORE)
-            or (entity.text in NER_EXCLUDE)
-            or (entity.text in self.excluded_ners)
-            or (entity.text.lower().strip() in self.excluded_ners)
+            or self.benign_entities.is_benign(entity.text)
         )
 
-    def line_has_issue(self, line) -> bool:
-        doc = nlp(line)
+    def _line_cache_fingerprint(self):
+        return create_fingerprint(
+            self.backend.fingerprint()
+            + NER_IGNORE
+            + sorted(NER_EXCLUDE)
+            + sorted(self.excluded_ners),
+        )
+
+    def _report_entity(self, line_num, entity) -> None:
+        # Already imported by the backend
+        import spacy
+
+        reported = self._report_finding(Finding(
+            check=self.check_name,
+            file=self.current_file,
+            line=line_num,
+            rule=entity.label_,
+            text=entity.text,
+            label=entity.label_,
+            message=f"Line {line_num}. please check '{entity.text}' - {entity.label_} - {str(spacy.explain(entity.label_))}",
+        ), entity.doc.text)
+        # Entities in the baseline are accepted, so they aren't written to
+        # the NER output file either
+        if reported and entity.text not in self.entity_list:
+            self.entity_list.append(entity.text)
+
+    def _doc_has_issue(self, doc) -> bool:
         found_issue = False
-        if doc.ents:
-            for ent in doc.ents:
-                if self.entity_is_suspicious(ent):
-                    print_warning(
-                        f"Line {self.current_line_num}. please check '{ent.text}' - {ent.label_} - {str(spacy.explain(ent.label_))}",
-                    )
-                    if ent.text not in self.entity_list:
-                        self.entity_list.append(ent.text)
-                    found_issue = True
+        for ent in doc.ents:
+            if self.entity_is_suspicious(ent):
+                self._report_entity(self.current_line_num, ent)
+                found_issue = True
 
         return found_issue
 
-    def _issue_found_in_python_content(self, file_object) -> bool:
+    def _needs_model(self, text) -> bool:
+        """False if no suspicious entity can be found in text"""
+        if self.line_gate is not None and not self.line_gate.may_have_entity(text):
+            return False
+        return not self.benign_entities.only_benign_words(text)
+
+    def line_has_issue(self, line) -> bool:
+        if not self._needs_model(line):
+            return False
+        return self._doc_has_issue(self.backend(line))
+
+    def _issue_found_in_candidates(self, candidates) -> bool:
+        """Check (line number, text) pairs, streaming them through the model.
+
+        Gathering a file's candidates first means they can go through the
+        model in batches, rather than one pipeline call per line or token.
+        Long texts are split into overlapping windows first.
+        """
+        candidates = [
+            (line_num, window) for line_num, text in candidates
+            for window in line_windows(text)
+            if not self.line_cache.is_clean(window)
+            and self._needs_model(window)
+        ]
+        if not candidates:
+            return False
+
+        docs = self.backend.pipe(
+            (text for _, text in candidates),
+            batch_size=self.ner_batch_size,
+        )
+
         found_issue = False
+        for (line_num, text), doc in zip(candidates, docs):
+            if not self.budget.has_time():
+                break
+            self.current_line_num = line_num
+            if self._doc_has_issue(doc):
+                # Carry on so that all issues are output
+                found_issue = True
+            else:
+                self.line_cache.add_clean(text)
 
-        # The Python source code token and a Spacy named entity.
-        for token, entity in ner_python_scanner(file_object):
-            lineno, _ = token.start
+        return found_issue
 
-            if LINE_MARKER in token.line and self.allow_changed_lines:
+    def _issue_found_in_text_content(self, file_object) -> bool:
+        candidates = []
+        for i, line in enumerate(file_object):
+            if not self.budget.consume(len(line)):
+                break
+            if self._line_skipped(i + 1):
                 continue
+            if LINE_MARKER in line and self.allow_changed_lines:
+                continue
+            candidates.append((i + 1, line.strip()))
+
+        return self._issue_found_in_candidates(candidates)
 
-            if not self.entity_is_suspicious(entity):
+    def _check_file_isolated(self, filename, source=None) -> dict:
+        # Only report the entities found in this file back to the parent
+        self.entity_list = []
+        result = super()._check_file_isolated(filename, source)
+        result["entities"] = self.entity_list
+        result["gate_skipped_lines"] = self._take_gate_skipped_lines()
+        return result
+
+    def _take_gate_skipped_lines(self) -> int:
+        if self.line_gate is None:
+            return 0
+        skipped_lines = self.line_gate.skipped_lines
+        self.line_gate.skipped_lines = 0
+        return skipped_lines
+
+    def _merge_file_result(self, result) -> None:
+        super()._merge_file_result(result)
+        if self.line_gate is not None:
+            self.line_gate.skipped_lines += result["gate_skipped_lines"]
+        for entity in result["entities"]:
+            if entity not in self.entity_list:
+                self.entity_list.append(entity)
+
+    def _issue_found_in_lexed_content(self, file_object, lexer) -> bool:
+        """Check the comments and strings that lexer finds in the file"""
+        text = file_object.read()
+        checked_size = self.budget.remaining(len(text))
+        self.budget.consume(len(text))
+        text = text[:checked_size]
+        lines = text.split("\n")
+
+        candidates = []
+        for span in lexer(text):
+            if not self.budget.has_time():
+                break
+            span_lines = range(span.start_line, span.end_line + 1)
+            # Spans can cover several lines, check them if any of their lines is
+            if all(self._line_skipped(n) for n in span_lines):
+                continue
+            if self.allow_changed_lines and any(
+                LINE_MARKER in lines[n - 1] for n in span_lines
+            ):
                 continue
+            candidates.append((span.start_line, span.text))
 
-            found_issue = True
-            print_warning(
-                f"Line {lineno}. please check '{entity}' - {entity.label_}"
-                f" - {spacy.explain(entity.label_)}"
-            )
-            if entity.text not in self.entity_list:
-                self.entity_list.append(entity.text)
+        return self._issue_found_in_candidates(candidates)
 
-        return found_issue
+    def _issue_found_in_python_content(self, file_object) -> bool:
+        return self._issue_found_in_lexed_content(file_object, LEXERS[".py"])
 
     def _issue_found_in_file_content(self, file_object, filename) -> bool:
-        path = pathlib.Path(filename)
+        lexer = get_lexer(filename)
+        if lexer is not None:
+            return self._issue_found_in_lexed_content(file_object, lexer)
 
-        if path.suffix.lower() == PYTHON_CODE_SUFFIX:
-            return self._issue_found_in_python_content(file_object)
-
-        return super()._issue_found_in_file_content(file_object, filename)
+        return self._issue_found_in_text_content(file_object)
 
     def after_run(self) -> None:
+        if self.line_gate is not None and self.line_gate.skipped_lines:
+            print_info(
+                f"{self.line_gate.skipped_lines} lines without capitals or enough "
+                "words were not passed to the NER model",
+            )
         if self.ner_output_file:
             self._generate_ner_file()
         else:
@@ -119,20 +248,3 @@ class CheckForNER(CheckFileBase):
         with open(self.ner_output_file, "a") as exclude_file:
             for entity in self.entity_list:
                 exclude_file.write(f"{entity}\n")
-
-
-def ner_python_scanner(fh):
-    """Yield a (token, entity) pair for each NER found in a Python source file.
-
-    Only Python strings and comments are scanned, other source text is ignored.
-    """
-    interesting_types = (tokenize.COMMENT, tokenize.STRING)
-
-    for tok in tokenize.generate_tokens(fh.readline):
-        if tok.type in interesting_types:
-            # Normalize Python comments and whitespace inside strings.
-            value = tok.string.strip().lstrip('#')
-            value = " ".join(value.split())
-
-            for ent in nlp(value).ents:
-                yield tok, ent
@@ -0,0 +1,166 @@
+import importlib.metadata
+from abc import ABC, abstractmethod
+
+from pii_secret_check_hooks.config import (
+    NER_EXCLUDED_COMPONENTS,
+    NER_LABELS,
+    NER_ORG_SUFFIXES,
+    NER_PERSON_TITLES,
+)
+from pii_secret_check_hooks.profile import get_profile, stage
+from pii_secret_check_hooks.util import print_error
+
+
+SPACY_BACKEND = "spacy"
+RULES_BACKEND = "rules"
+
+
+class NerBackend(ABC):
+    """Runs named entity recognition, loading what it needs on first use.
+
+    Backends return spaCy docs whose entities use the en_core_web_sm labels
+    (NER_LABELS), so NER_IGNORE and the exclusions apply to all of them.
+    """
+    name = None
+
+    def __init__(self):
+        self._nlp = None
+
+    def __getstate__(self):
+        # Worker processes load their own pipeline
+        state = self.__dict__.copy()
+        state["_nlp"] = None
+        return state
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            with stage(f"{self.name} ner model load"):
+                self._nlp = self.load()
+        return self._nlp
+
+    @abstractmethod
+    def load(self):
+        """Return the spaCy pipeline that finds the entities"""
+        pass
+
+    @abstractmethod
+    def fingerprint(self) -> list:
+        """Values that change when the backend would find different entities"""
+        pass
+
+    def __call__(self, text):
+        nlp = self.nlp
+        with stage(f"{self.name} ner model"):
+            return nlp(text)
+
+    def pipe(self, texts, batch_size):
+        docs = self.nlp.pipe(texts, batch_size=batch_size)
+        profile = get_profile()
+        if profile is not None:
+            # Each doc is counted as a call
+            return profile.timed(f"{self.name} ner model", docs)
+        return docs
+
+
+class SpacyBackend(NerBackend):
+    """The en_core_web_sm statistical model, with only the NER component.
+
+    spaCy and the model are imported on first use rather than at module
+    level, so runs where every file is excluded or unchanged never pay for
+    them.
+    """
+    name = SPACY_BACKEND
+
+    def load(self):
+        import en_core_web_sm
+        return en_core_web_sm.load(exclude=NER_EXCLUDED_COMPONENTS)
+
+    def fingerprint(self) -> list:
+        try:
+            version = importlib.metadata.version("en_core_web_sm")
+        except importlib.metadata.PackageNotFoundError:
+            version = None
+        return [self.name, version]
+
+
+class RulesBackend(NerBackend):
+    """Token patterns and a gazetteer, matched by spaCy's EntityRuler.
+
+    Only the tokenizer runs, so this is much faster than the model and
+    needs no model download, but it only finds names after a title (such as
+    "Dr"), organisations ending in a company suffix (such as "Ltd") and the
+    phrases in the gazetteer. Gazetteer entries are "LABEL=phrase".
+    """
+    name = RULES_BACKEND
+
+    def __init__(self, gazetteer=None):
+        super().__init__()
+        self.patterns = _default_patterns() + _gazetteer_patterns(gazetteer or [])
+
+    def load(self):
+        import spacy
+        nlp = spacy.blank("en")
+        ruler = nlp.add_pipe("entity_ruler")
+        ruler.add_patterns(self.patterns)
+        return nlp
+
+    def fingerprint(self) -> list:
+        return [self.name] + sorted(repr(pattern) for pattern in self.patterns)
+
+
+NER_BACKENDS = {
+    SPACY_BACKEND: SpacyBackend,
+    RULES_BACKEND: RulesBackend,
+}
+
+_backends = {}
+
+
+def get_backend(name=SPACY_BACKEND, gazetteer=None) -> NerBackend:
+    """The backend with these settings, shared so its pipeline loads once"""
+    gazetteer = tuple(gazetteer or [])
+    key = (name, gazetteer if name == RULES_BACKEND else ())
+    if key not in _backends:
+        if name == RULES_BACKEND:
+            _backends[key] = RulesBackend(gazetteer)
+        else:
+            _backends[key] = NER_BACKENDS[name]()
+    return _backends[key]
+
+
+def _default_patterns():
+    # The tokenizer keeps the full stop of some titles, such as "Dr."
+    titles = NER_PERSON_TITLES + [f"{title}." for title in NER_PERSON_TITLES]
+    return [
+        {
+            "label": "PERSON",
+            "pattern": [
+                {"LOWER": {"IN": titles}},
+                {"TEXT": ".", "OP": "?"},
+                {"IS_TITLE": True},
+                {"IS_TITLE": True, "OP": "?"},
+            ],
+        },
+        {
+            "label": "ORG",
+            "pattern": [
+                {"IS_TITLE": True, "OP": "+"},
+                {"LOWER": {"IN": NER_ORG_SUFFIXES}},
+            ],
+        },
+    ]
+
+
+def _gazetteer_patterns(gazetteer):
+    patterns = []
+    for entry in gazetteer:
+        label, _, phrase = entry.partition("=")
+        if label not in NER_LABELS or not phrase:
+            print_error(
+                f"Gazetteer error for '{entry}', expected LABEL=phrase with one of {', '.join(NER_LABELS)}",
+            )
+            continue
+        patterns.append({"label": label, "pattern": phrase})
+
+    return patterns
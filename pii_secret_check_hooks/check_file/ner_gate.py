@@ -0,0 +1,43 @@
+import re
+
+from pii_secret_check_hooks.config import NER_GATE_MIN_WORD_CHARS
+
+
+NON_ASCII_LETTER_REGEX = re.compile(r"[^\W\d_\x00-\x7f]")
+
+
+class NerLineGate:
+    """Cheap checks that decide whether a line is worth running the model on.
+
+    The model almost never tags an entity without a capitalised token, so
+    lines with no upper case letters are skipped, unless they have non-ASCII
+    letters (which may come from scripts without case). Lines with fewer
+    than min_word_chars word characters, such as blank lines, punctuation
+    and short numbers, are skipped too. A min_word_chars of 0 keeps short
+    lines.
+    """
+    def __init__(self, min_word_chars=NER_GATE_MIN_WORD_CHARS):
+        self.min_word_chars = min_word_chars
+        self._enough_words_regex = None
+        if min_word_chars:
+            self._enough_words_regex = re.compile(
+                rf"(?:\w\W*){{{min_word_chars}}}",
+            )
+        self.skipped_lines = 0
+
+    def may_have_entity(self, text) -> bool:
+        if not self._has_case_or_non_ascii_letter(text) or (
+            self._enough_words_regex is not None
+            and not self._enough_words_regex.search(text)
+        ):
+            self.skipped_lines += 1
+            return False
+
+        return True
+
+    @staticmethod
+    def _has_case_or_non_ascii_letter(text) -> bool:
+        # Only upper case letters change when lower cased
+        return text.lower() != text or (
+            not text.isascii() and NON_ASCII_LETTER_REGEX.search(text) is not None
+        )
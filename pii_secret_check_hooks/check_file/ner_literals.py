@@ -0,0 +1,95 @@
+import re
+
+from pii_secret_check_hooks.config import NER_EXCLUDE
+
+
+WORD_REGEX = re.compile(r"\w+")
+# Literals are only taken to stand alone when one of these is between them,
+# as the model can join literals separated by a space or "&" into one entity
+LITERAL_SEPARATOR_REGEX = re.compile(r"[,;|()\[\]{}]")
+
+
+def _is_word_char(char) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _index_by_first_word(literals) -> dict:
+    """Map the first word of each literal to (offset of that word, literal)
+
+    Each list is longest literal first, so the longest match wins.
+    """
+    index = {}
+    for literal in sorted(literals, key=len, reverse=True):
+        word = WORD_REGEX.search(literal)
+        if word is not None:
+            index.setdefault(word.group(), []).append((word.start(), literal))
+    return index
+
+
+class BenignEntityIndex:
+    """Entity texts that are never reported, from NER_EXCLUDE and the user's
+    pii-ner-exclude.txt.
+
+    Entities are looked up in frozen sets. The literals are also indexed by
+    their first word, so a line can be matched against all of them in one
+    pass over its words. Lines made only of literals standing on their own
+    skip the model. User exclusions are matched ignoring case, as they are
+    stored lower cased.
+    """
+    def __init__(self, excluded_ner_entity_list=None):
+        self.excluded_ners = frozenset(excluded_ner_entity_list or [])
+        self._exact = _index_by_first_word(NER_EXCLUDE)
+        self._ignore_case = _index_by_first_word(
+            {literal.lower() for literal in self.excluded_ners},
+        )
+
+    def is_benign(self, text) -> bool:
+        return (
+            text in NER_EXCLUDE
+            or text in self.excluded_ners
+            or text.lower().strip() in self.excluded_ners
+        )
+
+    def _literal_at(self, text, word) -> int:
+        """End of the longest literal that word starts, as a whole word, or -1"""
+        for ignore_case in (False, True):
+            index = self._ignore_case if ignore_case else self._exact
+            key = word.group().lower() if ignore_case else word.group()
+            for offset, literal in index.get(key, ()):
+                start = word.start() - offset
+                end = start + len(literal)
+                found = text[start:end]
+                if ignore_case:
+                    found = found.lower()
+                if (
+                    start >= 0
+                    and found == literal
+                    and (start == 0 or not _is_word_char(text[start - 1]))
+                    and (end == len(text) or not _is_word_char(text[end]))
+                ):
+                    return end
+
+        return -1
+
+    def only_benign_words(self, text) -> bool:
+        """True if every word in text is part of a benign literal standing on
+        its own.
+
+        Any other word, digits included, or two literals next to each other
+        can lead the model to an entity spanning a literal, such as
+        "Django 2.1.7", which is not itself benign.
+        """
+        found = False
+        covered_to = 0
+        for word in WORD_REGEX.finditer(text):
+            if word.start() < covered_to:
+                continue
+            end = self._literal_at(text, word)
+            if end == -1:
+                return False
+            if found and not LITERAL_SEPARATOR_REGEX.search(text, covered_to, word.start()):
+                return False
+            found = True
+            covered_to = end
+
+        return found
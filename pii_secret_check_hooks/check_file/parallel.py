@@ -0,0 +1,65 @@
+import math
+import multiprocessing
+import os
+
+from pii_secret_check_hooks.profile import get_profile, start_worker_profile
+
+
+# Starting a worker (and, for NER, loading the model) is only worth it when
+# each worker gets a reasonable share of the files.
+MIN_FILES_PER_JOB = 25
+
+# Set in each worker process by _init_worker
+_worker_check = None
+
+
+def available_cpu_count() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def get_job_count(jobs, file_count) -> int:
+    """Number of worker processes to use, jobs=None means auto-detect"""
+    if jobs is not None:
+        return max(1, min(jobs, file_count))
+
+    return max(1, min(
+        available_cpu_count(),
+        math.ceil(file_count / MIN_FILES_PER_JOB),
+    ))
+
+
+def _init_worker(check, profiling):
+    # The check (and its compiled rules) is set up once per worker rather
+    # than once per file.
+    global _worker_check
+    _worker_check = check
+    start_worker_profile(profiling)
+
+
+def _check_file_in_worker(filename):
+    return _worker_check._check_file_isolated(filename)
+
+
+def check_files_in_pool(check, filenames, jobs):
+    """Yield each file's result, in the order the files were given"""
+    yield from check_batches_in_pool(check, [filenames], jobs)
+
+
+def check_batches_in_pool(check, batches, jobs):
+    """Yield each file's result, for files given in batches.
+
+    The pool is started once, but only one batch is handed to it at a time,
+    so batches can be read lazily (such as blobs from git history) without
+    all of them being held in memory.
+    """
+    with multiprocessing.Pool(
+        jobs,
+        initializer=_init_worker,
+        initargs=(check, get_profile() is not None),
+    ) as pool:
+        for batch in batches:
+            chunksize = max(1, len(batch) // (jobs * 4))
+            yield from pool.imap(_check_file_in_worker, batch, chunksize)
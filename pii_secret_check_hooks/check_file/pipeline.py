@@ -0,0 +1,91 @@
+from pii_secret_check_hooks.check_file.file_source import FileSource
+from pii_secret_check_hooks.check_file.parallel import (
+    check_files_in_pool,
+    get_job_count,
+)
+from pii_secret_check_hooks.profile import stage
+from pii_secret_check_hooks.util import print_info
+
+
+class ScanPipeline:
+    """Runs several content checks over the same files in one pass.
+
+    Each file is read, hashed, sniffed and decoded once, into a FileSource
+    that every check is given in turn. Checks keep their own hash log, line
+    cache and results, so a file that one check has already passed is still
+    checked by the others.
+    """
+    def __init__(self, checks, jobs=None, staged_only=False):
+        self.checks = checks
+        self.jobs = jobs
+        self.staged_only = staged_only
+        # Names of the checks that found an issue
+        self.failed_checks = []
+
+    def _source(self, filename) -> FileSource:
+        return FileSource(filename)
+
+    def _check_file(self, filename) -> bool:
+        source = self._source(filename)
+        found_issue = False
+        for check in self.checks:
+            if check._check_file(source.filename, source):
+                self._check_failed(check)
+                found_issue = True
+
+        return found_issue
+
+    def _check_file_isolated(self, filename) -> dict:
+        """Check a file with every check in a worker process"""
+        source = self._source(filename)
+        return {
+            "results": [
+                check._check_file_isolated(source.filename, source) for check in self.checks
+            ],
+        }
+
+    def _merge_file_result(self, result) -> bool:
+        found_issue = False
+        for check, check_result in zip(self.checks, result["results"]):
+            check._merge_file_result(check_result)
+            if check_result["found_issue"]:
+                self._check_failed(check)
+                found_issue = True
+
+        return found_issue
+
+    def _check_failed(self, check) -> None:
+        if check.check_name not in self.failed_checks:
+            self.failed_checks.append(check.check_name)
+
+    def process_files(self, filenames) -> bool:
+        filenames = list(filenames)
+        print_info(f"Number of files for processing: {len(filenames)}")
+
+        found_issues = False
+        if self.checks and self.staged_only:
+            # Read the staged changes once and share them
+            self.checks[0]._load_staged_lines(filenames)
+            for check in self.checks[1:]:
+                check.staged_lines = self.checks[0].staged_lines
+
+        jobs = get_job_count(self.jobs, len(filenames))
+        if jobs > 1:
+            for result in check_files_in_pool(self, filenames, jobs):
+                if self._merge_file_result(result):
+                    found_issues = True
+        else:
+            for filename in filenames:
+                if self._check_file(filename):
+                    found_issues = True
+
+        self._finish_checks()
+        return found_issues
+
+    def _finish_checks(self) -> None:
+        for check in self.checks:
+            check._write_log()
+            with stage(f"{check.check_name} line cache write"):
+                check.line_cache.write()
+            check._print_accepted_findings()
+            check.after_run()
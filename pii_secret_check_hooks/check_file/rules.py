@@ -0,0 +1,243 @@
+import re
+from functools import lru_cache
+
+from truffleHogRegexes.regexChecks import regexes as trufflehog_regexes
+
+from pii_secret_check_hooks.config import PII_REGEX
+from pii_secret_check_hooks.util import print_error
+
+
+# Inline flags such as "(?i)" must start a pattern, so they cannot be wrapped.
+GLOBAL_FLAGS_REGEX = re.compile(r"^\(\?[aiLmsux]+\)")
+# Numbered or named back references change meaning once a pattern is wrapped.
+BACK_REFERENCE_REGEX = re.compile(r"\\[1-9]|\(\?P=")
+
+
+class Rule:
+    def __init__(self, name, regex):
+        self.name = name
+        self.regex = regex
+
+    @property
+    def pattern(self):
+        return self.regex.pattern
+
+    def to_bytes(self, flags=0):
+        """The same rule compiled to search bytes, None if it can't be"""
+        try:
+            return Rule(
+                self.name,
+                re.compile(
+                    self.pattern.encode("utf-8"),
+                    (self.regex.flags & ~re.UNICODE) | flags,
+                ),
+            )
+        except re.error:
+            return None
+
+    @property
+    def line_independent(self) -> bool:
+        """False if the rule has anchors or lookarounds.
+
+        Those can match differently in a whole file than in a single
+        stripped line.
+        """
+        return not _has_context_assertions(self.pattern)
+
+
+class RuleGroup:
+    """Ordered rules prefiltered with a single combined alternation.
+
+    A clean line costs one scan of the combined pattern. Only on a hit are the
+    rules searched one by one, so the first matching rule in list order is
+    reported, as the old per-rule loop did. Capturing named groups would name
+    the rule directly but make every scan several times slower in sre.
+    """
+    def __init__(self, rules, flags=0):
+        self.rules = list(rules)
+        self.flags = flags
+        self._standalone = [
+            rule for rule in self.rules if not _combinable(rule.regex, flags)
+        ]
+
+        alternatives = [
+            rule.pattern for rule in self.rules if _combinable(rule.regex, flags)
+        ]
+
+        self._combined = None
+        if alternatives:
+            try:
+                self._combined = re.compile(_join_alternatives(alternatives), flags)
+            except re.error:
+                # Fall back to searching each rule on its own
+                self._standalone = self.rules
+
+    def search(self, text):
+        """Return the first rule, in list order, that matches text."""
+        rules = self.rules
+        if self._combined is None or not self._combined.search(text):
+            rules = self._standalone
+
+        for rule in rules:
+            if rule.regex.search(text):
+                return rule
+
+        return None
+
+    def spans(self, data, endpos):
+        """(start, end) of every match of any rule in data[:endpos].
+
+        Spans of different rules can overlap, they are not in order.
+        """
+        regexes = [rule.regex for rule in self._standalone]
+        if self._combined is not None:
+            regexes.append(self._combined)
+
+        for regex in regexes:
+            for match in regex.finditer(data, 0, endpos):
+                yield match.span()
+
+    @property
+    def line_independent(self) -> bool:
+        return all(rule.line_independent for rule in self.rules)
+
+    def to_bytes(self, flags=0):
+        rules = [rule.to_bytes(flags) for rule in self.rules]
+        return RuleGroup((rule for rule in rules if rule is not None), flags)
+
+
+class RuleSet:
+    """All content regexes, compiled once per run.
+
+    Trufflehog rules are matched against the line as is, PII and custom
+    rules against the lower cased line.
+    """
+    def __init__(self, custom_regex_list=None):
+        self.trufflehog = RuleGroup(_trufflehog_rules())
+        self.pii = RuleGroup(_pii_rules())
+        self.custom = RuleGroup(_custom_rules(custom_regex_list or []))
+        self.lowercase = RuleGroup(self.pii.rules + self.custom.rules)
+        self._trufflehog_bytes = None
+        self._lowercase_bytes = None
+
+    @property
+    def trufflehog_bytes(self):
+        """Trufflehog rules for files that aren't decoded as text"""
+        if self._trufflehog_bytes is None:
+            self._trufflehog_bytes = self.trufflehog.to_bytes()
+        return self._trufflehog_bytes
+
+    @property
+    def lowercase_bytes(self):
+        """PII and custom rules for bytes, ignoring ASCII case instead of
+        lower casing the text first"""
+        if self._lowercase_bytes is None:
+            self._lowercase_bytes = self.lowercase.to_bytes(re.IGNORECASE)
+        return self._lowercase_bytes
+
+
+@lru_cache(maxsize=8)
+def _get_rule_set(custom_regexes):
+    return RuleSet(custom_regexes)
+
+
+def get_rule_set(custom_regex_list):
+    """Shared rule set, so a long running scan daemon compiles it only once"""
+    return _get_rule_set(tuple(custom_regex_list))
+
+
+def _combinable(regex, flags=0) -> bool:
+    if regex.flags & ~re.UNICODE != flags:
+        return False
+    if regex.groupindex:
+        return False
+    pattern = regex.pattern
+    if isinstance(pattern, bytes):
+        pattern = pattern.decode("utf-8")
+    if GLOBAL_FLAGS_REGEX.match(pattern):
+        return False
+    if BACK_REFERENCE_REGEX.search(pattern):
+        return False
+
+    return True
+
+
+def _has_context_assertions(pattern) -> bool:
+    """True if the pattern has anchors or lookarounds outside character sets"""
+    index = 0
+    in_set = False
+    set_start = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "\\":
+            if not in_set and pattern[index + 1:index + 2] in ("A", "Z", "z", "B"):
+                return True
+            index += 2
+            continue
+
+        if in_set:
+            # A "]" straight after "[" or "[^" is a literal
+            if char == "]" and index > set_start:
+                in_set = False
+        elif char == "[":
+            in_set = True
+            set_start = index + 1
+            if pattern[set_start:set_start + 1] == "^":
+                set_start += 1
+        elif char in "^$":
+            return True
+        elif pattern.startswith(("(?=", "(?!", "(?<=", "(?<!"), index):
+            return True
+        index += 1
+
+    return False
+
+
+def _join_alternatives(patterns):
+    if isinstance(patterns[0], bytes):
+        return b"|".join(b"(?:" + pattern + b")" for pattern in patterns)
+    return "|".join(f"(?:{pattern})" for pattern in patterns)
+
+
+def _compile(pattern):
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern)
+
+
+def _trufflehog_rules():
+    return [
+        Rule(trufflehog_key, _compile(trufflehog_regex))
+        for trufflehog_key, trufflehog_regex in trufflehog_regexes.items()
+    ]
+
+
+def _pii_rules():
+    rules = []
+    for pii_key, pii_regex in PII_REGEX.items():
+        try:
+            rules.append(Rule(pii_key, _compile(pii_regex)))
+        except re.error as ex:
+            print_error(
+                f"PII regex error for {pii_key} regex: '{ex}",
+            )
+
+    return rules
+
+
+def _custom_rules(custom_regex_list):
+    rules = []
+    for custom_regex in custom_regex_list:
+        regex_name = custom_regex
+        if "=" in custom_regex:
+            parts = custom_regex.split("=")
+            regex_name = parts[0]
+            custom_regex = parts[1]
+        try:
+            rules.append(Rule(f"'{regex_name}'", _compile(custom_regex)))
+        except re.error as ex:
+            print_error(
+                f"Custom regex error for {custom_regex} regex: '{ex}'",
+            )
+
+    return rules
@@ -0,0 +1,81 @@
+import time
+
+from pii_secret_check_hooks.config import (
+    LINE_WINDOW_OVERLAP,
+    MAX_LINE_LENGTH,
+)
+
+
+def line_windows(text, max_length=MAX_LINE_LENGTH, overlap=LINE_WINDOW_OVERLAP):
+    """Split text into windows of at most max_length characters.
+
+    Neighbouring windows share overlap characters, so a match no longer than
+    the overlap is always wholly inside at least one window.
+    """
+    if len(text) <= max_length:
+        yield text
+        return
+
+    step = max_length - overlap
+    start = 0
+    while True:
+        yield text[start:start + max_length]
+        if start + max_length >= len(text):
+            return
+        start += step
+
+
+class ScanBudget:
+    """Limits on how long a single file is checked for, and how much of it.
+
+    Sizes are counted in decoded characters, which is the number of bytes
+    for ASCII text. A limit of None or 0 disables it.
+    """
+    def __init__(self, max_seconds=None, max_bytes=None):
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.exceeded = None
+        self._deadline = None
+        self._started = None
+        self._bytes = 0
+
+    def start(self) -> None:
+        self.exceeded = None
+        self._bytes = 0
+        self._started = time.monotonic()
+        self._deadline = (
+            self._started + self.max_seconds if self.max_seconds else None
+        )
+
+    @property
+    def checked(self) -> int:
+        """Characters read since start"""
+        return self._bytes
+
+    def elapsed(self) -> float:
+        """Seconds since start"""
+        return time.monotonic() - self._started
+
+    def consume(self, size) -> bool:
+        """Count size more characters as read, False once over budget"""
+        self._bytes += size
+        if self.max_bytes and self._bytes > self.max_bytes and self.exceeded is None:
+            self.exceeded = f"it is larger than the {self.max_bytes} byte budget"
+
+        return self.has_time()
+
+    def remaining(self, size) -> int:
+        """How much of size more characters fits in the byte budget"""
+        if not self.max_bytes:
+            return size
+        return max(0, min(size, self.max_bytes - self._bytes))
+
+    def has_time(self) -> bool:
+        if (
+            self.exceeded is None
+            and self._deadline is not None
+            and time.monotonic() > self._deadline
+        ):
+            self.exceeded = f"it took longer than the {self.max_seconds} second budget"
+
+        return self.exceeded is None
@@ -0,0 +1,43 @@
+import codecs
+import re
+
+from pii_secret_check_hooks.config import (
+    GENERATED_FILE_REGEX,
+    MIN_UTF8_RATIO,
+    SNIFF_SIZE,
+)
+
+
+TEXT = "text"
+BINARY = "binary"
+GENERATED = "generated"
+
+GENERATED_REGEX = re.compile(
+    b"|".join(b"(?:" + regex + b")" for regex in GENERATED_FILE_REGEX),
+    re.MULTILINE,
+)
+
+
+def sniff(sample) -> str:
+    """Tell text from binary or generated files by their first bytes.
+
+    Minified files and one line JSON are text, their long lines are
+    checked in windows like any other.
+    """
+    if b"\0" in sample:
+        return BINARY
+
+    # Don't count a character cut in half at the end of the sample
+    decoded = codecs.getincrementaldecoder("utf-8")("replace").decode(sample)
+    if decoded and decoded.count("\ufffd") / len(decoded) > 1 - MIN_UTF8_RATIO:
+        return BINARY
+
+    if GENERATED_REGEX.search(sample):
+        return GENERATED
+
+    return TEXT
+
+
+def sniff_file(filename) -> str:
+    with open(filename, "rb") as fh:
+        return sniff(fh.read(SNIFF_SIZE))
@@ -0,0 +1,283 @@
+import sys
+
+from pii_secret_check_hooks.config import (
+    FILE_BYTE_BUDGET,
+    FILE_TIME_BUDGET_SECONDS,
+    NER_BATCH_SIZE,
+    NER_GATE_MIN_WORD_CHARS,
+)
+from pii_secret_check_hooks.report import (
+    OUTPUT_FORMATS,
+    TEXT_FORMAT,
+    create_reporter,
+)
+from pii_secret_check_hooks.util import (
+    get_excluded_filenames,
+    get_excluded_ner,
+    get_ner_gazetteer,
+    get_regex_from_file,
+)
+from pii_secret_check_hooks.check_file.file_content import CheckFileContent
+from pii_secret_check_hooks.check_file.file_name import check_file_names
+from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.ner_backends import (
+    NER_BACKENDS,
+    RULES_BACKEND,
+    SPACY_BACKEND,
+)
+from pii_secret_check_hooks.check_file.pipeline import ScanPipeline
+from pii_secret_check_hooks.check_file.baseline import Baseline
+from pii_secret_check_hooks.profile import PROFILE_REPORT_FILE, profiling
+from pii_secret_check_hooks.util import print_error, print_info, use_reporter
+from pii_secret_check_hooks.daemon import request_scan
+
+
+FILENAME_CHECK = "filename"
+FILE_CONTENT_CHECK = "file_content"
+NER_CHECK = "ner"
+CHECKS = [FILENAME_CHECK, FILE_CONTENT_CHECK, NER_CHECK]
+
+
+def add_run_arguments(parser):
+    """Options shared by every hook that checks file contents"""
+    parser.add_argument(
+        "--exclude",
+        nargs="?",
+        default="pii-secret-exclude.txt",
+        help="Exclude file path",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes. Defaults to auto-detect, 1 disables",
+    )
+    parser.add_argument(
+        "--file_time_budget",
+        type=float,
+        default=FILE_TIME_BUDGET_SECONDS,
+        help="Seconds each check spends on a single file before moving on, 0 for no limit",
+    )
+    parser.add_argument(
+        "--file_byte_budget",
+        type=int,
+        default=FILE_BYTE_BUDGET,
+        help="Bytes of a single file each check reads before moving on, 0 for no limit",
+    )
+    add_baseline_argument(parser)
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const=PROFILE_REPORT_FILE,
+        default=None,
+        help=f"Time each stage and rule, print a summary and write a JSON report (default {PROFILE_REPORT_FILE})",
+    )
+
+
+def add_baseline_argument(parser):
+    parser.add_argument(
+        "--baseline_file",
+        nargs="?",
+        default="pii-secret-baseline",
+        help="Findings accepted with pii-secret-baseline, which are not reported",
+    )
+
+
+def add_hook_arguments(parser):
+    """Options for the hooks pre-commit runs on the files of a commit"""
+    parser.add_argument(
+        "--staged_only",
+        action="store_true",
+        help="Only check lines added or modified in the staged changes",
+    )
+    parser.add_argument(
+        "--no_daemon",
+        action="store_true",
+        help="Scan in this process even if a scan daemon is running",
+    )
+
+
+def add_output_arguments(parser):
+    parser.add_argument(
+        "--output_format",
+        choices=OUTPUT_FORMATS,
+        default=TEXT_FORMAT,
+        help="text for the console, json for JSON lines, sarif for a SARIF log, quiet for errors only",
+    )
+    parser.add_argument(
+        "--output_file",
+        nargs="?",
+        default="-",
+        help="File the json or sarif findings are written to, - for stdout",
+    )
+
+
+def add_file_content_arguments(parser):
+    parser.add_argument(
+        "--regex_file",
+        nargs="?",
+        default="pii-custom-regex.txt",
+        help="File with custom regex (one per line)",
+    )
+
+
+def add_ner_arguments(parser):
+    parser.add_argument(
+        "--ner_exclude",
+        nargs="?",
+        default="pii-ner-exclude.txt",
+        help="Named Entity Recognition exclude file path. One per line.",
+    )
+    parser.add_argument(
+        "--ner_output_file",
+        nargs="?",
+        default=None,
+        help="File for outputting exclude data to",
+    )
+    parser.add_argument(
+        "--ner_backend",
+        choices=sorted(NER_BACKENDS),
+        default=SPACY_BACKEND,
+        help="spacy runs the en_core_web_sm model, rules only matches titles, company suffixes and the gazetteer",
+    )
+    parser.add_argument(
+        "--ner_gazetteer",
+        nargs="?",
+        default="pii-ner-gazetteer.txt",
+        help="Entities for the rules NER backend, one LABEL=phrase per line",
+    )
+    parser.add_argument(
+        "--ner_batch_size",
+        type=int,
+        default=NER_BATCH_SIZE,
+        help="Number of lines or tokens passed to the NER model at a time",
+    )
+    parser.add_argument(
+        "--ner_gate",
+        action="store_true",
+        help="Don't pass lines without capitals or enough word characters to the NER model",
+    )
+    parser.add_argument(
+        "--ner_gate_min_word_chars",
+        type=int,
+        default=NER_GATE_MIN_WORD_CHARS,
+        help="With --ner_gate, lines with fewer word characters are not passed to the NER model",
+    )
+
+
+def add_check_arguments(parser):
+    """Options for choosing and setting up the checks, see run_checks"""
+    parser.add_argument(
+        "--checks",
+        nargs="+",
+        choices=CHECKS,
+        default=CHECKS,
+        help="Checks to run, defaults to all of them",
+    )
+    add_file_content_arguments(parser)
+    add_ner_arguments(parser)
+    add_run_arguments(parser)
+
+
+def load_baseline(path):
+    """The baseline at path, or None after printing why it can't be read"""
+    try:
+        return Baseline.load(path)
+    except (OSError, ValueError) as ex:
+        print_error(
+            f"Could not read the baseline ({ex}). "
+            "Create it again with 'pii-secret-baseline create'"
+        )
+        return None
+
+
+def run_hook(args, scan, daemon_hook=None, argv=None) -> int:
+    """Run scan(baseline) for a hook and return its exit code.
+
+    Findings go to the reporter chosen with add_output_arguments. With
+    daemon_hook set, the scan is handed to a running scan daemon instead,
+    unless --no_daemon or --profile is given.
+    """
+    # Only hooks with add_run_arguments can be profiled
+    profile = getattr(args, "profile", None)
+    with use_reporter(create_reporter(args.output_format, args.output_file)):
+        # A profile is only taken of a scan in this process
+        if daemon_hook is not None and not args.no_daemon and profile is None:
+            exit_code = request_scan(
+                daemon_hook,
+                sys.argv[1:] if argv is None else argv,
+            )
+            if exit_code is not None:
+                return exit_code
+
+        baseline = load_baseline(args.baseline_file)
+        if baseline is None:
+            return 1
+
+        with profiling(profile):
+            return scan(baseline)
+
+
+def create_content_checks(args, excluded_filenames, baseline=None) -> list:
+    """The file content and NER checks in args.checks"""
+    checks = []
+    if FILE_CONTENT_CHECK in args.checks:
+        checks.append(CheckFileContent(
+            allow_changed_lines=True,
+            # Exclude custom regex file
+            excluded_file_list=excluded_filenames + [args.regex_file],
+            custom_regex_list=get_regex_from_file(args.regex_file),
+            file_time_budget=args.file_time_budget,
+            file_byte_budget=args.file_byte_budget,
+            baseline=baseline,
+        ))
+
+    if NER_CHECK in args.checks:
+        gazetteer = None
+        if args.ner_backend == RULES_BACKEND:
+            gazetteer = get_ner_gazetteer(args.ner_gazetteer)
+        if args.ner_output_file:
+            print_info(f"NER excludes will be appended to '{args.ner_output_file}'")
+
+        checks.append(CheckForNER(
+            allow_changed_lines=True,
+            excluded_file_list=excluded_filenames,
+            excluded_ner_entity_list=get_excluded_ner(args.ner_exclude),
+            ner_output_file=args.ner_output_file,
+            file_time_budget=args.file_time_budget,
+            file_byte_budget=args.file_byte_budget,
+            ner_batch_size=args.ner_batch_size,
+            ner_gate=args.ner_gate,
+            ner_gate_min_word_chars=args.ner_gate_min_word_chars,
+            ner_backend=args.ner_backend,
+            ner_gazetteer=gazetteer,
+            baseline=baseline,
+        ))
+
+    return checks
+
+
+def run_checks(args, baseline=None, staged_only=False) -> list:
+    """Run the checks in args.checks over args.filenames in one pass.
+
+    Returns the names of the checks that failed.
+    """
+    # The exclude file is read once for every check
+    excluded_filenames = get_excluded_filenames(args.exclude)
+    failed_checks = []
+
+    if FILENAME_CHECK in args.checks:
+        if check_file_names(args.filenames, excluded_filenames, baseline):
+            failed_checks.append(FILENAME_CHECK)
+
+    checks = create_content_checks(args, excluded_filenames, baseline)
+    if checks:
+        pipeline = ScanPipeline(
+            checks,
+            jobs=args.jobs,
+            staged_only=staged_only,
+        )
+        pipeline.process_files(args.filenames)
+        failed_checks += pipeline.failed_checks
+
+    return failed_checks
@@ -4,6 +4,46 @@ RELEASE_CHECK_URL = "https://api.github.com/repos/uktrade/pii-secret-check-hooks
 
 LINE_MARKER = "/PS-IGNORE"
 
+# Most lines cached as clean, per check, before the least recently used are evicted
+LINE_CACHE_MAX_ENTRIES = 200_000
+
+# Lines longer than this are checked in overlapping windows, so a minified
+# bundle or a one line JSON file can't send megabytes through each regex
+MAX_LINE_LENGTH = 4096
+# Characters shared by neighbouring windows, matches up to this long are
+# never split between windows
+LINE_WINDOW_OVERLAP = 256
+
+# Text files at least this large are scanned as bytes through mmap, only
+# decoding the lines that could have an issue
+MMAP_SCAN_SIZE = 8 * 1024 * 1024
+
+# Default limits per file, files that go over are only partly checked
+FILE_TIME_BUDGET_SECONDS = 30
+FILE_BYTE_BUDGET = 50 * 1024 * 1024
+
+# Blobs from git history are read and checked in batches of at most this
+# many blobs or bytes, and larger blobs aren't read at all by default
+HISTORY_BATCH_SIZE = 1000
+HISTORY_BATCH_BYTES = 64 * 1024 * 1024
+HISTORY_MAX_BLOB_SIZE = 8 * 1024 * 1024
+# Clean blobs are added to the history checkpoint file this often
+HISTORY_CHECKPOINT_INTERVAL = 1000
+
+# Bytes read from the start of a file to tell text from binary or generated files
+SNIFF_SIZE = 8192
+# Samples with a smaller share of valid UTF-8 than this are treated as binary
+MIN_UTF8_RATIO = 0.9
+# Headers of generated files, searched for at the start of a line in the sample
+GENERATED_FILE_REGEX = [
+   # Go, https://go.dev/s/generatedcode
+   rb"^// Code generated .* DO NOT EDIT\.$",
+   # protoc output
+   rb"^\W*Generated by the protocol buffer compiler\.  DO NOT EDIT!",
+   # Phabricator convention, used by Yarn and Poetry lock files among others
+   rb"^\W*(?:This file is automatically )?@generated\b",
+]
+
 IGNORE_EXTENSIONS = [
    ".png",
    ".jpg",
@@ -25,8 +65,6 @@ FILENAME_REGEX = [
    r"\.sql$",
    # Worksheets
    r"\.csv$",
-   r"\.xlsx$",
-   r"\.xls$",
    # Word Legacy
    r"\.doc$",
    r"\.dot$",
@@ -80,7 +118,7 @@ FILENAME_REGEX = [
    # Adobe
    r"\.pdf$",
    r"\.ps$",
-   r"\.eps$"
+   r"\.eps$",
    r"\.prn$",
    # conf
    r"\.conf$",
@@ -91,7 +129,7 @@ FILENAME_REGEX = [
    r"\.pem$",
    r"_rsa$",
    r"_dsa$",
-   r"]_ed25519$",
+   r"_ed25519$",
    r"_ecdsa$",
    r"\.jks$",
    # bash/zsh rc file:
@@ -119,11 +157,40 @@ PII_REGEX = {
    "'Email'": r"(?:[a-z0-9!#$%&'*+/=?^_`{|}~-]+(?:\.[a-z0-9!#$%&'*+/=?^_`{|}~-]+)*|\"(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21\x23-\x5b\x5d-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])*\")@(?:(?:[a-z0-9](?:[a-z0-9-]*[a-z0-9])?\.)+[a-z0-9](?:[a-z0-9-]*[a-z0-9])?|\[(?:(?:(2(5[0-5]|[0-4][0-9])|1[0-9][0-9]|[1-9]?[0-9]))\.){3}(?:(2(5[0-5]|[0-4][0-9])|1[0-9][0-9]|[1-9]?[0-9])|[a-z0-9-]*[a-z0-9]:(?:[\x01-\x08\x0b\x0c\x0e-\x1f\x21-\x5a\x53-\x7f]|\\[\x01-\x09\x0b\x0c\x0e-\x7f])+)\])",
 }
 
+# en_core_web_sm components that the NER check does not need. The ner
+# component has its own internal tok2vec layer, so the shared one can go too.
+NER_EXCLUDED_COMPONENTS = [
+   "tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer",
+]
+
+# Number of texts streamed through the spaCy pipeline at a time
+NER_BATCH_SIZE = 256
+
+# With the NER gate on, lines with fewer word characters than this are not
+# passed to the model
+NER_GATE_MIN_WORD_CHARS = 3
+
 NER_IGNORE = [
    "DATE", "CARDINAL", "MONEY", "ORDINAL", "PERCENT", "TIME", "GPE",
 ]
 
-NER_EXCLUDE = [
+# Entity labels of en_core_web_sm, which every NER backend uses
+NER_LABELS = [
+   "CARDINAL", "DATE", "EVENT", "FAC", "GPE", "LANGUAGE", "LAW", "LOC", "MONEY",
+   "NORP", "ORDINAL", "ORG", "PERCENT", "PERSON", "PRODUCT", "QUANTITY", "TIME",
+   "WORK_OF_ART",
+]
+
+# Used by the rules NER backend: names follow a title, and organisation
+# names end in a company suffix
+NER_PERSON_TITLES = [
+   "mr", "mrs", "ms", "miss", "mx", "dr", "prof", "sir", "dame", "lord", "lady",
+]
+NER_ORG_SUFFIXES = [
+   "ltd", "limited", "plc", "llp", "llc", "inc", "corp", "gmbh",
+]
+
+NER_EXCLUDE = frozenset([
    "UnicodeDecoder",
    "S3",
    "Django",
@@ -200,13 +267,10 @@ NER_EXCLUDE = [
    "DateInput",
    "choices=",
    "FormData",
-   "Client",
    "System",
    "TYPES",
-   "Optional",
    "Category",
    "MOBILE",
-   "TYPES",
    "UserManager",
    "Blocked",
    "TEMPORARY",
@@ -217,7 +281,6 @@ NER_EXCLUDE = [
    "DetailView",
    "SuspiciousOperation",
    "CreateView",
-   "ListView",
    "UpdateView",
    "EmptyPage",
    "RuntimeError",
@@ -229,24 +292,16 @@ NER_EXCLUDE = [
    "Invalid",
    "SubTypes",
    "FuzzyChoice",
-   "Unarchive",
-   "COMPLETED",
-   "ValidationError",
-   "ModelChoiceField",
    "STATUS",
    "UTC",
-   "Callable",
    "Mailshot",
-   "TYPES",
    "DATE_FORMAT",
    "LABEL",
    "Submit",
-   "DocumentForm",
    "ArrayField",
    "Mock",
    "AppConfig",
    "Types",
-   "DateInput",
    "AWS_SES_ACCESS_KEY_ID",
    "AWS_SECRET_ACCESS_KEY",
    "BaseFormSet",
@@ -272,4 +327,4 @@ NER_EXCLUDE = [
    "PasswordInput",
    "ModelForm",
    "import pytz",
-]
+])
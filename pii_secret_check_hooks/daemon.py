@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from pii_secret_check_hooks.util import (
+    capture_output,
+    print_error,
+    print_info,
+    print_warning,
+    replay_output,
+)
+
+
+# Relative to the repository root, which is where pre-commit runs the hooks.
+# A relative path also keeps clear of the short AF_UNIX path length limit.
+SOCKET_PATH = ".pii-secret-hook/daemon.sock"
+# How long a hook waits for the daemon before scanning in its own process
+SCAN_TIMEOUT_SECONDS = 300
+# Environment variables sent with a scan, such as GIT_INDEX_FILE, which git
+# sets for hooks and --staged_only needs to diff the right index
+FORWARDED_ENV_PREFIX = "GIT_"
+
+
+def _get_hooks():
+    # Imported here as the hook modules import this module
+    from pii_secret_check_hooks import (
+        pii_secret_file_content,
+        pii_secret_file_content_ner,
+        pii_secret_scan,
+    )
+
+    return {
+        "file_content": pii_secret_file_content.main,
+        "ner": pii_secret_file_content_ner.main,
+        "scan": pii_secret_scan.main,
+    }
+
+
+def _send_command(command, timeout=None):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        client.connect(SOCKET_PATH)
+        with client.makefile("rwb") as stream:
+            stream.write(json.dumps(command).encode("utf-8") + b"\n")
+            stream.flush()
+            return json.loads(stream.readline())
+
+
+def request_scan(hook, argv):
+    """Run a hook in the scan daemon if one is running for this directory.
+
+    Returns the hook's exit code, or None if the scan should be done in
+    this process instead.
+    """
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(SOCKET_PATH):
+        return None
+
+    try:
+        response = _send_command({
+            "command": "scan",
+            "hook": hook,
+            "argv": list(argv),
+            "cwd": os.getcwd(),
+            "env": _forwarded_env(os.environ),
+        }, timeout=SCAN_TIMEOUT_SECONDS)
+    except socket.timeout:
+        print_warning(
+            f"Scan daemon did not reply within {SCAN_TIMEOUT_SECONDS} seconds, "
+            "scanning in this process"
+        )
+        return None
+    except (OSError, ValueError):
+        return None
+
+    if "exit_code" not in response:
+        return None
+
+    replay_output(response["messages"])
+    return response["exit_code"]
+
+
+def _forwarded_env(environ) -> dict:
+    return {
+        name: value for name, value in environ.items()
+        if name.startswith(FORWARDED_ENV_PREFIX)
+    }
+
+
+@contextmanager
+def _client_env(env):
+    """Use the client's forwarded variables in place of the daemon's own.
+
+    Requests are handled one at a time, so os.environ can be changed for
+    the length of a scan, and is inherited by git and the worker processes.
+    """
+    previous = _forwarded_env(os.environ)
+    for name in previous:
+        del os.environ[name]
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        for name in _forwarded_env(os.environ):
+            del os.environ[name]
+        os.environ.update(previous)
+
+
+class ScanRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            command = json.loads(self.rfile.readline())
+            response = self.server.run_command(command)
+        except Exception as ex:
+            response = {"error": str(ex)}
+
+        try:
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+        except BrokenPipeError:
+            # The hook stopped waiting and scanned in its own process
+            pass
+
+
+class ScanServer(socketserver.UnixStreamServer):
+    """Runs hook scans in a long lived process.
+
+    The compiled content rules and the NER model are module level caches, so
+    they stay loaded between requests. Requests are handled one at a time so
+    that scans never race on the pii-secret-log files.
+    """
+    def __init__(self, socket_path=SOCKET_PATH):
+        self.cwd = os.path.realpath(os.getcwd())
+        super().__init__(socket_path, ScanRequestHandler)
+
+    def run_command(self, command):
+        name = command.get("command")
+        if name == "status":
+            return {"status": "running", "pid": os.getpid(), "cwd": self.cwd}
+
+        if name == "stop":
+            # shutdown() waits for serve_forever, so it can't be called from
+            # the handler's own thread.
+            threading.Thread(target=self.shutdown).start()
+            return {"status": "stopping"}
+
+        if name == "scan":
+            if os.path.realpath(command["cwd"]) != self.cwd:
+                return {"error": f"Daemon is serving {self.cwd}"}
+
+            hook = _get_hooks()[command["hook"]]
+            with _client_env(command.get("env", {})), capture_output() as messages:
+                exit_code = hook(command["argv"] + ["--no_daemon"])
+
+            return {"exit_code": exit_code, "messages": messages}
+
+        return {"error": f"Unknown command {name}"}
+
+
+def _daemon_running() -> bool:
+    try:
+        _send_command({"command": "status"}, timeout=5)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def start(preload_ner=False) -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        print_error("The scan daemon needs Unix domain socket support")
+        return 1
+
+    if os.path.exists(SOCKET_PATH):
+        if _daemon_running():
+            print_error("A scan daemon is already running for this directory")
+            return 1
+        # Left behind by a daemon that didn't shut down cleanly
+        os.remove(SOCKET_PATH)
+
+    Path(SOCKET_PATH).parent.mkdir(parents=True, exist_ok=True)
+
+    if preload_ner:
+        from pii_secret_check_hooks.check_file.ner_backends import get_backend
+        get_backend().nlp
+
+    # Only the current user may connect to the socket
+    previous_umask = os.umask(0o077)
+    try:
+        server = ScanServer()
+    finally:
+        os.umask(previous_umask)
+
+    print_info(f"Scan daemon listening on {SOCKET_PATH}")
+    try:
+        with server:
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+
+    print_info("Scan daemon stopped")
+    return 0
+
+
+def stop() -> int:
+    try:
+        _send_command({"command": "stop"}, timeout=5)
+    except (OSError, ValueError):
+        print_error("No scan daemon is running for this directory")
+        return 1
+
+    print_info("Scan daemon stopping")
+    return 0
+
+
+def status() -> int:
+    try:
+        response = _send_command({"command": "status"}, timeout=5)
+    except (OSError, ValueError):
+        print_info("No scan daemon is running for this directory")
+        return 1
+
+    print_info(f"Scan daemon running with pid {response['pid']} for {response['cwd']}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Keep scan rules and the NER model loaded between commits",
+    )
+    parser.add_argument("command", choices=["start", "stop", "status"])
+    parser.add_argument(
+        "--preload_ner",
+        action="store_true",
+        help="Load the NER model at start up rather than on the first NER scan",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "start":
+        return start(preload_ner=args.preload_ner)
+    if args.command == "stop":
+        return stop()
+    return status()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, where hook runs aren't locked against each other
+    fcntl = None
+
+
+@contextmanager
+def atomic_write(path, mode="w"):
+    """Open a file to write path's new content to.
+
+    It is a temporary file in the same directory, swapped in with os.replace
+    once written, so an interrupted run never leaves path half written.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory, prefix=f".{os.path.basename(path)}-",
+    )
+    try:
+        encoding = None if "b" in mode else "utf-8"
+        with os.fdopen(fd, mode, encoding=encoding) as temp_file:
+            yield temp_file
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def lock_file(file) -> None:
+    """Lock an open file until it is closed, so other hook runs wait for it"""
+    if fcntl is not None:
+        fcntl.flock(file, fcntl.LOCK_EX)
+
+
+@contextmanager
+def locked_directory(directory):
+    """Hold a lock on directory, whose files are replaced, not written to"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        lock_file(fd)
+        yield
+    finally:
+        os.close(fd)
@@ -0,0 +1,192 @@
+import os
+import re
+import subprocess
+import threading
+
+
+HUNK_HEADER_REGEX = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+QUOTED_PATH_ESCAPES = {
+    "a": "\a", "b": "\b", "f": "\f", "n": "\n",
+    "r": "\r", "t": "\t", "v": "\v", "\\": "\\", '"': '"',
+}
+
+
+def _unquote_path(path) -> str:
+    """Undo git's C style quoting of unusual path names"""
+    if not (path.startswith('"') and path.endswith('"')):
+        return path
+
+    raw = bytearray()
+    chars = iter(path[1:-1])
+    for char in chars:
+        if char != "\\":
+            raw.extend(char.encode("utf-8"))
+            continue
+
+        escaped = next(chars)
+        if escaped in QUOTED_PATH_ESCAPES:
+            raw.extend(QUOTED_PATH_ESCAPES[escaped].encode("utf-8"))
+        else:
+            # Octal escaped byte, e.g. \303
+            raw.append(int(escaped + next(chars) + next(chars), 8))
+
+    return raw.decode("utf-8", "surrogateescape")
+
+
+def parse_added_lines(diff) -> dict:
+    """Map each file in a zero context diff to its added or modified lines.
+
+    Line numbers are those of the new version of the file.
+    """
+    added_lines = {}
+    current_lines = None
+    in_header = False
+    for line in diff.split("\n"):
+        if line.startswith("diff --git "):
+            in_header = True
+            current_lines = None
+            continue
+
+        # Only trust "+++" in the file header, an added line can look the same
+        if in_header and line.startswith("+++ "):
+            # Git ends the header with a tab when the path has a space in it
+            path = line[4:].rstrip("\t")
+            if path != "/dev/null":
+                path = os.path.normpath(_unquote_path(path)[2:])
+                current_lines = added_lines.setdefault(path, set())
+            continue
+
+        match = HUNK_HEADER_REGEX.match(line)
+        if match:
+            in_header = False
+            if current_lines is not None:
+                start = int(match.group(1))
+                count = 1 if match.group(2) is None else int(match.group(2))
+                current_lines.update(range(start, start + count))
+
+    return added_lines
+
+
+def get_staged_line_numbers(filenames) -> dict:
+    """Lines added or modified in the index, for each of the given files.
+
+    Files with no staged content changes are left out, and should be
+    checked in full. Paths are normalised with os.path.normpath.
+    """
+    result = subprocess.run(
+        [
+            "git",
+            "-c", "core.quotePath=false",
+            "diff",
+            "--cached",
+            "--unified=0",
+            "--no-color",
+            "--no-ext-diff",
+            # Renamed files are treated as new, so all their lines are checked
+            "--no-renames",
+            "--relative",
+            "--src-prefix=a/",
+            "--dst-prefix=b/",
+            "--",
+            *filenames,
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return parse_added_lines(
+        result.stdout.decode("utf-8", "surrogateescape"),
+    )
+
+
+def get_git_dir():
+    """The repository's git directory, shared by its worktrees, or None
+    outside a repository"""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--git-common-dir"],
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return os.fsdecode(result.stdout.rstrip(b"\n"))
+
+
+def get_tracked_files() -> list:
+    """Every file tracked in the current directory, relative to it"""
+    result = subprocess.run(
+        ["git", "ls-files", "-z", "--cached"],
+        capture_output=True,
+        check=True,
+    )
+    return [
+        path for path in result.stdout.decode("utf-8", "surrogateescape").split("\0")
+        # Deleted from the work tree but not yet staged
+        if path and os.path.isfile(path)
+    ]
+
+
+def list_history_blobs(revisions, max_blob_size=None) -> list:
+    """(blob id, path) of every blob reachable from revisions.
+
+    Each blob is listed once, with the first path git found it at, however
+    many commits and paths it appears in.
+    """
+    filters = ["--filter=object:type=blob"]
+    if max_blob_size:
+        filters.append(f"--filter=blob:limit={max_blob_size}")
+    result = subprocess.run(
+        ["git", "rev-list", "--objects", *filters, *revisions, "--"],
+        capture_output=True,
+        check=True,
+    )
+
+    blobs = []
+    for line in result.stdout.decode("utf-8", "surrogateescape").splitlines():
+        # Commits are listed too, without a path
+        blob_id, _, path = line.partition(" ")
+        if path:
+            blobs.append((blob_id, path))
+    return blobs
+
+
+def read_blobs(blob_ids):
+    """Yield (blob id, content) for each blob id, streamed from git cat-file"""
+    process = subprocess.Popen(
+        ["git", "cat-file", "--batch"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+
+    def write_blob_ids():
+        # Written from another thread, so git never blocks on a full pipe
+        try:
+            for blob_id in blob_ids:
+                process.stdin.write(blob_id.encode("ascii") + b"\n")
+        except BrokenPipeError:
+            pass
+        finally:
+            process.stdin.close()
+
+    writer = threading.Thread(target=write_blob_ids, daemon=True)
+    writer.start()
+    try:
+        while True:
+            header = process.stdout.readline()
+            if not header:
+                break
+            fields = header.decode("ascii").split()
+            if len(fields) != 3:
+                # "<blob id> missing"
+                continue
+            blob_id, object_type, size = fields
+            data = process.stdout.read(int(size))
+            # Each object's content is followed by a newline
+            process.stdout.read(1)
+            if object_type == "blob":
+                yield blob_id, data
+    finally:
+        process.stdout.close()
+        process.kill()
+        process.wait()
+        writer.join()
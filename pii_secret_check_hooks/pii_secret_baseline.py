@@ -0,0 +1,66 @@
+import argparse
+import subprocess
+
+from pii_secret_check_hooks.check_file.baseline import Baseline, BaselineRecorder
+from pii_secret_check_hooks.git_utils import get_tracked_files
+from pii_secret_check_hooks.cli import (
+    add_check_arguments,
+    load_baseline,
+    run_checks,
+)
+from pii_secret_check_hooks.profile import profiling
+from pii_secret_check_hooks.report import TextReporter
+from pii_secret_check_hooks.util import print_error, print_info, use_reporter
+
+
+CREATE_COMMAND = "create"
+SHOW_COMMAND = "show"
+
+
+def create(args) -> int:
+    if not args.filenames:
+        try:
+            args.filenames = get_tracked_files()
+        except (OSError, subprocess.CalledProcessError) as ex:
+            print_error(f"Could not list the files tracked by git ({ex})")
+            return 1
+
+    baseline = Baseline()
+    with use_reporter(BaselineRecorder(baseline, TextReporter())), profiling(args.profile):
+        # Everything found now is accepted, so nothing is filtered out
+        run_checks(args)
+
+    baseline.write(args.baseline_file)
+    print_info(f"{len(baseline)} findings accepted in '{args.baseline_file}'")
+    return 0
+
+
+def show(args) -> int:
+    baseline = load_baseline(args.baseline_file)
+    if baseline is None:
+        return 1
+
+    print_info(f"{len(baseline)} findings accepted in '{args.baseline_file}'")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Accept the current findings, so later runs only report new ones",
+    )
+    parser.add_argument("command", choices=[CREATE_COMMAND, SHOW_COMMAND])
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        help="Files to scan, defaults to every file tracked by git",
+    )
+    add_check_arguments(parser)
+    args = parser.parse_args(argv)
+
+    if args.command == CREATE_COMMAND:
+        return create(args)
+    return show(args)
+
+
+if __name__ == "__main__":
+    exit(main())
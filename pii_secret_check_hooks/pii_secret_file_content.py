@@ -7,6 +7,13 @@ from pii_secret_check_hooks.util import (
 from pii_secret_check_hooks.check_file.file_content import (
     CheckFileContent,
 )
+from pii_secret_check_hooks.cli import (
+    add_file_content_arguments,
+    add_hook_arguments,
+    add_output_arguments,
+    add_run_arguments,
+    run_hook,
+)
 from pii_secret_check_hooks.util import print_error, print_info
 
 
@@ -17,39 +24,40 @@ def main(argv=None):
         nargs="*",
         help="Files to check",
     )
-    parser.add_argument(
-        "--exclude",
-        nargs="?",
-        default="pii-secret-exclude.txt",
-        help="Exclude file path",
-    )
-    parser.add_argument(
-        "--regex_file",
-        nargs="?",
-        default="pii-custom-regex.txt",
-        help="File with custom regex (one per line)",
-    )
+    add_file_content_arguments(parser)
+    add_run_arguments(parser)
+    add_hook_arguments(parser)
+    add_output_arguments(parser)
     args = parser.parse_args(argv)
-    excluded_filenames = get_excluded_filenames(args.exclude)
-    custom_regex_list = get_regex_from_file(args.regex_file)
 
-    # Exclude custom regex file
-    excluded_filenames.append(args.regex_file)
+    def scan(baseline):
+        excluded_filenames = get_excluded_filenames(args.exclude)
+        custom_regex_list = get_regex_from_file(args.regex_file)
 
-    process_file_content = CheckFileContent(
-        allow_changed_lines=True,
-        excluded_file_list=excluded_filenames,
-        custom_regex_list=custom_regex_list,
-    )
+        # Exclude custom regex file
+        excluded_filenames.append(args.regex_file)
 
-    if process_file_content.process_files(args.filenames):
-        print_error(
-            "File content check failed",
+        process_file_content = CheckFileContent(
+            allow_changed_lines=True,
+            excluded_file_list=excluded_filenames,
+            custom_regex_list=custom_regex_list,
+            jobs=args.jobs,
+            staged_only=args.staged_only,
+            file_time_budget=args.file_time_budget,
+            file_byte_budget=args.file_byte_budget,
+            baseline=baseline,
         )
-        return 1
 
-    print_info("File content checks passed")
-    return 0
+        if process_file_content.process_files(args.filenames):
+            print_error(
+                "File content check failed",
+            )
+            return 1
+
+        print_info("File content checks passed")
+        return 0
+
+    return run_hook(args, scan, daemon_hook="file_content", argv=argv)
 
 
 if __name__ == "__main__":
@@ -4,8 +4,17 @@ from rich.console import Console
 from pii_secret_check_hooks.util import (
     get_excluded_filenames,
     get_excluded_ner,
+    get_ner_gazetteer,
 )
 from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.ner_backends import RULES_BACKEND
+from pii_secret_check_hooks.cli import (
+    add_hook_arguments,
+    add_ner_arguments,
+    add_output_arguments,
+    add_run_arguments,
+    run_hook,
+)
 from pii_secret_check_hooks.util import print_error, print_info
 
 
@@ -19,51 +28,54 @@ def main(argv=None):
         nargs="*",
         help="Files to check",
     )
-    parser.add_argument(
-        "--exclude",
-        nargs="?",
-        default="pii-secret-exclude.txt",
-        help="Exclude file path",
-    )
-    parser.add_argument(
-        "--ner_exclude",
-        nargs="?",
-        default="pii-ner-exclude.txt",
-        help="Named Entity Recognition exclude file path. One per line.",
-    )
-    parser.add_argument(
-        "--ner_output_file",
-        nargs="?",
-        default=None,
-        help="File for outputting exclude data to",
-    )
+    add_ner_arguments(parser)
+    add_run_arguments(parser)
+    add_hook_arguments(parser)
+    add_output_arguments(parser)
     args = parser.parse_args(argv)
-    excluded_filenames = get_excluded_filenames(args.exclude)
-    excluded_entities = get_excluded_ner(args.ner_exclude)
-    ner_output_file = args.ner_output_file
 
-    print_info(
-        "Using spaCY NER (https://spacy.io/) for PII checks",
-    )
+    def scan(baseline):
+        excluded_filenames = get_excluded_filenames(args.exclude)
+        excluded_entities = get_excluded_ner(args.ner_exclude)
+        ner_output_file = args.ner_output_file
+        gazetteer = None
+        if args.ner_backend == RULES_BACKEND:
+            gazetteer = get_ner_gazetteer(args.ner_gazetteer)
 
-    if ner_output_file:
-        print_info(f"NER excludes will be appended to '{ner_output_file}'")
+        print_info(
+            f"Using spaCY NER (https://spacy.io/) for PII checks, with the {args.ner_backend} backend",
+        )
 
-    process_ner_file = CheckForNER(
-        allow_changed_lines=True,
-        excluded_file_list=excluded_filenames,
-        excluded_ner_entity_list=excluded_entities,
-        ner_output_file=ner_output_file,
-    )
+        if ner_output_file:
+            print_info(f"NER excludes will be appended to '{ner_output_file}'")
 
-    if process_ner_file.process_files(args.filenames):
-        print_error(
-            "NER content check failed",
+        process_ner_file = CheckForNER(
+            allow_changed_lines=True,
+            excluded_file_list=excluded_filenames,
+            excluded_ner_entity_list=excluded_entities,
+            ner_output_file=ner_output_file,
+            jobs=args.jobs,
+            staged_only=args.staged_only,
+            file_time_budget=args.file_time_budget,
+            file_byte_budget=args.file_byte_budget,
+            ner_batch_size=args.ner_batch_size,
+            ner_gate=args.ner_gate,
+            ner_gate_min_word_chars=args.ner_gate_min_word_chars,
+            ner_backend=args.ner_backend,
+            ner_gazetteer=gazetteer,
+            baseline=baseline,
         )
-        return 1
 
-    print_info("NER checks passed")
-    return 0
+        if process_ner_file.process_files(args.filenames):
+            print_error(
+                "NER content check failed",
+            )
+            return 1
+
+        print_info("NER checks passed")
+        return 0
+
+    return run_hook(args, scan, daemon_hook="ner", argv=argv)
 
 
 if __name__ == "__main__":
@@ -4,6 +4,11 @@ from pii_secret_check_hooks.util import get_excluded_filenames
 from pii_secret_check_hooks.check_file.file_name import (
     check_file_names,
 )
+from pii_secret_check_hooks.cli import (
+    add_baseline_argument,
+    add_output_arguments,
+    run_hook,
+)
 
 
 def main(argv=None):
@@ -15,13 +20,18 @@ def main(argv=None):
         default="pii-secret-exclude.txt",
         help="Exclude file path",
     )
+    add_baseline_argument(parser)
+    add_output_arguments(parser)
     args = parser.parse_args(argv)
-    excluded_filenames = get_excluded_filenames(args.exclude)
 
-    if check_file_names(args.filenames, excluded_filenames):
-        return 1
+    def scan(baseline):
+        excluded_filenames = get_excluded_filenames(args.exclude)
+        if check_file_names(args.filenames, excluded_filenames, baseline):
+            return 1
+
+        return 0
 
-    return 0
+    return run_hook(args, scan)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,82 @@
+import argparse
+import subprocess
+
+from pii_secret_check_hooks.config import HISTORY_MAX_BLOB_SIZE
+from pii_secret_check_hooks.check_file.history import (
+    HistoryCheckpoint,
+    HistoryPipeline,
+    create_checkpoint_fingerprint,
+)
+from pii_secret_check_hooks.cli import (
+    add_check_arguments,
+    add_output_arguments,
+    create_content_checks,
+    run_hook,
+)
+from pii_secret_check_hooks.util import (
+    get_excluded_filenames,
+    print_error,
+    print_info,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the file content and NER checks over every blob in git history",
+    )
+    parser.add_argument(
+        "revisions",
+        nargs="*",
+        help="Revisions to scan the history of, as given to git rev-list. Defaults to all refs",
+    )
+    add_check_arguments(parser)
+    parser.add_argument(
+        "--checkpoint_file",
+        nargs="?",
+        default=".pii-secret-hook/history-checkpoint",
+        help="Blobs already found to be clean, so an interrupted scan can carry on",
+    )
+    parser.add_argument(
+        "--max_blob_size",
+        type=int,
+        default=HISTORY_MAX_BLOB_SIZE,
+        help="Larger blobs are not read, 0 for no limit",
+    )
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
+    def scan(baseline):
+        checks = create_content_checks(
+            args,
+            get_excluded_filenames(args.exclude),
+            baseline,
+        )
+        if not checks:
+            print_error("The history can only be scanned with the file_content and ner checks")
+            return 1
+
+        pipeline = HistoryPipeline(
+            checks,
+            HistoryCheckpoint(args.checkpoint_file, create_checkpoint_fingerprint(checks)),
+            jobs=args.jobs,
+            max_blob_size=args.max_blob_size,
+        )
+        try:
+            found_issues = pipeline.process_history(args.revisions or ["--all"])
+        except (OSError, subprocess.CalledProcessError) as ex:
+            print_error(f"Could not read the git history ({ex})")
+            return 1
+
+        if found_issues:
+            for check_name in pipeline.failed_checks:
+                print_error(f"{check_name} check failed in the history")
+            return 1
+
+        print_info("No secrets or PII found in the history")
+        return 0
+
+    return run_hook(args, scan)
+
+
+if __name__ == "__main__":
+    exit(main())
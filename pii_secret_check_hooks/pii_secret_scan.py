@@ -0,0 +1,41 @@
+import argparse
+
+from pii_secret_check_hooks.cli import (
+    add_check_arguments,
+    add_hook_arguments,
+    add_output_arguments,
+    run_checks,
+    run_hook,
+)
+from pii_secret_check_hooks.util import print_error, print_info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the filename, file content and NER checks in one pass",
+    )
+    parser.add_argument(
+        "filenames",
+        nargs="*",
+        help="Files to check",
+    )
+    add_check_arguments(parser)
+    add_hook_arguments(parser)
+    add_output_arguments(parser)
+    args = parser.parse_args(argv)
+
+    def scan(baseline):
+        failed_checks = run_checks(args, baseline, staged_only=args.staged_only)
+        if failed_checks:
+            for check_name in failed_checks:
+                print_error(f"{check_name} check failed")
+            return 1
+
+        print_info("PII and secret checks passed")
+        return 0
+
+    return run_hook(args, scan, daemon_hook="scan", argv=argv)
+
+
+if __name__ == "__main__":
+    exit(main())
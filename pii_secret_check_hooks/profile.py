@@ -0,0 +1,183 @@
+import heapq
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+from pii_secret_check_hooks.util import print_error, print_info
+
+
+PROFILE_REPORT_FILE = ".pii-secret-hook/profile.json"
+# Number of files and rules listed as the slowest
+PROFILE_TOP = 10
+
+# Set while profiling, see get_profile
+_profile = None
+
+
+class Profile:
+    """Wall time and counts for each stage of a run.
+
+    Stages are timed with stage() or add_time(), and events counted with
+    count(). Rules are timed one at a time with time_rule, on top of the
+    usual combined scan, so a slow custom regex stands out.
+    """
+    def __init__(self):
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = Counter()
+        self.counts = Counter()
+        self.rule_seconds = defaultdict(float)
+        self.rule_calls = Counter()
+        # Heap of (seconds, check, filename), the PROFILE_TOP slowest
+        self.slowest_files = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name, seconds, calls=1) -> None:
+        self.stage_seconds[name] += seconds
+        self.stage_calls[name] += calls
+
+    def timed(self, name, iterable):
+        """Yield from iterable, timing how long each item takes to produce"""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - start, calls=0)
+                return
+            self.add_time(name, time.perf_counter() - start)
+            yield item
+
+    def count(self, name, value=1) -> None:
+        self.counts[name] += value
+
+    def time_rule(self, name, check, text) -> None:
+        """Time check(text), such as one rule's regex search"""
+        start = time.perf_counter()
+        check(text)
+        self.rule_seconds[name] += time.perf_counter() - start
+        self.rule_calls[name] += 1
+
+    def file_checked(self, check_name, filename, seconds) -> None:
+        entry = (seconds, check_name, filename)
+        if len(self.slowest_files) < PROFILE_TOP:
+            heapq.heappush(self.slowest_files, entry)
+        else:
+            heapq.heappushpop(self.slowest_files, entry)
+
+    def take(self):
+        """A profile of everything since the last take, e.g. in a worker"""
+        taken = Profile()
+        taken.merge(self)
+        self.__init__()
+        return taken
+
+    def merge(self, other) -> None:
+        for name, seconds in other.stage_seconds.items():
+            self.stage_seconds[name] += seconds
+        self.stage_calls.update(other.stage_calls)
+        self.counts.update(other.counts)
+        for name, seconds in other.rule_seconds.items():
+            self.rule_seconds[name] += seconds
+        self.rule_calls.update(other.rule_calls)
+        for seconds, check_name, filename in other.slowest_files:
+            self.file_checked(check_name, filename, seconds)
+
+    def to_dict(self, wall_seconds) -> dict:
+        slowest_rules = sorted(self.rule_seconds.items(), key=lambda item: -item[1])
+        return {
+            "wall_seconds": wall_seconds,
+            "stages": {
+                name: {"seconds": self.stage_seconds[name], "calls": self.stage_calls[name]}
+                for name in sorted(self.stage_seconds, key=lambda name: -self.stage_seconds[name])
+            },
+            "counts": dict(sorted(self.counts.items())),
+            "rules": [
+                {"rule": name, "seconds": seconds, "calls": self.rule_calls[name]}
+                for name, seconds in slowest_rules
+            ],
+            "slowest_files": [
+                {"check": check_name, "file": filename, "seconds": seconds}
+                for seconds, check_name, filename in sorted(self.slowest_files, reverse=True)
+            ],
+        }
+
+
+def get_profile():
+    """The current profile, None unless profiling"""
+    return _profile
+
+
+def stage(name):
+    """Time the block as the stage name, if profiling"""
+    if _profile is None:
+        return nullcontext()
+    return _profile.stage(name)
+
+
+def count(name, value=1) -> None:
+    if _profile is not None:
+        _profile.count(name, value)
+
+
+def start_worker_profile(enabled) -> None:
+    """Start a worker process's own profile, sent back with each result"""
+    global _profile
+    _profile = Profile() if enabled else None
+
+
+def _summary_lines(report):
+    yield f"Profile of a {report['wall_seconds']:.3f}s run, times are summed over worker processes"
+    yield f"{'Stage':<40} {'Calls':>12} {'Seconds':>12}"
+    for name, stage in report["stages"].items():
+        yield f"{name:<40} {stage['calls']:>12} {stage['seconds']:>12.3f}"
+    yield f"{'Count':<40} {'':>12} {'Total':>12}"
+    for name, value in report["counts"].items():
+        yield f"{name:<40} {'':>12} {value:>12}"
+    if report["rules"]:
+        yield f"{'Slowest rules, each timed on its own':<40} {'Calls':>12} {'Seconds':>12}"
+        for rule in report["rules"][:PROFILE_TOP]:
+            yield f"{rule['rule'][:40]:<40} {rule['calls']:>12} {rule['seconds']:>12.3f}"
+    if report["slowest_files"]:
+        yield f"{'Slowest files':<40} {'Check':>12} {'Seconds':>12}"
+        for entry in report["slowest_files"]:
+            yield f"{entry['file'][-40:]:<40} {entry['check']:>12} {entry['seconds']:>12.3f}"
+
+
+@contextmanager
+def profiling(report_file):
+    """Profile the run inside, if report_file is set.
+
+    A summary table is printed at the end and the full report is written
+    to report_file as JSON.
+    """
+    global _profile
+    if report_file is None:
+        yield None
+        return
+
+    previous = _profile
+    _profile = Profile()
+    start = time.perf_counter()
+    try:
+        yield _profile
+    finally:
+        report = _profile.to_dict(time.perf_counter() - start)
+        _profile = previous
+        print_info("\n".join(_summary_lines(report)))
+        try:
+            os.makedirs(os.path.dirname(report_file) or ".", exist_ok=True)
+            with open(report_file, "w") as profile_file:
+                json.dump(report, profile_file, indent=2)
+            print_info(f"Profile written to '{report_file}'")
+        except OSError as ex:
+            print_error(f"Could not write the profile to '{report_file}' ({ex})")
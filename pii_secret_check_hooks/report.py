@@ -0,0 +1,276 @@
+import json
+import sys
+from collections import namedtuple
+
+from pii_secret_check_hooks.file_utils import lock_file
+
+
+ERROR_STYLE = "bold #d3391f"
+INFO_STYLE = "bold #427b0b"
+WARNING_STYLE = "bold #d68300"
+DEBUG_STYLE = "white on red"
+
+TEXT_FORMAT = "text"
+JSON_FORMAT = "json"
+SARIF_FORMAT = "sarif"
+QUIET_FORMAT = "quiet"
+OUTPUT_FORMATS = [TEXT_FORMAT, JSON_FORMAT, SARIF_FORMAT, QUIET_FORMAT]
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+TOOL_NAME = "pii-secret-check-hooks"
+TOOL_URL = "https://github.com/uktrade/pii-secret-check-hooks"
+
+
+# A possible secret or PII found by a check. message is the human readable
+# description. line and column start at 1, and are None where they don't
+# apply or aren't known. text and label are only set for NER entities.
+# fingerprint identifies the finding in a baseline, and blob is the git
+# blob id for findings in history.
+Finding = namedtuple(
+    "Finding",
+    [
+        "check", "file", "message", "line", "column", "rule", "text", "label",
+        "fingerprint", "blob",
+    ],
+    defaults=[None, None, None, None, None, None, None],
+)
+
+
+class Reporter:
+    """Writes findings and messages out.
+
+    Findings are buffered until the file they are in is done with, so they
+    are formatted and written once per file rather than once per line.
+    """
+    def __init__(self):
+        self._file = None
+        self._findings = []
+
+    def add_finding(self, finding) -> None:
+        if self._findings and finding.file != self._file:
+            self.flush()
+        self._file = finding.file
+        self._findings.append(finding)
+
+    def flush(self) -> None:
+        if self._findings:
+            self.write_findings(self._findings)
+        self._file = None
+        self._findings = []
+
+    def message(self, message, style) -> None:
+        # Keep messages in order with the findings before them
+        self.flush()
+        self.write_message(message, style)
+
+    def close(self) -> None:
+        self.flush()
+
+    def write_findings(self, findings) -> None:
+        raise NotImplementedError()
+
+    def write_message(self, message, style) -> None:
+        raise NotImplementedError()
+
+
+class TextReporter(Reporter):
+    """The hooks' usual output, styled with rich on interactive terminals"""
+    def __init__(self, stream=None):
+        super().__init__()
+        self._stream = stream
+        self._console = None
+
+    @property
+    def stream(self):
+        # sys.stdout at the time of writing, which may have been replaced
+        return self._stream or sys.stdout
+
+    def _get_console(self):
+        if not self.stream.isatty():
+            return None
+        if self._console is None or self._console.file is not self.stream:
+            from rich.console import Console
+            self._console = Console(file=self.stream)
+        return self._console
+
+    def write_findings(self, findings) -> None:
+        self.write_message(
+            "\n".join(finding.message for finding in findings),
+            WARNING_STYLE,
+        )
+
+    def write_message(self, message, style) -> None:
+        console = self._get_console()
+        if console is not None:
+            try:
+                console.print(
+                    message,
+                    style=style,
+                    soft_wrap=True,
+                )
+                return
+            except Exception:
+                pass
+        print(message, file=self.stream)
+
+
+class QuietReporter(Reporter):
+    """Only errors, such as a check having failed, are written"""
+    def write_findings(self, findings) -> None:
+        pass
+
+    def write_message(self, message, style) -> None:
+        if style == ERROR_STYLE:
+            print(message, file=sys.stderr)
+
+
+class FileReporter(Reporter):
+    """Findings go to a file, or to stdout for "-", and messages to stderr.
+
+    pre-commit can split a run over several invocations of a hook, so an
+    existing file is added to rather than replaced.
+    """
+    file_mode = "a"
+
+    def __init__(self, output_file="-"):
+        super().__init__()
+        self.output_file = output_file
+        self._stream = None
+
+    @property
+    def stream(self):
+        if self._stream is None:
+            if self.output_file == "-":
+                self._stream = sys.stdout
+            else:
+                self._stream = open(self.output_file, self.file_mode, encoding="utf-8")
+        return self._stream
+
+    def write_message(self, message, style) -> None:
+        print(message, file=sys.stderr)
+
+    def close(self) -> None:
+        super().close()
+        self.stream.flush()
+        if self.stream is not sys.stdout:
+            self.stream.close()
+
+
+class JsonLinesReporter(FileReporter):
+    """One JSON object per finding"""
+    def write_findings(self, findings) -> None:
+        self.stream.write("".join(
+            json.dumps(finding._asdict()) + "\n" for finding in findings
+        ))
+
+
+class SarifReporter(FileReporter):
+    """A SARIF 2.1.0 log of the findings, written when the run ends.
+
+    The results are merged into an existing log from an earlier invocation,
+    holding a lock on the file while it is read and rewritten.
+    """
+    file_mode = "a+"
+
+    def __init__(self, output_file="-"):
+        super().__init__(output_file)
+        self._results = []
+        self._rules = {}
+
+    def write_findings(self, findings) -> None:
+        for finding in findings:
+            self._rules.setdefault(finding.rule, {"id": finding.rule})
+            self._results.append(_sarif_result(finding))
+
+    def close(self) -> None:
+        self.flush()
+        sarif_log = {
+            "version": "2.1.0",
+            "$schema": SARIF_SCHEMA,
+            "runs": [{
+                "tool": {
+                    "driver": {
+                        "name": TOOL_NAME,
+                        "informationUri": TOOL_URL,
+                        "rules": list(self._rules.values()),
+                    },
+                },
+                "results": self._results,
+            }],
+        }
+        if self.stream is not sys.stdout:
+            lock_file(self.stream)
+            self.stream.seek(0)
+            existing = self.stream.read()
+            if existing.strip():
+                try:
+                    sarif_log = _merge_sarif_logs(json.loads(existing), sarif_log)
+                except (ValueError, LookupError, TypeError, AttributeError):
+                    print(
+                        f"'{self.output_file}' is not a SARIF log from these hooks, "
+                        "remove it to write the findings",
+                        file=sys.stderr,
+                    )
+                    super().close()
+                    return
+            self.stream.truncate(0)
+
+        json.dump(sarif_log, self.stream, indent=2)
+        self.stream.write("\n")
+        super().close()
+
+
+def _merge_sarif_logs(earlier_log, sarif_log) -> dict:
+    """Add sarif_log's rules and results to those of earlier_log"""
+    earlier_run = earlier_log["runs"][0]
+    driver = earlier_run["tool"]["driver"]
+    if driver["name"] != TOOL_NAME:
+        raise ValueError(f"SARIF log from {driver['name']}")
+
+    run = sarif_log["runs"][0]
+    rule_ids = {rule["id"] for rule in driver["rules"]}
+    driver["rules"].extend(
+        rule for rule in run["tool"]["driver"]["rules"] if rule["id"] not in rule_ids
+    )
+    earlier_run["results"].extend(run["results"])
+    return earlier_log
+
+
+def _sarif_result(finding) -> dict:
+    region = {}
+    if finding.line is not None:
+        region["startLine"] = finding.line
+    if finding.column is not None:
+        region["startColumn"] = finding.column
+
+    location = {"artifactLocation": {"uri": finding.file}}
+    if region:
+        location["region"] = region
+
+    properties = {"check": finding.check}
+    if finding.blob is not None:
+        properties["blob"] = finding.blob
+    if finding.label is not None:
+        properties["label"] = finding.label
+        properties["text"] = finding.text
+
+    result = {
+        "ruleId": finding.rule,
+        "level": "warning",
+        "message": {"text": finding.message},
+        "locations": [{"physicalLocation": location}],
+        "properties": properties,
+    }
+    if finding.fingerprint is not None:
+        result["partialFingerprints"] = {"piiSecretFinding/v1": finding.fingerprint}
+    return result
+
+
+def create_reporter(output_format=TEXT_FORMAT, output_file="-") -> Reporter:
+    if output_format == JSON_FORMAT:
+        return JsonLinesReporter(output_file)
+    if output_format == SARIF_FORMAT:
+        return SarifReporter(output_file)
+    if output_format == QUIET_FORMAT:
+        return QuietReporter()
+    return TextReporter()
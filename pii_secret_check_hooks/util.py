@@ -1,9 +1,19 @@
 import logging
+from contextlib import contextmanager
 from pathlib import Path
-from rich.console import Console
 
+from pii_secret_check_hooks.report import (
+    DEBUG_STYLE,
+    ERROR_STYLE,
+    INFO_STYLE,
+    WARNING_STYLE,
+    Finding,
+    TextReporter,
+)
 
-console = Console()
+
+_captured_output = None
+_reporter = None
 
 
 def _get_file_content_as_list(file_path, file_type, lower=False):
@@ -36,9 +46,13 @@ def get_excluded_filenames(file_path):
     excluded = [
         ".pii-secret-hook/file_content/pii-secret-log",
         ".pii-secret-hook/ner/pii-secret-log",
+        ".pii-secret-hook/file_content/line-cache",
+        ".pii-secret-hook/ner/line-cache",
         "pii-secret-exclude.txt",
         "pii-ner-exclude.txt",
         "pii-custom-regex.txt",
+        "pii-ner-gazetteer.txt",
+        "pii-secret-baseline",
     ]
     return excluded + _get_file_content_as_list(file_path, "exclude")
 
@@ -47,45 +61,94 @@ def get_excluded_ner(file_path):
     return _get_file_content_as_list(file_path, "exclude NER", lower=True)
 
 
-def print_error(message):
+def get_ner_gazetteer(file_path):
+    return _get_file_content_as_list(file_path, "NER gazetteer")
+
+
+@contextmanager
+def capture_output():
+    """Collect printed messages and findings instead of writing them out.
+
+    Used by worker processes (and the scan daemon) so that the parent can
+    replay every file's output in a fixed order with replay_output. Entries
+    are (message, style) pairs, or (message, finding fields) for findings.
+    """
+    global _captured_output
+    previous = _captured_output
+    _captured_output = []
     try:
-        console.print(
-            message,
-            style="bold #d3391f",
-            soft_wrap=True,
-        )
-    except Exception:
-        print(message)
+        yield _captured_output
+    finally:
+        _captured_output = previous
 
 
-def print_info(message):
+def replay_output(messages):
+    for message, style in messages:
+        if isinstance(style, dict):
+            report_finding(Finding(**style))
+        else:
+            _print(message, style)
+
+
+def get_reporter():
+    global _reporter
+    if _reporter is None:
+        _reporter = TextReporter()
+    return _reporter
+
+
+@contextmanager
+def use_reporter(reporter):
+    """Send output to reporter, closing it at the end.
+
+    While output is being captured (such as in the scan daemon) nothing is
+    written, so the reporter is left for the process replaying the output
+    to close.
+    """
+    global _reporter
+    previous = _reporter
+    _reporter = reporter
     try:
-        console.print(
-            message,
-            style="bold #427b0b",
-            soft_wrap=True,
-        )
-    except Exception:
-        print(message)
+        yield reporter
+    finally:
+        if _captured_output is None:
+            reporter.close()
+        _reporter = previous
+
+
+def report_finding(finding):
+    if _captured_output is not None:
+        _captured_output.append((finding.message, finding._asdict()))
+        return
+
+    get_reporter().add_finding(finding)
+
+
+def flush_output():
+    """Write out the findings buffered for the file just checked"""
+    if _captured_output is None and _reporter is not None:
+        _reporter.flush()
+
+
+def _print(message, style):
+    if _captured_output is not None:
+        _captured_output.append((message, style))
+        return
+
+    get_reporter().message(message, style)
+
+
+def print_error(message):
+    _print(message, ERROR_STYLE)
+
+
+def print_info(message):
+    _print(message, INFO_STYLE)
 
 
 def print_warning(message):
-    try:
-        console.print(
-            message,
-            style="bold #d68300",
-            soft_wrap=True,
-        )
-    except Exception:
-        print(message)
+    _print(message, WARNING_STYLE)
 
 
 def print_debug(message):
-    try:
-        console.print(
-            message,
-            style="white on red",
-            soft_wrap=True,
-        )
-    except Exception:
-        print(message)
+    _print(message, DEBUG_STYLE)
@@ -20,6 +20,10 @@ setup(
             "pii-secret-filename = pii_secret_check_hooks.pii_secret_filename:main",
             "pii-secret-file-version-check = pii_secret_check_hooks.hooks_version_check:main",
             "pii-secret-file-content-ner = pii_secret_check_hooks.pii_secret_file_content_ner:main",
+            "pii-secret-daemon = pii_secret_check_hooks.daemon:main",
+            "pii-secret-scan = pii_secret_check_hooks.pii_secret_scan:main",
+            "pii-secret-baseline = pii_secret_check_hooks.pii_secret_baseline:main",
+            "pii-secret-history = pii_secret_check_hooks.pii_secret_history:main",
         ]
     },
     packages=find_packages(),
@@ -1,12 +1,12 @@
 import functools
-import io
 import hashlib
 import json
 import os
 import pathlib
+import shutil
 
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock
 
 from pii_secret_check_hooks.check_file.base_content_check import (
     CheckFileBase,
@@ -36,11 +36,7 @@ def create_base():
 
 
 def remove_log(test_log_dir):
-    try:
-        os.remove(pathlib.Path(test_log_dir) / "pii-secret-log")
-    except FileNotFoundError:
-        pass
-    os.rmdir(test_log_dir)
+    shutil.rmtree(test_log_dir, ignore_errors=True)
 
 
 @pytest.fixture
@@ -54,11 +50,6 @@ def json_log_data():
     }
 
 
-@pytest.fixture
-def json_log_data_content(json_log_data):
-    return io.StringIO(json.dumps(json_log_data))
-
-
 @pytest.fixture(scope="module")
 def log_dir(request):
     test_log_dir = ".pii-secret-hook/test_base"
@@ -66,26 +57,27 @@ def log_dir(request):
     return test_log_dir
 
 
-def test_log_pre_populated(json_log_data_content, log_dir):
-    with patch(
-            "pii_secret_check_hooks.check_file.base_content_check.open",
-            return_value=json_log_data_content,
-            create=True
-    ):
-        check_base = CheckFileBaseTest(check_name="test_base")
-        assert os.stat(log_dir)
-        assert check_base.log_path == f"{log_dir}/pii-secret-log"
-        assert "tests/assets/test.txt" in check_base.log_data["files"]
-        assert "hash" in check_base.log_data["files"]["tests/assets/test.txt"]
+def test_log_pre_populated(json_log_data, log_dir):
+    # A JSON log written by an older version is read as is
+    pathlib.Path(log_dir).mkdir(parents=True, exist_ok=True)
+    with open(f"{log_dir}/pii-secret-log", "w") as json_file:
+        json.dump(json_log_data, json_file)
+
+    check_base = CheckFileBaseTest(check_name="test_base")
+    assert os.stat(log_dir)
+    assert check_base.log_path == f"{log_dir}/pii-secret-log"
+    assert "tests/assets/test.txt" in check_base.log_data["files"]
+    assert "hash" in check_base.log_data["files"]["tests/assets/test.txt"]
 
 
 def test_log_updated(json_log_data, log_dir):
     check_base = CheckFileBaseTest(check_name="test_base")
-    check_base.log_data = json_log_data
+    check_base.log_data["files"].update(json_log_data["files"])
     check_base._write_log()
-    with open(check_base.log_path, 'r') as json_file:
-        assert check_base.log_path == f"{log_dir}/pii-secret-log"
-        assert "tests/assets/test.txt" in load_json(json_file.name)["files"]
+
+    check_base = CheckFileBaseTest(check_name="test_base")
+    assert check_base.log_path == f"{log_dir}/pii-secret-log"
+    assert "tests/assets/test.txt" in check_base.log_data["files"]
 
 
 def test_create_file_hash():
@@ -95,9 +87,8 @@ def test_create_file_hash():
     content_hash = sha1.hexdigest()
 
     check_base = create_base()
-    with open("tests/assets/test.txt", 'r', encoding='utf-8') as test_file:
-        file_content_hash = check_base._create_file_hash(test_file)
-        assert content_hash == file_content_hash
+    file_content_hash = check_base._create_file_hash("tests/assets/test.txt")
+    assert content_hash == file_content_hash
 
 
 def test_file_extension_excluded():
@@ -135,14 +126,13 @@ def test_file_changed():
     check_base_1.log_data = load_json("tests/assets/log_file_unchanged.json")
     check_base_1.current_file = "tests/assets/test.txt"
 
-    with open("tests/assets/test.txt", 'r', encoding='utf-8') as test_file:
-        assert check_base._file_changed(
-            test_file,
-        )
+    assert check_base._file_changed(
+        "tests/assets/test.txt",
+    )
 
-        assert not check_base_1._file_changed(
-            test_file,
-        )
+    assert not check_base_1._file_changed(
+        "tests/assets/test.txt",
+    )
 
 
 def test_file_changed_file_added():
@@ -153,10 +143,9 @@ def test_file_changed_file_added():
     check_base.log_data = load_json("tests/assets/log_file_changed.json")
     check_base.current_file = "tests/assets/test-1.txt"
 
-    with open("tests/assets/test-1.txt", 'r', encoding='utf-8') as test_file:
-        assert check_base._file_changed(
-            test_file,
-        )
+    assert check_base._file_changed(
+        "tests/assets/test-1.txt",
+    )
 
 
 def test_process_file_content_line_with_marker_file_changed_allow_changed_lines():
@@ -199,3 +188,65 @@ def test_issue_found_in_file_creates_log_for_no_issue_files():
     check_base._issue_found_in_file(test_file_name)
 
     assert check_base.log_data["files"][test_file_name]["hash"] == "fake_hash"
+
+
+def test_file_changed_size_differs_skips_hash():
+    check_base = create_base()
+    check_base.log_data["files"]["tests/assets/test.txt"]["size"] = 1
+    check_base.current_file = "tests/assets/test.txt"
+    check_base._create_file_hash = MagicMock()
+
+    assert check_base._file_changed("tests/assets/test.txt")
+    check_base._create_file_hash.assert_not_called()
+
+
+def test_issue_found_in_file_hashes_once():
+    test_file_name = "tests/assets/test.txt"
+    check_base = create_base()
+    check_base.log_data["files"] = {}
+    check_base._create_file_hash = MagicMock(return_value="fake_hash")
+
+    assert not check_base._issue_found_in_file(test_file_name)
+    check_base._create_file_hash.assert_called_once_with(test_file_name)
+    file_stat = os.stat(test_file_name)
+    assert check_base.log_data["files"][test_file_name] == {
+        "hash": "fake_hash",
+        "size": 17,
+        "inode": file_stat.st_ino,
+        "mtime_ns": file_stat.st_mtime_ns,
+    }
+
+
+def test_file_changed_metadata_matches_skips_hash():
+    test_file_name = "tests/assets/test.txt"
+    file_stat = os.stat(test_file_name)
+    check_base = create_base()
+    check_base.log_data["files"][test_file_name].update({
+        "size": file_stat.st_size,
+        "inode": file_stat.st_ino,
+        "mtime_ns": file_stat.st_mtime_ns,
+    })
+    check_base.current_file = test_file_name
+    check_base._create_file_hash = MagicMock()
+
+    assert not check_base._file_changed(test_file_name)
+    check_base._create_file_hash.assert_not_called()
+
+
+def test_file_changed_same_content_records_metadata():
+    test_file_name = "tests/assets/test.txt"
+    check_base = create_base()
+    check_base.current_file = test_file_name
+
+    assert not check_base._file_changed(test_file_name)
+    assert check_base.log_data["files"][test_file_name]["inode"] == os.stat(test_file_name).st_ino
+
+
+def test_update_file_log_ignores_recent_mtime(tmp_path):
+    test_file = tmp_path / "recent.txt"
+    test_file.write_text("Just written")
+    check_base = create_base()
+    check_base.current_file = str(test_file)
+
+    check_base._update_file_log(str(test_file))
+    assert "mtime_ns" not in check_base.log_data["files"][str(test_file)]
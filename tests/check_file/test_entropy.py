@@ -0,0 +1,58 @@
+import random
+import string
+
+from truffleHog.truffleHog import (
+    BASE64_CHARS,
+    HEX_CHARS,
+    get_strings_of_set,
+    shannon_entropy,
+)
+
+from pii_secret_check_hooks.check_file.entropy import (
+    BASE64,
+    HEX,
+    has_high_entropy_string,
+)
+
+
+def trufflehog_entropy_check(line):
+    """The per word loop used by truffleHog"""
+    for word in line.split():
+        for string_found in get_strings_of_set(word, BASE64_CHARS):
+            if shannon_entropy(string_found, BASE64_CHARS) > 4.5:
+                return True
+        for string_found in get_strings_of_set(word, HEX_CHARS):
+            if shannon_entropy(string_found, HEX_CHARS) > 3:
+                return True
+    return False
+
+
+def test_entropy_matches_trufflehog():
+    rng = random.Random(0)
+    for charset in (BASE64, HEX):
+        for length in range(1, 80):
+            data = "".join(rng.choice(charset.chars) for _ in range(length))
+            assert charset.entropy(data) == shannon_entropy(data, charset.chars)
+
+
+def test_has_high_entropy_string_matches_trufflehog():
+    rng = random.Random(0)
+    alphabets = [
+        BASE64_CHARS + " ",
+        HEX_CHARS + " -",
+        "0123456789abcdef" * 4 + string.punctuation,
+        string.ascii_lowercase + " ",
+        string.printable,
+    ]
+    for _ in range(5000):
+        alphabet = rng.choice(alphabets)
+        line = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 120)))
+        assert has_high_entropy_string(line) == trufflehog_entropy_check(line)
+
+
+def test_uniform_hex_run_at_threshold():
+    # Eight distinct characters evenly spread have an entropy of exactly 3
+    line = "01234567" * 3
+    assert has_high_entropy_string(line) == trufflehog_entropy_check(line)
+    line = "012345678" * 3
+    assert has_high_entropy_string(line) == trufflehog_entropy_check(line)
@@ -0,0 +1,81 @@
+import random
+from pathlib import PurePath
+
+from pii_secret_check_hooks.check_file.exclusions import ExclusionMatcher
+from pii_secret_check_hooks.check_file.file_name import check_file_names
+
+
+def relative_to_excluded(filename, excluded_file_list):
+    """The relative_to loop the matcher replaces"""
+    for excluded_path_or_file in excluded_file_list:
+        try:
+            PurePath(filename).relative_to(excluded_path_or_file)
+            return True
+        except ValueError:
+            pass
+    return False
+
+
+def test_plain_entries_match_relative_to():
+    rng = random.Random(0)
+    parts = ["a", "b", "c", "ab", "a.txt"]
+
+    def random_path():
+        path = "/".join(rng.choice(parts) for _ in range(rng.randint(1, 4)))
+        return rng.choice(["", "./", "/"]) + path + rng.choice(["", "/"])
+
+    for _ in range(200):
+        excluded_file_list = [random_path() for _ in range(rng.randint(0, 5))]
+        matcher = ExclusionMatcher(excluded_file_list)
+        for _ in range(20):
+            filename = random_path().rstrip("/")
+            assert matcher.is_excluded(filename) == relative_to_excluded(
+                filename, excluded_file_list,
+            ), (filename, excluded_file_list)
+
+
+def test_glob_name_at_any_depth():
+    matcher = ExclusionMatcher(["*.lock", "fixture_?.json"])
+    assert matcher.is_excluded("poetry.lock")
+    assert matcher.is_excluded("frontend/yarn.lock")
+    assert matcher.is_excluded("tests/fixture_1.json")
+    assert not matcher.is_excluded("tests/fixture_10.json")
+    assert not matcher.is_excluded("poetry.lock.py")
+
+
+def test_glob_with_directory():
+    matcher = ExclusionMatcher(["docs/*.md", "**/migrations/", "data/**", "[!a]b.txt"])
+    assert matcher.is_excluded("docs/index.md")
+    assert not matcher.is_excluded("docs/api/index.md")
+    assert not matcher.is_excluded("src/docs/index.md")
+    assert matcher.is_excluded("app/migrations/0001_initial.py")
+    assert matcher.is_excluded("migrations/0001_initial.py")
+    assert not matcher.is_excluded("app/migrations")
+    assert matcher.is_excluded("data/a/b/c.csv")
+    assert not matcher.is_excluded("database/c.csv")
+    assert matcher.is_excluded("cb.txt")
+    assert not matcher.is_excluded("ab.txt")
+
+
+def test_glob_matching_directory_excludes_contents():
+    matcher = ExclusionMatcher(["build*"])
+    assert matcher.is_excluded("build-output/app.js")
+    assert matcher.is_excluded("src/build/app.js")
+
+
+def test_path_with_glob_characters_matches_itself():
+    matcher = ExclusionMatcher(["file[1].txt", "data/report?.csv"])
+    assert matcher.is_excluded("file[1].txt")
+    assert matcher.is_excluded("file1.txt")
+    assert not matcher.is_excluded("file2.txt")
+    assert matcher.is_excluded("data/report?.csv")
+    assert matcher.is_excluded("data/report1.csv")
+    assert not matcher.is_excluded("report?.csv")
+
+
+def test_check_file_names_excluded_directory():
+    assert not check_file_names(
+        ["exports/test.txt", "exports/more/test.csv"],
+        ["exports/"],
+    )
+    assert not check_file_names(["exports/test.txt"], ["*.txt"])
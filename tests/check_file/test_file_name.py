@@ -1,7 +1,10 @@
+import re
+
 from pii_secret_check_hooks.check_file.file_name import (
     check_file_names,
     _detect_match_against_filename,
 )
+from pii_secret_check_hooks.config import FILENAME_REGEX
 
 
 def test_detect_match_against_filename():
@@ -17,3 +20,41 @@ def test_check_file_names():
     assert not check_file_names(
         ["test.not_of_concern", ],
     )
+
+
+def first_match(filename, filename_regex):
+    """The loop over every regex that the matcher replaces"""
+    for regex in filename_regex:
+        if re.search(regex, filename):
+            return regex
+
+
+def test_detect_match_reports_first_rule_in_list_order():
+    filename_regex = [r"_backup\.sql$", r"\.sql$", r"^db", r"\.gz$", r"\.tar\.gz$"]
+    assert _detect_match_against_filename("db_backup.sql", filename_regex) == r"_backup\.sql$"
+    assert _detect_match_against_filename("db.sql", filename_regex) == r"\.sql$"
+    assert _detect_match_against_filename("db.tar.gz", filename_regex) == r"^db"
+    assert _detect_match_against_filename("x.tar.gz", filename_regex) == r"\.gz$"
+    assert _detect_match_against_filename("x.zip", filename_regex) is None
+
+
+def test_detect_match_same_as_regex_loop():
+    names = [
+        "report.csv", "report.CSV", "notes.txt", ".txt", "archive.tar.gz",
+        "id_rsa", "id_ed25519", "id_rsa.pub", "server.pem", "image.eps",
+        "label.prn", ".bashrc", "bashrc", "zsh_profile", ".credentials",
+        "keystore", "keyring.json", ".kdbx", "..keychain", "main.py",
+        "dir.txt/readme", "Makefile", "data.xlsx.bak",
+    ]
+    for name in names:
+        for filename in (name, f"src/{name}", f"./deep/path/{name}"):
+            assert _detect_match_against_filename(filename, FILENAME_REGEX) == first_match(
+                filename, FILENAME_REGEX,
+            ), filename
+
+
+def test_filename_regex_fixed_entries():
+    assert len(FILENAME_REGEX) == len(set(FILENAME_REGEX))
+    assert _detect_match_against_filename("print.eps", FILENAME_REGEX) == r"\.eps$"
+    assert _detect_match_against_filename("print.prn", FILENAME_REGEX) == r"\.prn$"
+    assert _detect_match_against_filename("id_ed25519", FILENAME_REGEX) == r"_ed25519$"
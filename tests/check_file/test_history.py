@@ -0,0 +1,97 @@
+import subprocess
+
+import pytest
+
+from pii_secret_check_hooks import pii_secret_history
+from pii_secret_check_hooks.check_file.file_content import CheckFileContent
+from pii_secret_check_hooks.check_file.history import (
+    HistoryCheckpoint,
+    HistoryPipeline,
+)
+from pii_secret_check_hooks.git_utils import list_history_blobs, read_blobs
+from pii_secret_check_hooks.util import capture_output
+
+
+SECRET_LINE = "key = AKIA11111111AAAAAAAA\n"
+
+
+def _commit(repo, files, message):
+    for name, content in files.items():
+        (repo / name).write_text(content)
+    subprocess.run(["git", "add", *files], cwd=repo, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+         "commit", "-q", "-m", message],
+        cwd=repo,
+        check=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    subprocess.run(["git", "init", "-q"], check=True)
+    _commit(tmp_path, {"settings.py": SECRET_LINE, "notes.md": "Nothing here\n"}, "first")
+    # The secret is removed, and the same notes are copied to another path
+    _commit(tmp_path, {"settings.py": "key = None\n", "copy.md": "Nothing here\n"}, "second")
+    return tmp_path
+
+
+def test_history_blobs_listed_once(repo):
+    blobs = list_history_blobs(["--all"])
+    paths = sorted(path for _, path in blobs)
+    # Newer commits are listed first
+    assert paths == ["copy.md", "settings.py", "settings.py"]
+
+    contents = dict(read_blobs([blob_id for blob_id, _ in blobs] + ["0" * 40]))
+    assert sorted(contents.values()) == [
+        b"Nothing here\n", SECRET_LINE.encode(), b"key = None\n",
+    ]
+
+
+def _messages_text(messages):
+    return [message for message, _ in messages]
+
+
+def test_history_finds_removed_secret(repo):
+    checks = [CheckFileContent()]
+    checkpoint = HistoryCheckpoint(".pii-secret-hook/history-checkpoint", "00" * 20)
+    pipeline = HistoryPipeline(checks, checkpoint, jobs=1)
+    with capture_output() as messages:
+        assert pipeline.process_history(["--all"])
+
+    assert "Number of blobs for processing: 3" in _messages_text(messages)
+    assert "Line 1. AWS API Key check failed" in _messages_text(messages)
+    assert pipeline.failed_checks == ["file_content"]
+    # Only the clean blobs are in the checkpoint
+    assert len(HistoryCheckpoint(".pii-secret-hook/history-checkpoint", "00" * 20)) == 2
+    # Blobs aren't added to the work tree's file log
+    assert checks[0].log_data["files"].get("notes.md") is None
+
+
+def test_history_resumes_from_checkpoint(repo):
+    with capture_output() as messages:
+        assert pii_secret_history.main(["--checks", "file_content", "--jobs=1"]) == 1
+    with capture_output() as messages:
+        assert pii_secret_history.main(["--checks", "file_content", "--jobs=1"]) == 1
+
+    assert "Number of blobs for processing: 1" in _messages_text(messages)
+    assert "2 blobs were already checked" in _messages_text(messages)
+    assert "Line 1. AWS API Key check failed" in _messages_text(messages)
+
+
+def test_checkpoint_started_again_when_checks_change(tmp_path):
+    path = str(tmp_path / "checkpoint")
+    checkpoint = HistoryCheckpoint(path, "00" * 20)
+    checkpoint.add("ab" * 20)
+    checkpoint.write()
+    assert "ab" * 20 in HistoryCheckpoint(path, "00" * 20)
+
+    with capture_output():
+        changed = HistoryCheckpoint(path, "11" * 20)
+    assert len(changed) == 0
+    changed.add("cd" * 20)
+    changed.write()
+    reloaded = HistoryCheckpoint(path, "11" * 20)
+    assert "cd" * 20 in reloaded
+    assert "ab" * 20 not in reloaded
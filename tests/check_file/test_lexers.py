@@ -0,0 +1,117 @@
+from pii_secret_check_hooks.check_file.lexers import (
+    Span,
+    get_lexer,
+    register_lexer,
+    LEXERS,
+)
+
+
+def lex(filename, text):
+    return list(get_lexer(filename)(text))
+
+
+def test_lexer_chosen_by_suffix():
+    assert get_lexer("app/static/main.JS") is LEXERS[".js"]
+    assert get_lexer("notes.txt") is None
+    assert get_lexer("Makefile") is None
+
+
+def test_register_lexer(monkeypatch):
+    monkeypatch.setitem(LEXERS, ".foo", None)
+    lexer = object()
+    register_lexer(lexer, [".FOO"])
+    assert get_lexer("a.foo") is lexer
+
+
+def test_javascript_comments_and_strings():
+    text = (
+        "// Written by Jane Smith\n"
+        "const url = 'http://x//y';  /* a\n"
+        " * block comment\n"
+        " */\n"
+        "const name = `Hello\n"
+        "${user}`;\n"
+        "const quote = \"it's \\\"quoted\\\"\";\n"
+    )
+    assert lex("a.js", text) == [
+        Span(1, 1, "Written by Jane Smith"),
+        Span(2, 2, "http://x//y"),
+        Span(2, 4, "a block comment"),
+        Span(5, 6, "Hello ${user}"),
+        Span(7, 7, 'it\'s \\"quoted\\"'),
+    ]
+
+
+def test_go_raw_strings():
+    text = 'package main\n\n// Greet says hello\nvar s = `raw\n"text"`\n'
+    assert lex("main.go", text) == [
+        Span(3, 3, "Greet says hello"),
+        Span(4, 5, 'raw "text"'),
+    ]
+
+
+def test_sql_comments_and_strings():
+    text = "-- Customers\nSELECT * FROM users WHERE name = 'O''Brien'; /* done */\n"
+    assert lex("query.sql", text) == [
+        Span(1, 1, "Customers"),
+        Span(2, 2, "O''Brien"),
+        Span(2, 2, "done"),
+    ]
+
+
+def test_shell_comments():
+    text = '#!/bin/sh\necho "$# args" # count\n'
+    assert lex("run.sh", text) == [
+        Span(1, 1, "!/bin/sh"),
+        Span(2, 2, "$# args"),
+        Span(2, 2, "count"),
+    ]
+
+
+def test_yaml_values_and_comments():
+    text = (
+        "# Owner: Jane Smith\n"
+        "name: Buxton  # the maintainer\n"
+        "items:\n"
+        "  - first item\n"
+        "  - key: value#1\n"
+        "url: http://example.com\n"
+    )
+    assert lex("config.yml", text) == [
+        Span(1, 1, "Owner: Jane Smith"),
+        Span(2, 2, "Buxton"),
+        Span(2, 2, "the maintainer"),
+        Span(4, 4, "first item"),
+        Span(5, 5, "value#1"),
+        Span(6, 6, "http://example.com"),
+    ]
+
+
+def test_html_text_comments_and_scripts():
+    text = (
+        "<!-- Page by Jane Smith -->\n"
+        "<div class=\"header\">{% block title %}\n"
+        "  Hello {{ user.name }}, from Buxton\n"
+        "  and friends</div>\n"
+        "<style>p { color: red; }</style>\n"
+        "<script>\n"
+        "  // Greeting\n"
+        "  alert('hi');\n"
+        "</script>\n"
+    )
+    assert lex("index.html", text) == [
+        Span(1, 1, "Page by Jane Smith"),
+        Span(3, 3, "Hello"),
+        Span(3, 3, ", from Buxton"),
+        Span(4, 4, "and friends"),
+        Span(7, 7, "Greeting"),
+        Span(8, 8, "hi"),
+    ]
+
+
+def test_python_lexer():
+    text = 'Buxton = "The quick brown fox."\n# A comment\n'
+    assert lex("a.py", text) == [
+        Span(1, 1, '"The quick brown fox."'),
+        Span(2, 2, "A comment"),
+    ]
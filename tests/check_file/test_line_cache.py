@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+from pii_secret_check_hooks.check_file.file_content import (
+    CheckFileContent,
+)
+from pii_secret_check_hooks.check_file.line_cache import LineVerdictCache
+from pii_secret_check_hooks.util import capture_output
+
+
+def test_line_cache_round_trip(tmp_path):
+    cache_path = tmp_path / "line-cache"
+    cache = LineVerdictCache(cache_path, lambda: "fingerprint")
+    assert not cache.is_clean("clean line")
+    cache.add_clean("clean line")
+    assert cache.is_clean("clean line")
+    cache.write()
+
+    cache = LineVerdictCache(cache_path, lambda: "fingerprint")
+    assert cache.is_clean("clean line")
+    assert not cache.is_clean("other line")
+
+
+def test_line_cache_fingerprint_changed(tmp_path):
+    cache_path = tmp_path / "line-cache"
+    cache = LineVerdictCache(cache_path, lambda: "fingerprint")
+    cache.add_clean("clean line")
+    cache.write()
+
+    cache = LineVerdictCache(cache_path, lambda: "new fingerprint")
+    assert not cache.is_clean("clean line")
+
+
+def test_line_cache_disabled_without_fingerprint(tmp_path):
+    cache = LineVerdictCache(tmp_path / "line-cache", lambda: None)
+    cache.add_clean("clean line")
+    assert not cache.is_clean("clean line")
+    cache.write()
+    assert not (tmp_path / "line-cache").exists()
+
+
+def test_line_cache_evicts_least_recently_used(tmp_path):
+    cache = LineVerdictCache(tmp_path / "line-cache", lambda: "fingerprint", max_entries=2)
+    cache.add_clean("one")
+    cache.add_clean("two")
+    assert cache.is_clean("one")
+    cache.add_clean("three")
+
+    assert cache.is_clean("one")
+    assert not cache.is_clean("two")
+    assert cache.is_clean("three")
+
+
+def test_changed_file_only_checks_new_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    source = tmp_path / "source.txt"
+    source.write_text("first line\nsecond line\n")
+
+    check = CheckFileContent(jobs=1)
+    assert not check.process_files(["source.txt"])
+
+    source.write_text("first line\nsecond line\nthird line\n")
+    check = CheckFileContent(jobs=1)
+    check.line_has_issue = MagicMock(return_value=False)
+    with capture_output():
+        assert not check.process_files(["source.txt"])
+
+    check.line_has_issue.assert_called_once_with("third line")
@@ -0,0 +1,136 @@
+import json
+import os
+import pickle
+
+from pii_secret_check_hooks.check_file.log_store import FileLog
+
+
+def test_file_log_round_trip(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    file_log = FileLog(log_path)
+    file_log["a.txt"] = {"hash": "a"}
+    file_log.flush()
+
+    assert FileLog(log_path)["a.txt"] == {"hash": "a"}
+    assert "b.txt" not in FileLog(log_path)
+
+
+def test_file_log_concurrent_runs_keep_entries(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    first_run = FileLog(log_path)
+    second_run = FileLog(log_path)
+    assert "a.txt" not in first_run
+    assert "b.txt" not in second_run
+
+    first_run["a.txt"] = {"hash": "a"}
+    second_run["b.txt"] = {"hash": "b"}
+    first_run.flush()
+    second_run.flush()
+
+    assert sorted(FileLog(log_path)) == ["a.txt", "b.txt"]
+
+
+def test_file_log_only_writes_when_changed(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    file_log = FileLog(log_path)
+    file_log["a.txt"] = {"hash": "a"}
+    file_log.flush()
+    modified = (log_path / "..json").stat().st_mtime_ns
+
+    file_log = FileLog(log_path)
+    assert file_log["a.txt"] == {"hash": "a"}
+    file_log.flush()
+
+    assert (log_path / "..json").stat().st_mtime_ns == modified
+
+
+def test_file_log_shards_by_directory(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    file_log = FileLog(log_path)
+    file_log["a.txt"] = {"hash": "a"}
+    file_log["src/b.py"] = {"hash": "b"}
+    file_log["src/app/c.py"] = {"hash": "c"}
+    file_log.flush()
+
+    assert sorted(os.listdir(log_path)) == ["..json", "src%2Fapp.json", "src.json"]
+    assert json.loads((log_path / "src.json").read_text()) == {
+        "files": {"src/b.py": {"hash": "b"}},
+    }
+    assert sorted(FileLog(log_path)) == ["a.txt", "src/app/c.py", "src/b.py"]
+
+
+def test_file_log_only_reads_and_writes_changed_shards(tmp_path, monkeypatch):
+    log_path = tmp_path / "pii-secret-log"
+    file_log = FileLog(log_path)
+    file_log["a.txt"] = {"hash": "a"}
+    file_log["src/b.py"] = {"hash": "b"}
+    file_log.flush()
+    modified = (log_path / "..json").stat().st_mtime_ns
+
+    loaded = []
+    load = FileLog._load
+    monkeypatch.setattr(FileLog, "_load", staticmethod(
+        lambda path: loaded.append(os.path.basename(path)) or load(path)
+    ))
+    file_log = FileLog(log_path)
+    file_log["src/b.py"] = {"hash": "b2"}
+    file_log.flush()
+
+    assert loaded == ["src.json"]
+    assert (log_path / "..json").stat().st_mtime_ns == modified
+    assert FileLog(log_path)["src/b.py"] == {"hash": "b2"}
+
+
+def test_file_log_removes_empty_shard(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    file_log = FileLog(log_path)
+    file_log["src/b.py"] = {"hash": "b"}
+    file_log.flush()
+
+    file_log = FileLog(log_path)
+    del file_log["src/b.py"]
+    file_log.flush()
+
+    assert os.listdir(log_path) == []
+    assert len(FileLog(log_path)) == 0
+
+
+def test_file_log_splits_single_file_log(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    log_path.write_text(json.dumps({
+        "files": {"b.txt": {"hash": "b"}, "src/c.py": {"hash": "c"}},
+        "excluded_lines": {},
+    }))
+
+    file_log = FileLog(log_path)
+    assert file_log["b.txt"] == {"hash": "b"}
+    file_log["a.txt"] = {"hash": "a"}
+    del file_log["b.txt"]
+    file_log.flush()
+
+    assert (log_path / "..json").read_text() == (
+        '{\n  "files": {\n    "a.txt": {\n      "hash": "a"\n    }\n  }\n}\n'
+    )
+    assert sorted(FileLog(log_path)) == ["a.txt", "src/c.py"]
+
+
+def test_file_log_unreadable_log(tmp_path):
+    log_path = tmp_path / "pii-secret-log"
+    log_path.write_bytes(b"SQLite format 3\0\xff")
+
+    file_log = FileLog(log_path)
+    assert len(file_log) == 0
+    file_log["a.txt"] = {"hash": "a"}
+    file_log.flush()
+    assert json.loads((log_path / "..json").read_text())["files"] == {"a.txt": {"hash": "a"}}
+
+
+def test_file_log_pickle(tmp_path):
+    file_log = FileLog(tmp_path / "pii-secret-log")
+    file_log["a.txt"] = {"hash": "a"}
+    file_log.flush()
+    assert "a.txt" in file_log
+
+    copy = pickle.loads(pickle.dumps(file_log))
+    assert copy["a.txt"] == {"hash": "a"}
+    assert "b.txt" not in copy
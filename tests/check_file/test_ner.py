@@ -1,7 +1,19 @@
 import io
 import os
+from unittest.mock import MagicMock
 
+from pii_secret_check_hooks.check_file import ner
 from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.ner_literals import BenignEntityIndex
+from pii_secret_check_hooks.check_file.ner_gate import NerLineGate
+from pii_secret_check_hooks.util import capture_output
+
+
+def mock_backend(monkeypatch):
+    backend = MagicMock()
+    backend.fingerprint.return_value = ["mock"]
+    monkeypatch.setattr(ner, "get_backend", MagicMock(return_value=backend))
+    return backend
 
 
 def create_check():
@@ -74,3 +86,111 @@ def test_ner_python_scanner_named_entity_in_comment():
     result = checker._issue_found_in_python_content(fh)
 
     assert result == True
+
+
+def test_text_content_batched_line_numbers():
+    fh = io.StringIO("Nothing here\nignored Buxton /PS-IGNORE\n\nBuxton\n")
+
+    checker = CheckForNER(allow_changed_lines=True, ner_batch_size=2)
+    with capture_output() as messages:
+        result = checker._issue_found_in_text_content(fh)
+
+    assert result == True
+    assert [message.split(".")[0] for message, _ in messages] == ["Line 4"]
+
+
+def test_model_not_loaded_without_files_to_scan(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "excluded.txt").write_text("Buxton\n")
+    backend = mock_backend(monkeypatch)
+
+    checker = CheckForNER(excluded_file_list=["excluded.txt"], jobs=1)
+    assert not checker.process_files(["excluded.txt", "image.png"])
+    backend.assert_not_called()
+    backend.pipe.assert_not_called()
+
+
+def test_benign_entity_index():
+    index = BenignEntityIndex(["acme ltd"])
+    assert index.is_benign("HttpResponse")
+    assert index.is_benign("ACME Ltd ")
+    assert not index.is_benign("Buxton")
+
+    assert not index.only_benign_words("return HttpResponse(404)")
+    assert index.only_benign_words("HttpResponse()")
+    assert index.only_benign_words("# ACME Ltd, Django")
+    # "Django 2.1.7" is a literal of its own
+    assert index.only_benign_words("# ACME Ltd, Django 2.1.7")
+    # The model could find "Django 3.2.1" or "ACME Ltd Django" as one entity
+    assert not index.only_benign_words("HttpResponse(404)")
+    assert not index.only_benign_words("# ACME Ltd, Django 3.2.1")
+    assert not index.only_benign_words("ACME Ltd Django")
+    assert not index.only_benign_words("ACME Ltd & Django")
+    assert not index.only_benign_words("HttpResponses")
+    assert not index.only_benign_words("1234")
+
+
+def test_benign_only_lines_skip_model(monkeypatch):
+    backend = mock_backend(monkeypatch)
+    fh = io.StringIO("HttpResponse\n- Django, JavaScript, CSS -\n")
+
+    checker = CheckForNER(allow_changed_lines=True)
+    assert not checker._issue_found_in_text_content(fh)
+    assert not checker.line_has_issue("PermissionDenied()")
+    backend.assert_not_called()
+    backend.pipe.assert_not_called()
+
+
+def test_line_gate():
+    gate = NerLineGate(min_word_chars=3)
+    assert gate.may_have_entity("Meeting with Buxton")
+    assert gate.may_have_entity("zoë sent it")
+    assert not gate.may_have_entity("")
+    assert not gate.may_have_entity("} ) ;")
+    assert not gate.may_have_entity("12, 34, 56")
+    assert not gate.may_have_entity("return self.value + 1")
+    assert not gate.may_have_entity("A-B")
+    assert gate.skipped_lines == 5
+
+    assert NerLineGate(min_word_chars=0).may_have_entity("A-B")
+
+
+def test_gated_lines_skip_model(monkeypatch):
+    backend = mock_backend(monkeypatch)
+    fh = io.StringIO("\nfor item in items:\n    total += 1\n---\n")
+
+    checker = CheckForNER(allow_changed_lines=True, ner_gate=True)
+    assert not checker._issue_found_in_text_content(fh)
+    backend.assert_not_called()
+    backend.pipe.assert_not_called()
+    assert checker.line_gate.skipped_lines == 4
+
+    with capture_output() as messages:
+        checker.after_run()
+    assert "4 lines without capitals" in messages[0][0]
+
+
+def test_line_gate_off_by_default(monkeypatch):
+    backend = mock_backend(monkeypatch)
+    fh = io.StringIO("buxton\n")
+
+    checker = CheckForNER(allow_changed_lines=True)
+    assert checker.line_gate is None
+    assert not checker._issue_found_in_text_content(fh)
+    backend.pipe.assert_called_once()
+
+
+def test_lexed_file_only_checks_comments_and_strings(tmp_path):
+    source = tmp_path / "app.js"
+    source.write_text(
+        "const Buxton = 1;\n"
+        "// Ask Buxton /PS-IGNORE\n"
+        "alert('Hello Buxton');\n",
+    )
+
+    checker = CheckForNER(allow_changed_lines=True)
+    with open(source) as fh, capture_output() as messages:
+        result = checker._issue_found_in_file_content(fh, str(source))
+
+    assert result == True
+    assert [message.split(".")[0] for message, _ in messages] == ["Line 3"]
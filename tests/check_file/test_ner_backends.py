@@ -0,0 +1,60 @@
+import io
+import pickle
+
+from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.ner_backends import (
+    RULES_BACKEND,
+    RulesBackend,
+    SpacyBackend,
+    get_backend,
+)
+from pii_secret_check_hooks.config import NER_LABELS
+from pii_secret_check_hooks.util import capture_output
+
+
+def entities(backend, text):
+    return [(ent.text, ent.label_) for ent in backend(text).ents]
+
+
+def test_rules_backend_titles_and_company_suffixes():
+    backend = RulesBackend()
+    assert entities(backend, "Sent to Dr. Jane Smith today") == [("Dr. Jane Smith", "PERSON")]
+    assert entities(backend, "ask mrs Buxton") == [("mrs Buxton", "PERSON")]
+    assert entities(backend, "Invoice from Acme Widgets Ltd") == [("Acme Widgets Ltd", "ORG")]
+    assert entities(backend, "the doctor said hello") == []
+
+
+def test_rules_backend_gazetteer():
+    with capture_output() as messages:
+        backend = RulesBackend(["PERSON=Jo Bloggs", "NAME=Buxton", "ORG"])
+
+    assert entities(backend, "Email Jo Bloggs") == [("Jo Bloggs", "PERSON")]
+    assert entities(backend, "Email Buxton") == []
+    assert len(messages) == 2
+    assert all(pattern["label"] in NER_LABELS for pattern in backend.patterns)
+
+
+def test_get_backend_is_shared():
+    assert get_backend(RULES_BACKEND, ["PERSON=Jo"]) is get_backend(RULES_BACKEND, ("PERSON=Jo",))
+    assert get_backend(RULES_BACKEND) is not get_backend(RULES_BACKEND, ["PERSON=Jo"])
+    assert isinstance(get_backend(), SpacyBackend)
+
+
+def test_backend_pickled_without_pipeline():
+    backend = RulesBackend()
+    backend.nlp
+    copy = pickle.loads(pickle.dumps(backend))
+    assert copy._nlp is None
+    assert copy.fingerprint() == backend.fingerprint()
+    assert RulesBackend().fingerprint() != RulesBackend(["PERSON=Jo"]).fingerprint()
+
+
+def test_check_with_rules_backend():
+    fh = io.StringIO("Meeting notes\nCall Dr Buxton back\n")
+
+    checker = CheckForNER(allow_changed_lines=True, ner_backend=RULES_BACKEND)
+    with capture_output() as messages:
+        result = checker._issue_found_in_text_content(fh)
+
+    assert result == True
+    assert messages[0][0].startswith("Line 2. please check 'Dr Buxton' - PERSON")
@@ -0,0 +1,35 @@
+from pii_secret_check_hooks.check_file.file_content import (
+    CheckFileContent,
+)
+from pii_secret_check_hooks.check_file.parallel import get_job_count
+from pii_secret_check_hooks.util import capture_output
+
+
+def test_get_job_count():
+    assert get_job_count(4, 100) == 4
+    assert get_job_count(4, 2) == 2
+    assert get_job_count(0, 10) == 1
+    assert get_job_count(None, 1) == 1
+
+
+def test_process_files_in_pool_merges_results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filenames = []
+    for i in range(6):
+        filename = f"file_{i}.txt"
+        if i % 2:
+            (tmp_path / filename).write_text(f"test AKIA11111111AAAAAAA{i} test\n")
+        else:
+            (tmp_path / filename).write_text("Nothing to see here\n")
+        filenames.append(filename)
+
+    check = CheckFileContent(jobs=3)
+    with capture_output() as messages:
+        assert check.process_files(filenames)
+
+    # Clean files are logged, files with issues are not
+    assert sorted(check.log_data["files"]) == ["file_0.txt", "file_2.txt", "file_4.txt"]
+
+    # Output is in file order, regardless of which worker checked the file
+    reported = [message for message, _ in messages if message.startswith("file_")]
+    assert reported == ["file_1.txt", "file_3.txt", "file_5.txt"]
@@ -0,0 +1,88 @@
+import builtins
+
+from pii_secret_check_hooks.check_file import file_source
+from pii_secret_check_hooks.check_file.file_content import CheckFileContent
+from pii_secret_check_hooks.check_file.file_source import FileSource
+from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.pipeline import ScanPipeline
+from pii_secret_check_hooks.check_file.sniff import BINARY, TEXT
+from pii_secret_check_hooks.util import capture_output
+
+
+def test_file_source_reads_once(tmp_path, monkeypatch):
+    source_file = tmp_path / "notes.txt"
+    source_file.write_bytes(b"first line\r\nsecond line\rthird\n")
+    opened = []
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return builtins.open(*args, **kwargs)
+
+    monkeypatch.setattr(file_source, "open", counting_open, raising=False)
+    source = FileSource(str(source_file))
+
+    assert source.kind == TEXT
+    assert len(source.hash) == 40
+    with open(source_file) as fh:
+        expected = fh.readlines()
+    assert source.open_text().readlines() == expected
+    assert source.open_text().readlines() == expected
+    assert source.open_binary().read() == source_file.read_bytes()
+    assert opened == [str(source_file)]
+
+
+def test_file_source_binary(tmp_path):
+    source_file = tmp_path / "image.bin"
+    source_file.write_bytes(b"\x89PNG\0\0")
+    assert FileSource(str(source_file)).kind == BINARY
+
+
+def test_pipeline_runs_each_check(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "clean.txt").write_text("Nothing to see\n")
+    (tmp_path / "secret.txt").write_text("email me at someone@example.com\n")
+    (tmp_path / "name.txt").write_text("Meeting with Buxton\n")
+    opened = []
+
+    def counting_open(*args, **kwargs):
+        opened.append(args[0])
+        return builtins.open(*args, **kwargs)
+
+    monkeypatch.setattr(file_source, "open", counting_open, raising=False)
+    content = CheckFileContent(allow_changed_lines=True)
+    ner = CheckForNER(allow_changed_lines=True)
+    pipeline = ScanPipeline([content, ner], jobs=1)
+
+    with capture_output() as messages:
+        found_issue = pipeline.process_files(["clean.txt", "secret.txt", "name.txt"])
+
+    assert found_issue
+    assert pipeline.failed_checks == ["file_content", "ner"]
+    assert any("Email" in message for message, _ in messages)
+    assert any("Buxton" in message for message, _ in messages)
+    # Each check logs the files it passed
+    assert "clean.txt" in content.log_data["files"]
+    assert "name.txt" in content.log_data["files"]
+    assert "secret.txt" in ner.log_data["files"]
+    assert "name.txt" not in ner.log_data["files"]
+    # Both checks shared a single read of each file
+    assert opened == ["clean.txt", "secret.txt", "name.txt"]
+
+
+def test_pipeline_in_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    filenames = []
+    for i in range(4):
+        (tmp_path / f"file{i}.txt").write_text("Meeting with Buxton\n" if i == 2 else "Nothing here\n")
+        filenames.append(f"file{i}.txt")
+    content = CheckFileContent(allow_changed_lines=True)
+    ner = CheckForNER(allow_changed_lines=True)
+    pipeline = ScanPipeline([content, ner], jobs=2)
+
+    with capture_output() as messages:
+        assert pipeline.process_files(filenames)
+
+    assert pipeline.failed_checks == ["ner"]
+    assert [message for message, _ in messages if "Buxton" in message]
+    assert sorted(content.log_data["files"]) == filenames
+    assert "file2.txt" not in ner.log_data["files"]
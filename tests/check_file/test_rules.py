@@ -0,0 +1,61 @@
+import re
+
+from pii_secret_check_hooks.check_file.rules import (
+    Rule,
+    RuleGroup,
+    RuleSet,
+)
+
+
+def create_group(patterns):
+    return RuleGroup(
+        Rule(name, re.compile(pattern)) for name, pattern in patterns
+    )
+
+
+def test_rule_group_no_match():
+    group = create_group([("a", "foo"), ("b", "bar")])
+    assert group.search("nothing to see") is None
+
+
+def test_rule_group_reports_first_rule_in_order():
+    # "bar" is the leftmost match, but "foo" comes first in rule order
+    group = create_group([("a", "foo"), ("b", "bar")])
+    assert group.search("bar then foo").name == "a"
+
+
+def test_rule_group_standalone_rules():
+    group = create_group([
+        ("flags", "(?i)secret"),
+        ("backref", r"(\w)\1{3}"),
+        ("plain", "token"),
+    ])
+    assert group.search("SECRET").name == "flags"
+    assert group.search("aaaa").name == "backref"
+    assert group.search("token").name == "plain"
+    assert group.search("token then aaaa").name == "backref"
+
+
+def test_rule_set_matches_per_pattern_loop():
+    rule_set = RuleSet([r"dog name=(\s*)dog(\s*)name(\s*)"])
+    lines = [
+        "test AKIA11111111AAAAAAAA test",
+        "I am a line, with Buckingham Palace's postcode - SW1A 1AA",
+        "My dog name is Rover",
+        "first name and SW1A 1AA",
+        "I do not contain any PII",
+    ]
+    for line in lines:
+        for group in (rule_set.trufflehog, rule_set.lowercase):
+            text = line if group is rule_set.trufflehog else line.lower()
+            expected = next(
+                (rule.name for rule in group.rules if rule.regex.search(text)),
+                None,
+            )
+            rule = group.search(text)
+            assert (rule.name if rule else None) == expected
+
+
+def test_rule_set_skips_invalid_custom_regex():
+    rule_set = RuleSet(["broken=(unclosed", "dog=dog"])
+    assert [rule.name for rule in rule_set.custom.rules] == ["'dog'"]
@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock
+
+from pii_secret_check_hooks.check_file.file_content import (
+    CheckFileContent,
+)
+from pii_secret_check_hooks.check_file.scan_limits import (
+    ScanBudget,
+    line_windows,
+)
+from pii_secret_check_hooks.config import SNIFF_SIZE
+from pii_secret_check_hooks.util import capture_output
+
+
+def test_line_windows_short_line():
+    assert list(line_windows("short line", max_length=20, overlap=5)) == ["short line"]
+
+
+def test_line_windows_overlap():
+    text = "".join(chr(ord("a") + i % 26) for i in range(50))
+    windows = list(line_windows(text, max_length=20, overlap=5))
+
+    assert all(len(window) <= 20 for window in windows)
+    assert windows[0] == text[:20]
+    assert windows[1] == text[15:35]
+    assert windows[-1].endswith(text[-5:])
+    # Every five character slice is inside a window
+    for start in range(len(text) - 5):
+        assert any(text[start:start + 5] in window for window in windows)
+
+
+def test_scan_budget_bytes():
+    budget = ScanBudget(max_bytes=10)
+    budget.start()
+    assert budget.consume(10)
+    assert not budget.consume(1)
+    assert "byte budget" in budget.exceeded
+
+    budget.start()
+    assert budget.exceeded is None
+
+
+def test_scan_budget_time(monkeypatch):
+    clock = MagicMock(return_value=100.0)
+    monkeypatch.setattr("time.monotonic", clock)
+    budget = ScanBudget(max_seconds=5)
+    budget.start()
+    assert budget.has_time()
+
+    clock.return_value = 106.0
+    assert not budget.has_time()
+    assert "second budget" in budget.exceeded
+
+
+def test_scan_budget_disabled():
+    budget = ScanBudget(max_seconds=0, max_bytes=0)
+    budget.start()
+    assert budget.consume(10 ** 9)
+
+
+def test_secret_in_long_line_found(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "bundle.js").write_text(
+        "var a=1;" * 2000 + "key='AKIA11111111AAAAAAAA';" + "var b=2;" * 2000 + "\n"
+    )
+
+    check = CheckFileContent(jobs=1)
+    with capture_output() as messages:
+        assert check.process_files(["bundle.js"])
+
+    assert any("Line 1." in message for message, _ in messages)
+
+
+def test_pii_in_long_json_line_found(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    records = ",".join(f'{{"id": {i}, "note": "nothing here"}}' for i in range(400))
+    (tmp_path / "data.json").write_text(
+        f'[{records}, {{"contact": "john.smith@example.com"}}]'
+    )
+    assert (tmp_path / "data.json").stat().st_size > SNIFF_SIZE
+
+    check = CheckFileContent(jobs=1)
+    with capture_output() as messages:
+        assert check.process_files(["data.json"])
+
+    assert "Line 1. 'Email' check failed" in [message for message, _ in messages]
+    assert "data.json" not in check.log_data["files"]
+
+
+def test_file_over_budget_partly_checked(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "large.txt").write_text(
+        "first name\n" + "nothing to see here\n" * 100 + "last name\n"
+    )
+
+    check = CheckFileContent(jobs=1, file_byte_budget=200)
+    with capture_output() as messages:
+        assert check.process_files(["large.txt"])
+
+    output = [message for message, _ in messages]
+    assert any("Line 1." in message for message in output)
+    assert not any("Line 102." in message for message in output)
+    assert any("only partly checked" in message for message in output)
+    assert "large.txt" not in check.log_data["files"]
+
+
+def test_file_over_budget_not_logged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "large.txt").write_text("nothing to see here\n" * 100)
+
+    check = CheckFileContent(jobs=1, file_byte_budget=200)
+    with capture_output():
+        assert not check.process_files(["large.txt"])
+
+    assert "large.txt" not in check.log_data["files"]
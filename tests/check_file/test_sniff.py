@@ -0,0 +1,92 @@
+from unittest.mock import MagicMock
+
+from pii_secret_check_hooks.check_file.file_content import (
+    CheckFileContent,
+)
+from pii_secret_check_hooks.check_file.ner import CheckForNER
+from pii_secret_check_hooks.check_file.sniff import (
+    BINARY,
+    GENERATED,
+    TEXT,
+    sniff,
+)
+from pii_secret_check_hooks.config import SNIFF_SIZE
+from pii_secret_check_hooks.util import capture_output
+
+
+def test_sniff_text():
+    assert sniff(b"") == TEXT
+    assert sniff(b"Just some text\nover two lines\n") == TEXT
+    assert sniff("Café crème\n".encode("utf-8")) == TEXT
+
+
+def test_sniff_character_cut_at_end_of_sample():
+    assert sniff("Café".encode("utf-8")[:-1]) == TEXT
+
+
+def test_sniff_binary():
+    assert sniff(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR") == BINARY
+    assert sniff(bytes(range(128, 256)) * 4) == BINARY
+
+
+def test_sniff_generated():
+    assert sniff(b"// Code generated by protoc-gen-go. DO NOT EDIT.\npackage pb\n") == GENERATED
+    assert sniff(b"# This file is automatically @generated by Poetry and should not be changed by hand.\n") == GENERATED
+    assert sniff(b"text mentioning @generated in passing\n") == TEXT
+
+
+def test_sniff_minified():
+    # Long lines are checked in windows as text
+    assert sniff(b"var a=1;" * (SNIFF_SIZE // 8)) == TEXT
+
+
+def test_generated_file_not_logged(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "api.pb.go").write_text(
+        "// Code generated by protoc-gen-go. DO NOT EDIT.\npackage pb\n",
+    )
+
+    check = CheckFileContent(jobs=1)
+    with capture_output():
+        assert not check.process_files(["api.pb.go"])
+
+    # Only the secret rules ran, so it is checked again next time
+    assert "api.pb.go" not in check.log_data["files"]
+
+
+def test_binary_file_searched_for_secrets(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.bin").write_bytes(
+        b"\0\xff\xfe first name \0 key AKIA11111111AAAAAAAA\n",
+    )
+
+    check = CheckFileContent(jobs=1)
+    with capture_output() as messages:
+        assert check.process_files(["data.bin"])
+
+    output = [message for message, _ in messages]
+    assert "Line 1. AWS API Key check failed" in output
+    assert not any("exception" in message for message in output)
+
+
+def test_binary_file_without_secrets_passes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.bin").write_bytes(b"\0\xff\xfe first name\n")
+
+    check = CheckFileContent(jobs=1)
+    with capture_output():
+        assert not check.process_files(["data.bin"])
+
+    assert "data.bin" in check.log_data["files"]
+
+
+def test_ner_skips_binary_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data.bin").write_bytes(b"\0\xff\xfe Jane Smith\n")
+
+    check = CheckForNER(jobs=1)
+    check._issue_found_in_candidates = MagicMock(return_value=False)
+    with capture_output():
+        assert not check.process_files(["data.bin"])
+
+    check._issue_found_in_candidates.assert_not_called()
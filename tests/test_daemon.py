@@ -0,0 +1,90 @@
+import os
+import threading
+import time
+
+import pytest
+
+from pii_secret_check_hooks import daemon
+from pii_secret_check_hooks.util import capture_output
+
+
+@pytest.fixture
+def scan_server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / ".pii-secret-hook").mkdir()
+    server = daemon.ScanServer()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_request_scan_without_daemon(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert daemon.request_scan("file_content", ["foo.txt"]) is None
+
+
+def test_request_scan_runs_in_daemon(tmp_path, scan_server):
+    (tmp_path / "secret.txt").write_text("test AKIA11111111AAAAAAAA test\n")
+
+    with capture_output() as messages:
+        exit_code = daemon.request_scan(
+            "file_content", ["--jobs=1", "secret.txt"],
+        )
+
+    assert exit_code == 1
+    assert ("File content check failed", "bold #d3391f") in [
+        tuple(message) for message in messages
+    ]
+
+
+def test_scan_refused_for_other_directory(scan_server):
+    response = daemon._send_command({
+        "command": "scan",
+        "hook": "file_content",
+        "argv": ["foo.txt"],
+        "cwd": "/somewhere/else",
+    })
+    assert "exit_code" not in response
+    assert "error" in response
+
+
+def test_scan_uses_client_git_env(scan_server, monkeypatch):
+    seen = {}
+
+    def hook(argv):
+        seen["index"] = os.environ.get("GIT_INDEX_FILE")
+        seen["dir"] = os.environ.get("GIT_DIR")
+        return 0
+
+    monkeypatch.setattr(daemon, "_get_hooks", lambda: {"file_content": hook})
+    monkeypatch.setenv("GIT_DIR", "daemon-git-dir")
+    monkeypatch.delenv("GIT_INDEX_FILE", raising=False)
+    response = daemon._send_command({
+        "command": "scan",
+        "hook": "file_content",
+        "argv": [],
+        "cwd": os.getcwd(),
+        "env": {"GIT_INDEX_FILE": ".git/next-index-1.lock"},
+    })
+
+    assert response["exit_code"] == 0
+    assert seen == {"index": ".git/next-index-1.lock", "dir": None}
+    # The daemon's own environment is put back
+    assert os.environ["GIT_DIR"] == "daemon-git-dir"
+    assert "GIT_INDEX_FILE" not in os.environ
+
+
+def test_request_scan_falls_back_when_daemon_hangs(scan_server, monkeypatch):
+    monkeypatch.setattr(
+        daemon, "_get_hooks", lambda: {"file_content": lambda argv: time.sleep(1)},
+    )
+    monkeypatch.setattr(daemon, "SCAN_TIMEOUT_SECONDS", 0.1)
+    # Output captured by the daemon thread would hide the hook's own
+    warnings = []
+    monkeypatch.setattr(daemon, "print_warning", warnings.append)
+
+    assert daemon.request_scan("file_content", ["foo.txt"]) is None
+    assert "scanning in this process" in warnings[0]
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+
+from pii_secret_check_hooks.file_utils import atomic_write
+
+
+def test_atomic_write(tmp_path):
+    path = tmp_path / "baseline"
+    with atomic_write(path, "wb") as baseline_file:
+        baseline_file.write(b"data")
+
+    assert path.read_bytes() == b"data"
+    assert os.listdir(tmp_path) == ["baseline"]
+
+
+def test_atomic_write_interrupted(tmp_path):
+    path = tmp_path / "line-cache"
+    path.write_text("old\n")
+
+    with pytest.raises(KeyboardInterrupt):
+        with atomic_write(path) as cache_file:
+            cache_file.write("new\n")
+            raise KeyboardInterrupt
+
+    assert path.read_text() == "old\n"
+    assert os.listdir(tmp_path) == ["line-cache"]
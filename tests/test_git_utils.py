@@ -0,0 +1,113 @@
+import subprocess
+
+from pii_secret_check_hooks.check_file.file_content import (
+    CheckFileContent,
+)
+from pii_secret_check_hooks.git_utils import (
+    get_staged_line_numbers,
+    parse_added_lines,
+)
+from pii_secret_check_hooks.util import capture_output
+
+
+DIFF = """diff --git a/changed.txt b/changed.txt
+index 1111111..2222222 100644
+--- a/changed.txt
++++ b/changed.txt
+@@ -2 +2 @@ first
+-old
++new
+@@ -5,0 +6,2 @@ five
++++ added line that looks like a header
++another
+@@ -9,2 +10,0 @@ nine
+-gone
+-gone too
+diff --git a/deleted.txt b/deleted.txt
+deleted file mode 100644
+--- a/deleted.txt
++++ /dev/null
+@@ -1 +0,0 @@
+-bye
+diff --git "a/caf\\303\\251.txt" "b/caf\\303\\251.txt"
+--- "a/caf\\303\\251.txt"
++++ "b/caf\\303\\251.txt"
+@@ -1 +1 @@
+-old
++new
+diff --git a/with space.txt b/with space.txt
+--- a/with space.txt	
++++ b/with space.txt	
+@@ -3 +3 @@
+-old
++new
+"""
+
+
+def test_parse_added_lines():
+    assert parse_added_lines(DIFF) == {
+        "changed.txt": {2, 6, 7},
+        "café.txt": {1},
+        "with space.txt": {3},
+    }
+
+
+def git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def test_staged_only_checks_staged_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git(tmp_path, "init", "-q")
+    source = tmp_path / "source.txt"
+    source.write_text("test AKIA11111111AAAAAAAA test\nclean\n")
+    git(tmp_path, "add", "source.txt")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+
+    source.write_text("test AKIA11111111AAAAAAAA test\nclean\nsecond clean line\n")
+    git(tmp_path, "add", "source.txt")
+
+    assert get_staged_line_numbers(["source.txt"]) == {"source.txt": {3}}
+
+    # The committed secret on line 1 is not rechecked
+    check = CheckFileContent(staged_only=True, jobs=1)
+    with capture_output():
+        assert not check.process_files(["source.txt"])
+
+    # Only partly checked, so the file must not be cached as clean
+    assert "source.txt" not in check.log_data["files"]
+
+
+def test_staged_only_file_with_space(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git(tmp_path, "init", "-q")
+    (tmp_path / "a b.txt").write_text("clean\n")
+    git(tmp_path, "add", "a b.txt")
+    git(tmp_path, "commit", "-q", "-m", "initial")
+
+    (tmp_path / "a b.txt").write_text("clean\ntest AKIA11111111AAAAAAAA test\n")
+    git(tmp_path, "add", "a b.txt")
+
+    assert get_staged_line_numbers(["a b.txt"]) == {"a b.txt": {2}}
+    check = CheckFileContent(staged_only=True, jobs=1)
+    with capture_output():
+        assert check.process_files(["a b.txt"])
+
+
+def test_line_cache_kept_in_git_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    git(tmp_path, "init", "-q")
+    (tmp_path / "source.txt").write_text("clean\n")
+
+    check = CheckFileContent(jobs=1)
+    with capture_output():
+        assert not check.process_files(["source.txt"])
+
+    assert (tmp_path / ".git/pii-secret-hook/file_content/line-cache").is_file()
+    assert not (tmp_path / ".pii-secret-hook/file_content/line-cache").exists()
+    assert (tmp_path / ".pii-secret-hook/file_content/pii-secret-log").is_dir()
@@ -2,9 +2,11 @@ import pytest
 from unittest import mock
 
 from pii_secret_check_hooks import (
+    cli,
     pii_secret_filename,
     pii_secret_file_content,
-    pii_secret_file_content_ner
+    pii_secret_file_content_ner,
+    pii_secret_scan,
 )
 
 
@@ -18,9 +20,13 @@ def expected_kwargs():
     return [
         ".pii-secret-hook/file_content/pii-secret-log",
         ".pii-secret-hook/ner/pii-secret-log",
+        ".pii-secret-hook/file_content/line-cache",
+        ".pii-secret-hook/ner/line-cache",
         "pii-secret-exclude.txt",
         "pii-ner-exclude.txt",
         "pii-custom-regex.txt",
+        "pii-ner-gazetteer.txt",
+        "pii-secret-baseline",
     ]
 
 
@@ -60,4 +66,24 @@ def test_pii_secret_filename_defaults(monkeypatch, expected_args, expected_kwarg
     check_file_names = mock.Mock()
     monkeypatch.setattr(pii_secret_filename, "check_file_names", check_file_names)
     pii_secret_filename.main(argv=["foo.txt"])
-    check_file_names.assert_called_with(expected_args, expected_kwargs)
+    check_file_names.assert_called_with(expected_args, expected_kwargs, mock.ANY)
+
+
+def test_pii_secret_scan_defaults(monkeypatch, process_files):
+    get_excluded_filenames = mock.Mock(return_value=["excluded.txt"])
+    check_file_names = mock.Mock(return_value=False)
+    monkeypatch.setattr(cli, "get_excluded_filenames", get_excluded_filenames)
+    monkeypatch.setattr(cli, "check_file_names", check_file_names)
+    monkeypatch.setattr(cli.ScanPipeline, "process_files", process_files)
+
+    assert pii_secret_scan.main(argv=["foo.txt", "--no_daemon"]) == 0
+    # The exclude file is read once for all the checks
+    get_excluded_filenames.assert_called_once_with("pii-secret-exclude.txt")
+    check_file_names.assert_called_with(["foo.txt"], ["excluded.txt"], mock.ANY)
+    process_files.assert_called_with(["foo.txt"])
+
+
+def test_pii_secret_scan_reports_failed_checks(monkeypatch):
+    monkeypatch.setattr(cli, "check_file_names", mock.Mock(return_value=True))
+
+    assert pii_secret_scan.main(argv=["id_rsa", "--no_daemon", "--checks", "filename"]) == 1
@@ -0,0 +1,77 @@
+import json
+
+from pii_secret_check_hooks import pii_secret_scan
+from pii_secret_check_hooks.profile import (
+    Profile,
+    count,
+    get_profile,
+    profiling,
+    stage,
+)
+from pii_secret_check_hooks.util import capture_output
+
+
+def test_profile_merge_and_take():
+    profile = Profile()
+    with profile.stage("read"):
+        pass
+    profile.count("lines", 3)
+    profile.file_checked("file_content", "a.txt", 0.5)
+
+    taken = profile.take()
+    assert taken.stage_calls["read"] == 1
+    assert taken.counts["lines"] == 3
+    assert profile.counts["lines"] == 0
+
+    merged = Profile()
+    merged.count("lines", 1)
+    other = Profile()
+    other.count("lines", 2)
+    other.file_checked("ner", "b.txt", 1.5)
+    merged.merge(other)
+    assert merged.counts["lines"] == 3
+    assert merged.slowest_files == [(1.5, "ner", "b.txt")]
+
+
+def test_nothing_recorded_unless_profiling():
+    assert get_profile() is None
+    with stage("read"):
+        count("lines")
+    assert get_profile() is None
+
+
+def test_profiling_writes_report(tmp_path):
+    report_file = tmp_path / "profile" / "profile.json"
+    with capture_output() as messages:
+        with profiling(str(report_file)) as profile:
+            assert get_profile() is profile
+            with stage("read"):
+                count("lines", 2)
+    assert get_profile() is None
+
+    report = json.loads(report_file.read_text())
+    assert report["stages"]["read"]["calls"] == 1
+    assert report["counts"] == {"lines": 2}
+    summary = messages[0][0]
+    assert summary.startswith("Profile of a ")
+    assert "read" in summary
+
+
+def test_profile_times_each_rule(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "notes.md").write_text("My dog name is Rover\nNothing here\n")
+    (tmp_path / "pii-custom-regex.txt").write_text("dog name=dog(\\s*)name\n")
+
+    with capture_output():
+        assert pii_secret_scan.main([
+            "notes.md", "--checks", "file_content", "--jobs=1", "--no_daemon",
+            "--profile=profile.json",
+        ]) == 1
+
+    report = json.loads((tmp_path / "profile.json").read_text())
+    rules = {rule["rule"]: rule["calls"] for rule in report["rules"]}
+    assert rules["'dog name'"] == 2
+    assert rules["entropy"] == 2
+    assert report["counts"]["file_content files checked"] == 1
+    assert "file_content line checks" in report["stages"]
+    assert report["slowest_files"][0]["file"] == "notes.md"
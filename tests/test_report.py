@@ -0,0 +1,168 @@
+import json
+
+from pii_secret_check_hooks import pii_secret_file_content, pii_secret_filename
+from pii_secret_check_hooks.report import (
+    ERROR_STYLE,
+    INFO_STYLE,
+    Finding,
+    JsonLinesReporter,
+    QuietReporter,
+    Reporter,
+    SarifReporter,
+    create_reporter,
+)
+from pii_secret_check_hooks.util import (
+    capture_output,
+    print_error,
+    replay_output,
+    report_finding,
+    use_reporter,
+)
+
+
+class RecordingReporter(Reporter):
+    def __init__(self):
+        super().__init__()
+        self.writes = []
+
+    def write_findings(self, findings):
+        self.writes.append([finding.file for finding in findings])
+
+    def write_message(self, message, style):
+        self.writes.append(message)
+
+
+def test_findings_written_once_per_file():
+    reporter = RecordingReporter()
+    reporter.add_finding(Finding("file_content", "a.txt", "one"))
+    reporter.add_finding(Finding("file_content", "a.txt", "two"))
+    reporter.add_finding(Finding("file_content", "b.txt", "three"))
+    assert reporter.writes == [["a.txt", "a.txt"]]
+
+    reporter.message("done", INFO_STYLE)
+    assert reporter.writes == [["a.txt", "a.txt"], ["b.txt"], "done"]
+
+
+def test_create_reporter():
+    assert isinstance(create_reporter("json"), JsonLinesReporter)
+    assert isinstance(create_reporter("sarif"), SarifReporter)
+    assert isinstance(create_reporter("quiet"), QuietReporter)
+
+
+def test_quiet_reporter_only_writes_errors(capsys):
+    with use_reporter(QuietReporter()):
+        report_finding(Finding("file_content", "a.txt", "Line 1. AWS API Key check failed"))
+        print_error("File content check failed")
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err == "File content check failed\n"
+
+
+def test_captured_findings_replayed(tmp_path):
+    finding = Finding("ner", "a.py", "Line 2. please check", 2, None, "PERSON", "Jane", "PERSON")
+    with capture_output() as messages:
+        report_finding(finding)
+
+    output_file = tmp_path / "findings.jsonl"
+    with use_reporter(JsonLinesReporter(str(output_file))):
+        # As they are sent back by the scan daemon
+        replay_output(json.loads(json.dumps(messages)))
+
+    assert [
+        Finding(**json.loads(line)) for line in output_file.read_text().splitlines()
+    ] == [finding]
+
+
+def test_file_content_json_lines(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "secret.txt").write_text("clean\n    key = AKIA11111111AAAAAAAA\n")
+
+    exit_code = pii_secret_file_content.main([
+        "secret.txt", "--no_daemon", "--jobs=1",
+        "--output_format=json", "--output_file=findings.jsonl",
+    ])
+
+    assert exit_code == 1
+    findings = [
+        json.loads(line)
+        for line in (tmp_path / "findings.jsonl").read_text().splitlines()
+    ]
+    # Fingerprints are covered by the baseline tests
+    assert len(findings[0].pop("fingerprint")) == 16
+    assert findings == [{
+        "check": "file_content",
+        "file": "secret.txt",
+        "message": "Line 2. AWS API Key check failed",
+        "line": 2,
+        "column": 11,
+        "rule": "AWS API Key",
+        "text": None,
+        "label": None,
+        "blob": None,
+    }]
+
+
+def test_filename_sarif(tmp_path, capsys):
+    output_file = tmp_path / "findings.sarif"
+    exit_code = pii_secret_filename.main([
+        "id_rsa", "README.md",
+        "--output_format=sarif", f"--output_file={output_file}",
+    ])
+
+    assert exit_code == 1
+    sarif = json.loads(output_file.read_text())
+    assert sarif["version"] == "2.1.0"
+    run = sarif["runs"][0]
+    assert run["tool"]["driver"]["rules"] == [{"id": "_rsa$"}]
+    assert run["results"][0].pop("partialFingerprints")
+    assert run["results"] == [{
+        "ruleId": "_rsa$",
+        "level": "warning",
+        "message": {
+            "text": "id_rsa may contain sensitive information due to the file type",
+        },
+        "locations": [{"physicalLocation": {"artifactLocation": {"uri": "id_rsa"}}}],
+        "properties": {"check": "filename"},
+    }]
+    # Nothing is rendered for the console
+    assert capsys.readouterr().out == ""
+
+
+def test_findings_kept_across_invocations(tmp_path, capsys):
+    # pre-commit can split the files of one run over several invocations
+    json_file = tmp_path / "findings.jsonl"
+    sarif_file = tmp_path / "findings.sarif"
+    for filename in ("id_rsa", "deploy_rsa"):
+        for output_format, output_file in (("json", json_file), ("sarif", sarif_file)):
+            assert pii_secret_filename.main([
+                filename,
+                f"--output_format={output_format}", f"--output_file={output_file}",
+            ]) == 1
+
+    assert [
+        json.loads(line)["file"] for line in json_file.read_text().splitlines()
+    ] == ["id_rsa", "deploy_rsa"]
+    run = json.loads(sarif_file.read_text())["runs"][0]
+    assert run["tool"]["driver"]["rules"] == [{"id": "_rsa$"}]
+    assert [
+        result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"]
+        for result in run["results"]
+    ] == ["id_rsa", "deploy_rsa"]
+
+
+def test_other_sarif_log_not_replaced(tmp_path, capsys):
+    output_file = tmp_path / "findings.sarif"
+    output_file.write_text('{"runs": [{"tool": {"driver": {"name": "other"}}}]}')
+    assert pii_secret_filename.main([
+        "id_rsa", "--output_format=sarif", f"--output_file={output_file}",
+    ]) == 1
+
+    assert "other" in output_file.read_text()
+    assert "is not a SARIF log from these hooks" in capsys.readouterr().err
+
+
+def test_error_style_unchanged():
+    with capture_output() as messages:
+        print_error("File content check failed")
+    assert messages == [("File content check failed", ERROR_STYLE)]